@@ -0,0 +1,59 @@
+import argparse
+import time
+import numpy as np
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from tensorflow.keras import layers, models
+from src.api.inference import KerasBackend, scaler_affine, top_labels
+
+def stand_in_audio_head(num_classes, seed=0):
+    """
+    Random-weight head with the shape of the trained one: (1024,) -> num_classes.
+    """
+    rng = np.random.default_rng(seed)
+    model = models.Sequential([
+        layers.Input(shape=(1024,)),
+        layers.Dense(1024, activation='relu'),
+        layers.Dense(512, activation='relu'),
+        layers.Dense(256, activation='relu'),
+        layers.Dense(num_classes, activation='softmax'),
+    ])
+    scaler = StandardScaler().fit(rng.normal(0.3, 0.2, (512, 1024)))
+    encoder = LabelEncoder().fit([f"instrument_{i:02d}" for i in range(num_classes)])
+    return model, scaler, encoder
+
+def per_call_ms(fn, embeddings, repeats):
+    fn(embeddings)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(embeddings)
+    return (time.perf_counter() - start) / repeats * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the separate and fused audio post-embedding stages.")
+    parser.add_argument("--classes", type=int, default=11)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    model, scaler, encoder = stand_in_audio_head(args.classes)
+    plain = KerasBackend(model)
+    fused = KerasBackend(model, input_affine=scaler_affine(scaler))
+    label_array = np.asarray(encoder.classes_, dtype=object)
+
+    def separate(embeddings):
+        # Previous path: sklearn scaler, head, sklearn label decoding
+        probabilities = plain.predict(scaler.transform(embeddings))
+        return encoder.inverse_transform(np.argmax(probabilities, axis=1)), np.max(probabilities, axis=1)
+
+    def fused_stage(embeddings):
+        return top_labels(fused.predict(embeddings), label_array)
+
+    print(f"{'Batch':>6}{'Separate ms':>13}{'Fused ms':>10}{'Speedup':>9}{'Max diff':>10}{'Labels equal':>14}")
+    for batch_size in (1, 8, 32, 128):
+        embeddings = np.random.default_rng(batch_size).normal(0.3, 0.2, (batch_size, 1024)).astype(np.float32)
+        separate_ms = per_call_ms(separate, embeddings, args.repeats)
+        fused_ms = per_call_ms(fused_stage, embeddings, args.repeats)
+
+        reference_labels, labels = separate(embeddings)[0], fused_stage(embeddings)[0]
+        diff = np.abs(fused.predict(embeddings) - plain.predict(scaler.transform(embeddings))).max()
+        print(f"{batch_size:>6}{separate_ms:>13.3f}{fused_ms:>10.3f}{separate_ms / fused_ms:>8.1f}x"
+              f"{diff:>10.1e}{str(bool((reference_labels == labels).all())):>14}")
@@ -0,0 +1,157 @@
+import argparse
+import io
+import pickle
+import time
+import numpy as np
+import pandas as pd
+from PIL import Image
+from tensorflow.keras.preprocessing import image
+from tensorflow.keras.applications.resnet50 import preprocess_input
+from config.constants import PROCESSED_IMAGE_DATA_DIR, CLEANED_IMAGE_DATA_DIR
+from src.api.config import IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH, IMAGE_INDICES_PATH, INFERENCE_BACKEND, TFLITE_NUM_THREADS
+from src.api.inference import load_backend
+from utils.image_processing import CAFFE_MEAN_BGR, preprocess_image
+from utils.train_utils import image_train_val_split
+
+TARGET_SIZE = (224, 224)
+
+def preprocess_image_keras(contents):
+    """
+    Previous implementation of utils.image_processing.preprocess_image, kept as the reference.
+    """
+    img = image.load_img(io.BytesIO(contents), target_size=TARGET_SIZE)
+    return preprocess_input(np.expand_dims(image.img_to_array(img), axis=0))
+
+def synthetic_photos(num_images, size, seed=0):
+    """
+    Encodes phone-sized JPEGs: smooth gradients plus noise, so they compress
+    like photos rather than like pure noise.
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size[1], 0:size[0]]
+    photos = []
+    for _ in range(num_images):
+        base = np.stack([
+            (np.sin(x / rng.uniform(50, 400) + rng.uniform(0, 6)) + 1) * 100,
+            (np.cos(y / rng.uniform(50, 400) + rng.uniform(0, 6)) + 1) * 100,
+            (x + y) / (size[0] + size[1]) * 200,
+        ], axis=-1)
+        pixels = np.clip(base + rng.normal(0, 8, base.shape), 0, 255).astype(np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="JPEG", quality=90)
+        photos.append(buffer.getvalue())
+    return photos
+
+def staged(contents, draft, out):
+    """
+    Runs the decode steps one by one and returns the time spent in each.
+    draft=None is the previous path (full decode, img_to_array, preprocess_input).
+    """
+    times = []
+    start = time.perf_counter()
+
+    img = Image.open(io.BytesIO(contents))
+    if draft:
+        img.draft("RGB", (TARGET_SIZE[1], TARGET_SIZE[0]))
+    img.load()
+    times.append(time.perf_counter() - start)
+
+    img = img.convert("RGB").resize((TARGET_SIZE[1], TARGET_SIZE[0]), Image.NEAREST)
+    times.append(time.perf_counter() - sum(times) - start)
+
+    if draft is None:
+        preprocess_input(np.expand_dims(image.img_to_array(img), axis=0))
+    else:
+        np.subtract(np.asarray(img)[..., ::-1], CAFFE_MEAN_BGR, out=out, dtype=np.float32)
+    times.append(time.perf_counter() - sum(times) - start)
+    return times
+
+def model_parity(num_images=None):
+    """
+    Top-1 agreement of the image model on full and draft decodes of the
+    rows held out in training (see utils/train_utils.image_split_indices).
+    """
+    _, df = image_train_val_split(pd.read_csv(PROCESSED_IMAGE_DATA_DIR / "instruments.csv"))
+    if num_images:
+        df = df.head(num_images)
+    with open(IMAGE_INDICES_PATH, 'rb') as f:
+        class_indices = pickle.load(f)
+    class_names = np.array([name for name, _ in sorted(class_indices.items(), key=lambda item: item[1])])
+
+    full, draft, labels = [], [], []
+    for filename, label in zip(df['filename'], df['label']):
+        path = CLEANED_IMAGE_DATA_DIR / filename
+        full_img, draft_img = preprocess_image(path, draft=False), preprocess_image(path, draft=True)
+        if full_img is not None and draft_img is not None:
+            full.append(full_img[0])
+            draft.append(draft_img[0])
+            labels.append(label)
+
+    backend = load_backend(INFERENCE_BACKEND, IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH, TFLITE_NUM_THREADS)
+    predict = lambda images: np.concatenate([backend.predict(np.stack(images[i:i + 32]))
+                                             for i in range(0, len(images), 32)])
+    full_probs, draft_probs = predict(full), predict(draft)
+    full_top1, draft_top1 = full_probs.argmax(axis=1), draft_probs.argmax(axis=1)
+    labels = np.array(labels)
+    return {
+        "samples": len(labels),
+        "top1_agreement": float(np.mean(full_top1 == draft_top1)),
+        "full_accuracy": float(np.mean(class_names[full_top1] == labels)),
+        "draft_accuracy": float(np.mean(class_names[draft_top1] == labels)),
+        "max_prob_diff": float(np.max(np.abs(full_probs - draft_probs))),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-stage latency of the image decode paths.")
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--real", action="store_true", help="Use the cleaned image set instead of synthetic JPEGs")
+    parser.add_argument("--model-parity", action="store_true",
+                        help="Compare the image model's predictions on full and draft decodes of the held-out split")
+    args = parser.parse_args()
+
+    if args.model_parity:
+        report = model_parity()
+        print(f"Image model, full vs draft decode ({report['samples']} held-out images)")
+        print(f"  Top-1 agreement:  {report['top1_agreement']:.2%}")
+        print(f"  Full accuracy:    {report['full_accuracy']:.2%}")
+        print(f"  Draft accuracy:   {report['draft_accuracy']:.2%}")
+        print(f"  Max prob. diff:   {report['max_prob_diff']:.4f}")
+        raise SystemExit
+
+    if args.real:
+        filenames = pd.read_csv(PROCESSED_IMAGE_DATA_DIR / "instruments.csv")['filename'].head(args.images)
+        photos = [(CLEANED_IMAGE_DATA_DIR / filename).read_bytes() for filename in filenames]
+    else:
+        photos = synthetic_photos(args.images, (args.width, args.height))
+    sizes = pd.Series([Image.open(io.BytesIO(contents)).size for contents in photos]).value_counts()
+    print(f"{len(photos)} images, most common size {sizes.index[0]}\n")
+
+    # 1. Per-stage latency
+    out = np.empty((*TARGET_SIZE, 3), dtype=np.float32)
+    rows = []
+    for name, draft in [("load_img + preprocess_input", None), ("full decode, fused", False), ("draft decode, fused", True)]:
+        stages = np.array([staged(contents, draft, out) for contents in photos]) * 1000
+        rows.append((name, *np.median(stages, axis=0), np.median(stages.sum(axis=1))))
+
+    print(f"{'Path (median ms)':<30}{'Decode':>9}{'Resize':>9}{'Convert':>9}{'Total':>9}")
+    for name, *stages in rows:
+        print(f"{name:<30}" + "".join(f"{value:>9.2f}" for value in stages))
+
+    # 2. End to end, against the previous implementation
+    def per_image_ms(fn):
+        start = time.perf_counter()
+        results = [fn(contents) for contents in photos]
+        return results, (time.perf_counter() - start) / len(photos) * 1000
+
+    reference, reference_ms = per_image_ms(preprocess_image_keras)
+    exact, exact_ms = per_image_ms(lambda contents: preprocess_image(io.BytesIO(contents), draft=False))
+    fast, fast_ms = per_image_ms(lambda contents: preprocess_image(io.BytesIO(contents), draft=True))
+
+    print(f"\n{'preprocess_image':<30}{'ms/image':>9}{'Speedup':>9}{'Max diff':>10}{'Mean diff':>10}")
+    for name, results, ms in [("previous (load_img)", reference, reference_ms),
+                              ("draft=False", exact, exact_ms),
+                              ("draft=True", fast, fast_ms)]:
+        diff = np.abs(np.concatenate(results) - np.concatenate(reference))
+        print(f"{name:<30}{ms:>9.2f}{reference_ms / ms:>8.1f}x{diff.max():>10.1f}{diff.mean():>10.2f}")
@@ -0,0 +1,74 @@
+import argparse
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from PIL import Image
+from config.constants import PROCESSED_IMAGE_DATA_DIR, CLEANED_IMAGE_DATA_DIR
+from utils.image_processing import get_image_generator, get_image_dataset
+
+def synthetic_images(directory, num_images, size=(640, 480), seed=0):
+    """
+    Writes random JPEGs of a typical photo size and returns their dataframe.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(num_images):
+        filename = f"{i}.jpg"
+        pixels = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(Path(directory) / filename, quality=90)
+        rows.append({"filename": filename, "label": f"class_{i % 10}"})
+    return pd.DataFrame(rows)
+
+def images_per_second(batches, num_images=None):
+    """
+    Iterates one epoch of batches and returns the throughput. Keras generators
+    loop forever, so they stop after `num_images`; datasets run to the end
+    (which also finalizes their cache).
+    """
+    start = time.perf_counter()
+    seen = 0
+    for images, _ in batches:
+        seen += len(images)
+        if num_images is not None and seen >= num_images:
+            break
+    return seen / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare ImageDataGenerator and tf.data input throughput.")
+    parser.add_argument("--images", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--real", action="store_true", help="Use the cleaned image set instead of synthetic JPEGs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.real:
+            df = pd.read_csv(PROCESSED_IMAGE_DATA_DIR / "instruments.csv").head(args.images)
+            directory = CLEANED_IMAGE_DATA_DIR
+        else:
+            df = synthetic_images(tmp, args.images)
+            directory = tmp
+        num_images = len(df)
+        print(f"{num_images} images, batch size {args.batch_size}\n")
+
+        generator = get_image_generator().flow_from_dataframe(
+            dataframe=df, directory=str(directory), x_col="filename", y_col="label",
+            target_size=(224, 224), batch_size=args.batch_size, class_mode="categorical", shuffle=True
+        )
+        results = [("ImageDataGenerator", images_per_second(generator, num_images))]
+
+        dataset = get_image_dataset(df, directory, batch_size=args.batch_size)
+        results.append(("tf.data", images_per_second(dataset)))
+
+        augmented = get_image_dataset(df, directory, batch_size=args.batch_size, augment=True)
+        results.append(("tf.data + augmentation", images_per_second(augmented)))
+
+        cached = get_image_dataset(df, directory, batch_size=args.batch_size, cache=Path(tmp) / "cache")
+        images_per_second(cached)  # First epoch fills the cache
+        results.append(("tf.data, cached epoch", images_per_second(cached)))
+
+    baseline = results[0][1]
+    print(f"\n{'Pipeline':<26}{'Images/s':>10}{'Speedup':>10}")
+    for name, throughput in results:
+        print(f"{name:<26}{throughput:>10.1f}{throughput / baseline:>9.1f}x")
@@ -0,0 +1,348 @@
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import platform
+import resource
+import subprocess
+import tempfile
+import threading
+import time
+import numpy as np
+import soundfile as sf
+from pathlib import Path
+from PIL import Image
+
+SCENARIOS = ("image", "audio", "batch_image", "batch_audio")
+IMAGE_CLASSES = 30
+AUDIO_CLASSES = 11
+YAMNET_FRAME_SAMPLES = 15360  # 0.96s at 16kHz
+YAMNET_HOP_SAMPLES = 7680
+
+# -----------------------------------------------------------------------------
+# Stand-in models: random weights, same inputs and outputs as the real ones
+# -----------------------------------------------------------------------------
+
+def build_stand_in_yamnet():
+    """
+    tf.Module with YAMNet's interface: a 16kHz float32 waveform in,
+    (scores (N, 521), embeddings (N, 1024), spectrogram (96N, 64), zeros here) out.
+    """
+    import tensorflow as tf
+
+    class StandInYamnet(tf.Module):
+        def __init__(self):
+            super().__init__()
+            rng = np.random.default_rng(0)
+            self.projection = tf.Variable(rng.standard_normal((160, 1024)).astype(np.float32) * 0.1)
+            self.classifier = tf.Variable(rng.standard_normal((1024, 521)).astype(np.float32) * 0.01)
+
+        @tf.function(input_signature=[tf.TensorSpec([None], tf.float32)])
+        def __call__(self, waveform):
+            frames = tf.signal.frame(waveform, YAMNET_FRAME_SAMPLES, YAMNET_HOP_SAMPLES, pad_end=True)
+            patches = tf.reshape(frames, (-1, 96, 160))
+            embeddings = tf.nn.relu(tf.reduce_mean(patches, axis=1) @ self.projection)
+            scores = tf.sigmoid(embeddings @ self.classifier)
+            spectrogram = tf.zeros((tf.shape(patches)[0] * 96, 64))
+            return scores, embeddings, spectrogram
+
+    return StandInYamnet()
+
+def write_stand_in_models(directory, image_model="small"):
+    """
+    Writes random-weight models and their label files to `directory` and
+    returns their paths, keyed like the src/api/config settings.
+
+    Args:
+        directory (Path): Output directory.
+        image_model (str): "small" (a few conv layers, fast to build) or
+            "resnet50" (the real architecture with random weights, realistic compute).
+    """
+    import tensorflow as tf
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+    from tensorflow.keras import layers, models
+    from utils.model_builder import build_classifier_head
+
+    directory = Path(directory)
+    paths = {
+        "IMAGE_MODEL_PATH": directory / "image.keras",
+        "IMAGE_INDICES_PATH": directory / "image_class_indices.pkl",
+        "AUDIO_MODEL_PATH": directory / "audio.keras",
+        "AUDIO_LABEL_ENCODER_PATH": directory / "label_encoder.pkl",
+        "AUDIO_SCALER_PATH": directory / "scaler.pkl",
+        "YAMNET_MODEL_DIR": directory / "yamnet",
+    }
+
+    # 1. Image: (224, 224, 3) -> IMAGE_CLASSES probabilities
+    if image_model == "resnet50":
+        base = tf.keras.applications.ResNet50(weights=None, include_top=False, pooling='avg', input_shape=(224, 224, 3))
+        image = models.Sequential([base, build_classifier_head(IMAGE_CLASSES)])
+    else:
+        image = models.Sequential([
+            layers.Input(shape=(224, 224, 3)),
+            layers.Conv2D(16, 3, strides=2, activation='relu'),
+            layers.Conv2D(32, 3, strides=2, activation='relu'),
+            layers.GlobalAveragePooling2D(),
+            layers.Dense(512, activation='relu'),
+            layers.Dense(IMAGE_CLASSES, activation='softmax'),
+        ])
+    image.save(paths["IMAGE_MODEL_PATH"])
+    with open(paths["IMAGE_INDICES_PATH"], 'wb') as f:
+        pickle.dump({f"instrument_{i:02d}": i for i in range(IMAGE_CLASSES)}, f)
+
+    # 2. Audio head: (1024,) YAMNet embedding -> AUDIO_CLASSES probabilities
+    audio = models.Sequential([
+        layers.Input(shape=(1024,)),
+        layers.Dense(1024, activation='relu'),
+        layers.Dense(512, activation='relu'),
+        layers.Dense(256, activation='relu'),
+        layers.Dense(AUDIO_CLASSES, activation='softmax'),
+    ])
+    audio.save(paths["AUDIO_MODEL_PATH"])
+    with open(paths["AUDIO_LABEL_ENCODER_PATH"], 'wb') as f:
+        pickle.dump(LabelEncoder().fit([f"instrument_{i:02d}" for i in range(AUDIO_CLASSES)]), f)
+    with open(paths["AUDIO_SCALER_PATH"], 'wb') as f:
+        pickle.dump(StandardScaler().fit(np.random.default_rng(0).standard_normal((256, 1024))), f)
+
+    # 3. YAMNet
+    tf.saved_model.save(build_stand_in_yamnet(), str(paths["YAMNET_MODEL_DIR"]))
+    return paths
+
+def use_stand_in_models(paths, cache=False):
+    """
+    Points the API at the stand-in models. Must run before the app starts loading.
+    """
+    import src.api.dependencies as dependencies
+    import src.api.services.cache as prediction_cache
+    import utils.embedding_extraction as embedding_extraction
+
+    dependencies.INFERENCE_BACKEND = "keras"
+    for name, path in paths.items():
+        if hasattr(dependencies, name):
+            setattr(dependencies, name, path)
+    embedding_extraction.YAMNET_MODEL_DIR = paths["YAMNET_MODEL_DIR"]
+    if not cache:
+        # Repeated payloads would otherwise be answered from the prediction cache
+        prediction_cache.prediction_cache = None
+
+# -----------------------------------------------------------------------------
+# Load generation
+# -----------------------------------------------------------------------------
+
+def make_payloads(count, seed=0):
+    """
+    Distinct JPEG images (640x480) and WAV clips (5s of 16kHz noise).
+    """
+    rng = np.random.default_rng(seed)
+    images, clips = [], []
+    for i in range(count):
+        buffer = io.BytesIO()
+        Image.fromarray(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)).save(buffer, format="JPEG", quality=90)
+        images.append((f"image_{i}.jpg", buffer.getvalue(), "image/jpeg"))
+
+        buffer = io.BytesIO()
+        sf.write(buffer, (rng.standard_normal(16000 * 5) * 0.1).astype(np.float32), 16000, format="WAV")
+        clips.append((f"clip_{i}.wav", buffer.getvalue(), "audio/wav"))
+    return {"image": images, "audio": clips}
+
+def scenario_request(scenario, payloads, i, batch_files):
+    """
+    Returns (route, multipart files, number of files) of the i-th request.
+    """
+    media_type = "image" if scenario.endswith("image") else "audio"
+    pool = payloads[media_type]
+    if scenario.startswith("batch_"):
+        files = [("files", pool[(i * batch_files + j) % len(pool)]) for j in range(batch_files)]
+        return f"/predict/batch/{media_type}", files, batch_files
+    return f"/predict/{media_type}/", {"file": pool[i % len(pool)]}, 1
+
+class RssSampler:
+    """
+    Samples the resident memory of this process and its worker processes
+    (audio decoding pool) in a background thread and keeps the peak.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def current_bytes():
+        pids = [os.getpid()] + [child.pid for child in multiprocessing.active_children()]
+        total = 0
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            except (OSError, ValueError):
+                pass
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_bytes = self.current_bytes()
+        if Path("/proc").exists():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+def summarize(latencies, statuses, elapsed, files_per_request):
+    latencies_ms = np.array(latencies) * 1000
+    ok = sum(count for status, count in statuses.items() if status == 200)
+    return {
+        "requests": len(latencies),
+        "errors": len(latencies) - ok,
+        "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+        "latency_ms": {
+            "p50": float(np.percentile(latencies_ms, 50)),
+            "p95": float(np.percentile(latencies_ms, 95)),
+            "p99": float(np.percentile(latencies_ms, 99)),
+            "mean": float(latencies_ms.mean()),
+            "max": float(latencies_ms.max()),
+        },
+        "throughput_rps": len(latencies) / elapsed,
+        "files_per_second": len(latencies) * files_per_request / elapsed,
+        "duration_seconds": elapsed,
+    }
+
+async def run_scenario(client, scenario, payloads, requests, concurrency, batch_files, warmup):
+    """
+    Sends `requests` requests from `concurrency` closed-loop clients (each one
+    sends its next request as soon as the previous answer arrives).
+    """
+    # 1. Warm-up requests are not measured
+    for i in range(warmup):
+        route, files, _ = scenario_request(scenario, payloads, i, batch_files)
+        await client.post(route, files=files)
+
+    # 2. Measured run
+    latencies, statuses = [], {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            route, files, _ = scenario_request(scenario, payloads, i, batch_files)
+            start = time.perf_counter()
+            response = await client.post(route, files=files)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    files_per_request = batch_files if scenario.startswith("batch_") else 1
+    result = summarize(latencies, statuses, elapsed, files_per_request)
+    result["peak_rss_mb"] = rss.peak_bytes / 1e6
+    return result
+
+async def run_load_test(scenarios, requests, concurrency, batch_files, warmup, payloads):
+    import httpx
+    from src.api.dependencies import model_manager
+    from src.api.main import app
+
+    # Lifespan (model loading, executor shutdown) runs as it does under uvicorn
+    async with app.router.lifespan_context(app):
+        start = time.perf_counter()
+        while not model_manager.is_ready():
+            if any(status["state"] == "failed" for status in model_manager.model_status.values()):
+                raise RuntimeError(f"Stand-in models failed to load: {model_manager.model_status}")
+            await asyncio.sleep(0.1)
+        load_seconds = time.perf_counter() - start
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            results = {}
+            for scenario in scenarios:
+                print(f"Running {scenario} ({requests} requests, concurrency {concurrency})...")
+                results[scenario] = await run_scenario(
+                    client, scenario, payloads, requests, concurrency, batch_files, warmup
+                )
+    return load_seconds, results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_report(report, baseline=None):
+    print(f"\n{'Scenario':<14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'files/s':>9}{'errors':>8}{'RSS MB':>9}")
+    for scenario, result in report["scenarios"].items():
+        latency = result["latency_ms"]
+        print(f"{scenario:<14}{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}"
+              f"{result['throughput_rps']:>9.1f}{result['files_per_second']:>9.1f}{result['errors']:>8}"
+              f"{result['peak_rss_mb']:>9.0f}")
+
+    if baseline is None:
+        return
+    # Ratios against a previous run: > 1.00x means slower (latency) or faster (throughput)
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'}:")
+    print(f"{'Scenario':<14}{'p50':>9}{'p95':>9}{'p99':>9}{'files/s':>9}{'RSS':>9}")
+    for scenario, result in report["scenarios"].items():
+        old = baseline["scenarios"].get(scenario)
+        if old is None:
+            continue
+        ratios = [result["latency_ms"][p] / old["latency_ms"][p] for p in ("p50", "p95", "p99")]
+        ratios += [result["files_per_second"] / old["files_per_second"], result["peak_rss_mb"] / old["peak_rss_mb"]]
+        print(f"{scenario:<14}" + "".join(f"{ratio:>8.2f}x" for ratio in ratios))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the API in-process with stand-in models.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-files", type=int, default=8, help="Files per batch request")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per scenario")
+    parser.add_argument("--image-model", choices=["small", "resnet50"], default="small")
+    parser.add_argument("--cache", action="store_true", help="Keep the prediction cache enabled")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    parser.add_argument("--compare", type=Path, help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("Building stand-in models...")
+        paths = write_stand_in_models(tmp, args.image_model)
+        use_stand_in_models(paths, cache=args.cache)
+        payloads = make_payloads(min(args.requests * args.batch_files, 64), args.seed)
+
+        load_seconds, results = asyncio.run(run_load_test(
+            args.scenarios, args.requests, args.concurrency, args.batch_files, args.warmup, payloads
+        ))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "config": {key: (str(value) if isinstance(value, Path) else value) for key, value in vars(args).items()},
+        "model_load_seconds": load_seconds,
+        "scenarios": results,
+        # Process lifetime peak (kB on Linux), including model building
+        "process_peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3,
+    }
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nReport saved to: {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -22,6 +22,7 @@ CLEANED_IMAGE_DATA_DIR = PROCESSED_IMAGE_DATA_DIR / "clean"
 MODELS_DIR = ROOT_DIR / "models"
 IMAGE_MODELS_DIR = MODELS_DIR / "image"
 AUDIO_MODELS_DIR = MODELS_DIR / "audio"
+YAMNET_MODEL_DIR = MODELS_DIR / "yamnet"  # Local export of https://tfhub.dev/google/yamnet/1
 
 # -- Data Cleaning
 THRESHOLD= 0.03
\ No newline at end of file
@@ -7,6 +7,7 @@ export interface PredictionResult {
   media_type: string;
   predicted_label: string;
   confidence: number;
+  error?: string | null;
 }
 
 export interface BatchPredictionResponse {
@@ -0,0 +1 @@
+΍MՆ骜H ­(֦2:&24029901717573624130476981163313722922
\ No newline at end of file
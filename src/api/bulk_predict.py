@@ -0,0 +1,240 @@
+import argparse
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tqdm import tqdm
+from config.constants import CLEANED_IMAGE_DATA_DIR, CLEANED_AUDIO_DATA_DIR
+from src.api.config import IMAGE_DRAFT_DECODE
+from src.api.dependencies import ModelManager
+from src.api.inference import top_labels
+from utils.embedding_extraction import extract_embedding
+from utils.image_processing import preprocess_image
+
+MEDIA_TYPES = {
+    "image": {
+        "models": ("image",),
+        "extensions": {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp"},
+        "data_dir": CLEANED_IMAGE_DATA_DIR,
+    },
+    "audio": {
+        "models": ("yamnet", "audio"),
+        "extensions": {".wav", ".flac", ".ogg", ".mp3", ".m4a"},
+        "data_dir": CLEANED_AUDIO_DATA_DIR,
+    },
+}
+BATCH_SIZE = 32
+DECODE_WORKERS = 8
+PREFETCH_BATCHES = 4  # Batches decoded ahead of the model
+
+def list_inputs(input_path, media_type, data_dir=None):
+    """
+    Returns a dataframe with 'filename', 'path' and, for CSV manifests, 'label'.
+
+    Args:
+        input_path (Path): A directory (searched recursively for image or audio
+            files) or a CSV with a 'filename' column, like the ones written by
+            utils/generate_image_csv.py and utils/generate_audio_csv.py.
+        media_type (str): "image" or "audio".
+        data_dir (Path): Directory the CSV filenames are relative to
+            (defaults to the cleaned data directory of the media type).
+    """
+    input_path = Path(input_path)
+    if input_path.is_dir():
+        extensions = MEDIA_TYPES[media_type]["extensions"]
+        paths = sorted(path for path in input_path.rglob("*") if path.suffix.lower() in extensions)
+        return pd.DataFrame({
+            "filename": [path.relative_to(input_path).as_posix() for path in paths],
+            "path": paths,
+        })
+
+    df = pd.read_csv(input_path)
+    columns = [column for column in ("filename", "label") if column in df.columns]
+    df = df[columns].drop_duplicates("filename").reset_index(drop=True)
+    data_dir = Path(data_dir or MEDIA_TYPES[media_type]["data_dir"])
+    df["path"] = [data_dir / filename for filename in df["filename"]]
+    return df
+
+def checkpoint_path(output_path):
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".partial.csv")
+
+def write_results(df, output_path):
+    if Path(output_path).suffix == ".parquet":
+        df.to_parquet(output_path, index=False)
+    else:
+        df.to_csv(output_path, index=False)
+
+def read_results(output_path):
+    if Path(output_path).suffix == ".parquet":
+        return pd.read_parquet(output_path)
+    return pd.read_csv(output_path)
+
+def _decode(media_type, path):
+    """
+    Decode stage: (224, 224, 3) image tensor or (1024,) YAMNet embedding, None on failure.
+    """
+    if media_type == "image":
+        img = preprocess_image(path, draft=IMAGE_DRAFT_DECODE)
+        return None if img is None else img[0]
+    return extract_embedding(str(path))
+
+def _decoded_batches(pool, media_type, batches):
+    """
+    Yields (batch, decoded inputs) in order while the next PREFETCH_BATCHES
+    batches are already being decoded by the pool.
+    """
+    batches = iter(batches)
+    in_flight = deque()
+
+    def submit(batch):
+        in_flight.append((batch, [pool.submit(_decode, media_type, path) for path in batch["path"]]))
+
+    for batch in batches:
+        submit(batch)
+        if len(in_flight) >= PREFETCH_BATCHES:
+            break
+    while in_flight:
+        batch, futures = in_flight.popleft()
+        next_batch = next(batches, None)
+        if next_batch is not None:
+            submit(next_batch)
+        yield batch, [future.result() for future in futures]
+
+def _write_checkpoints(results, checkpoint, errors):
+    """
+    Writer stage: appends each finished batch to the checkpoint file.
+    """
+    try:
+        header = not checkpoint.exists()
+        with open(checkpoint, "a", newline="") as f:
+            while (frame := results.get()) is not None:
+                frame.to_csv(f, header=header, index=False)
+                header = False
+                f.flush()
+    except Exception as e:
+        errors.append(e)
+        # Keep draining so the inference stage never blocks on a full queue
+        while results.get() is not None:
+            pass
+
+def bulk_predict(media_type, input_path, output_path, data_dir=None, batch_size=BATCH_SIZE,
+                 workers=DECODE_WORKERS, retry_failed=False):
+    """
+    Classifies every file of a directory or CSV manifest without going through HTTP.
+
+    Decoding (preprocess_image, or extract_embedding for audio) runs in a thread
+    pool ahead of batched inference through ModelManager, and a writer thread
+    appends every finished batch to `<output>.partial.csv`. An interrupted run
+    resumes from that checkpoint; the final CSV or Parquet file (by extension)
+    is written, in input order, once every file is done.
+
+    Args:
+        media_type (str): "image" or "audio".
+        input_path (Path): Directory or CSV manifest (see list_inputs).
+        output_path (Path): Results file (.csv or .parquet).
+        data_dir (Path): Base directory of the CSV filenames.
+        batch_size (int): Samples per model call.
+        workers (int): Decoding threads.
+        retry_failed (bool): Also re-run files that failed in a previous run.
+    """
+    output_path = Path(output_path)
+    if output_path.suffix == ".parquet":
+        # Fail before hours of inference if no Parquet engine is installed
+        pd.io.parquet.get_engine("auto")
+
+    files = list_inputs(input_path, media_type, data_dir)
+    if files.empty:
+        print(f"⚠️ No {media_type} files found in {input_path}, nothing to classify")
+        return None
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    checkpoint = checkpoint_path(output_path)
+
+    # 1. Resume: a finished output counts as a checkpoint too
+    if not checkpoint.exists() and output_path.exists():
+        read_results(output_path).to_csv(checkpoint, index=False)
+    if checkpoint.exists() and checkpoint.stat().st_size == 0:
+        # Interrupted before its first batch was written
+        checkpoint.unlink()
+    done = pd.read_csv(checkpoint) if checkpoint.exists() else pd.DataFrame(columns=["filename", "error"])
+    if retry_failed:
+        done = done[done["error"].isna()]
+    todo = files[~files["filename"].isin(done["filename"])]
+    print(f"{len(files)} files, {len(files) - len(todo)} already processed, {len(todo)} to classify")
+
+    # 2. Load only the models this media type needs
+    if len(todo):
+        manager = ModelManager()
+        model_names = MEDIA_TYPES[media_type]["models"]
+        manager.load_models(model_names)
+        if not manager.is_ready(*model_names):
+            print(f"❌ Could not load the {media_type} models")
+            return None
+
+        if media_type == "image":
+            predict_batch, labels = manager.predict_image_batch, manager.image_label_array
+        else:
+            predict_batch, labels = manager.predict_audio_batch, manager.audio_label_array
+        batches = [todo.iloc[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+        results, writer_errors = queue.Queue(maxsize=PREFETCH_BATCHES), []
+        writer = threading.Thread(target=_write_checkpoints, args=(results, checkpoint, writer_errors), daemon=True)
+        writer.start()
+
+        # 3. Decode ahead -> batched inference -> checkpoint writer
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool, tqdm(total=len(todo), unit="file") as progress:
+                for batch, decoded in _decoded_batches(pool, media_type, batches):
+                    frame = batch.drop(columns="path").reset_index(drop=True)
+                    frame["predicted_label"] = "Error"
+                    frame["confidence"] = 0.0
+                    frame["error"] = "Could not decode file"
+
+                    ok = [i for i, item in enumerate(decoded) if item is not None]
+                    if ok:
+                        predicted, confidences = top_labels(predict_batch(np.stack([decoded[i] for i in ok])), labels)
+                        frame.loc[ok, "predicted_label"] = predicted
+                        frame.loc[ok, "confidence"] = confidences
+                        frame.loc[ok, "error"] = None
+
+                    if writer_errors:
+                        raise writer_errors[0]
+                    results.put(frame)
+                    progress.update(len(frame))
+        finally:
+            results.put(None)
+            writer.join()
+        if writer_errors:
+            raise writer_errors[0]
+
+        elapsed = time.perf_counter() - start
+        print(f"Classified {len(todo)} files in {elapsed:.1f}s ({len(todo) / elapsed:.1f} files/s)")
+
+    # 4. Final output in input order (a retried file keeps its latest result)
+    df = pd.read_csv(checkpoint).drop_duplicates("filename", keep="last")
+    df = files[["filename"]].merge(df, on="filename", how="inner")
+    write_results(df, output_path)
+    checkpoint.unlink()
+
+    failed = int(df["error"].notna().sum())
+    print(f"✅ {len(df) - failed} files classified ({failed} failed)")
+    print(f"Results saved to: {output_path}")
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classify a directory or CSV manifest of files offline.")
+    parser.add_argument("media_type", choices=list(MEDIA_TYPES))
+    parser.add_argument("input", type=Path, help="Directory of files, or CSV with a 'filename' column")
+    parser.add_argument("--output", type=Path, required=True, help="Results file (.csv or .parquet)")
+    parser.add_argument("--data-dir", type=Path, default=None, help="Base directory of the CSV filenames")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DECODE_WORKERS, help="Decoding threads")
+    parser.add_argument("--retry-failed", action="store_true")
+    args = parser.parse_args()
+
+    bulk_predict(args.media_type, args.input, args.output, args.data_dir,
+                 args.batch_size, args.workers, args.retry_failed)
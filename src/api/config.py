@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -20,3 +21,121 @@ IMAGE_INDICES_PATH = IMAGE_MODELS_DIR / 'image_class_indices.pkl'
 AUDIO_MODEL_PATH = AUDIO_MODELS_DIR / 'instrument_classifier.h5'
 AUDIO_LABEL_ENCODER_PATH = AUDIO_MODELS_DIR / 'label_encoder.pkl'
 AUDIO_SCALER_PATH = AUDIO_MODELS_DIR / 'scaler.pkl'
+
+# Inference Backend
+# "keras":  the full-precision .keras/.h5 models above (default)
+# "tflite": the optimized exports written by `python -m utils.export_tflite`
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "keras")
+TFLITE_NUM_THREADS = 2
+IMAGE_TFLITE_PATH = IMAGE_MODELS_DIR / 'resnet50_instrument_classifier.tflite'
+AUDIO_TFLITE_PATH = AUDIO_MODELS_DIR / 'instrument_classifier.tflite'
+
+# Image Decoding
+# Reduced-scale JPEG decoding (see utils.image_processing.decode_image) is faster
+# for large photos, but not pixel-identical to the full decode the model was
+# trained on. Opt-in: check `python -m benchmarks.image_decode --model-parity`
+# (top-1 agreement on the validation split) before enabling it.
+IMAGE_DRAFT_DECODE = os.environ.get("IMAGE_DRAFT_DECODE", "0") == "1"
+
+# Micro-batching (Image Model)
+# Concurrent /predict/image/ requests are coalesced into one forward pass
+IMAGE_BATCH_MAX_SIZE = 16
+IMAGE_BATCH_MAX_WAIT_MS = 5
+IMAGE_BATCH_MAX_QUEUE = 64
+
+# Executors
+# TensorFlow inference + image preprocessing run in a thread pool,
+# librosa audio decoding runs in a process pool.
+# Work beyond MAX_PENDING is rejected with 503 + Retry-After.
+TF_EXECUTOR_WORKERS = 4
+TF_EXECUTOR_MAX_PENDING = 64
+AUDIO_DECODE_WORKERS = 2
+AUDIO_DECODE_MAX_PENDING = 32
+BUSY_RETRY_AFTER_SECONDS = 1
+
+# Batch Endpoints
+# Files decoded concurrently per request, and max samples per stacked model call
+BATCH_DECODE_CONCURRENCY = 8
+BATCH_INFERENCE_CHUNK_SIZE = 32
+# Streaming (NDJSON) batch endpoints: files processed at once before reading more of the upload
+STREAM_MAX_IN_FLIGHT = 8
+
+# Long Audio (/predict/audio/segments)
+# The upload is spooled to disk and classified in fixed windows, so memory is
+# bounded by AUDIO_SEGMENT_BATCH_SIZE windows whatever the recording length.
+AUDIO_SEGMENT_SECONDS = 5.0
+AUDIO_SEGMENT_HOP_SECONDS = 5.0
+AUDIO_SEGMENT_MIN_SECONDS = 1.0  # Shorter trailing windows are dropped
+AUDIO_SEGMENT_BATCH_SIZE = 8
+AUDIO_SEGMENT_MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+
+# Live Audio (WebSocket /ws/audio)
+# Clients push 16kHz mono PCM frames. Every new YAMNet hop (0.48s) is embedded
+# from the last YAMNet window (0.975s) only; predictions average the last
+# LIVE_AUDIO_CONTEXT_FRAMES frame embeddings and are smoothed over time.
+LIVE_AUDIO_SAMPLE_RATE = 16000
+LIVE_AUDIO_WINDOW_SAMPLES = 15600
+LIVE_AUDIO_HOP_SAMPLES = 7680
+LIVE_AUDIO_CONTEXT_FRAMES = 6
+LIVE_AUDIO_SMOOTHING = 0.5  # Weight of the newest prediction in the moving average
+LIVE_AUDIO_EMIT_HZ = 2.0  # Default predictions per second, overridable with ?rate=
+LIVE_AUDIO_MAX_LAG_SECONDS = 2.0  # Older unprocessed audio is dropped when inference falls behind
+
+# Warm-up
+# Batch sizes run once at load time so the first real requests skip graph setup
+IMAGE_WARMUP_BATCH_SIZES = (1, 4, IMAGE_BATCH_MAX_SIZE)
+AUDIO_WARMUP_BATCH_SIZES = (1, 8, BATCH_INFERENCE_CHUNK_SIZE)
+
+# Prediction Cache
+# Keyed by a hash of the upload bytes + model version + the settings that
+# change a prediction without touching the model files (see cache_settings).
+# Backend: "memory" (per worker), "disk" (SQLite shared by all workers) or "none"
+PREDICTION_CACHE_BACKEND = "memory"
+PREDICTION_CACHE_MAX_ENTRIES = 4096
+PREDICTION_CACHE_TTL_SECONDS = 3600
+PREDICTION_CACHE_PATH = PROJECT_ROOT / "cache" / "predictions.sqlite3"
+
+# Multi-worker Serving
+# "local":  every uvicorn worker loads its own copy of the models (default)
+# "shared": one model-host process owns the models and the HTTP workers send it
+#           tensors over shared memory. Set by `python -m src.api.serve`.
+SERVING_MODE = os.environ.get("SERVING_MODE", "local")
+MODEL_HOST_ADDRESS = os.environ.get("MODEL_HOST_ADDRESS", "/tmp/mic-model-host.sock")
+MODEL_HOST_AUTHKEY = os.environ.get("MODEL_HOST_AUTHKEY", "")
+MODEL_HOST_POLL_SECONDS = 0.5
+API_WORKERS = 4
+
+# Metrics (GET /metrics, Prometheus text format)
+# Histogram bucket upper bounds for latencies (seconds) and model batch sizes
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+# Top-k (?top_k=k on the image, audio and batch routes)
+# Every result carries the TOP_K_MAX best labels (also in the cache); responses keep the first k
+TOP_K_MAX = 5
+
+# Confidence Calibration
+# Temperatures fitted on the validation split by `python -m utils.fit_temperature`.
+# When CALIBRATE_CONFIDENCE is set and a model's file exists, its softmax
+# outputs are rescaled as softmax(log(p) / T); the argmax never changes.
+CALIBRATE_CONFIDENCE = os.environ.get("CALIBRATE_CONFIDENCE", "1") == "1"
+IMAGE_TEMPERATURE_PATH = IMAGE_MODELS_DIR / 'image_temperature.json'
+AUDIO_TEMPERATURE_PATH = AUDIO_MODELS_DIR / 'audio_temperature.json'
+
+# Multimodal Fusion (/predict/multimodal)
+# Image and audio probabilities are fused in the audio model's label space
+# (NSynth families): each image class adds its probability to its family.
+# Classes without a family (mostly percussion) only lower the image's say.
+MULTIMODAL_IMAGE_WEIGHT = 0.5
+MULTIMODAL_AUDIO_WEIGHT = 0.5
+# Below this fused probability over all families (only the image counts and it
+# shows an unmapped instrument), the prediction falls back to the recording.
+MULTIMODAL_MIN_FAMILY_MASS = 1e-3
+IMAGE_CLASS_AUDIO_FAMILIES = {
+    'accordion': 'reed', 'alphorn': 'brass', 'bagpipes': 'reed', 'banjo': 'guitar',
+    'clarinet': 'reed', 'clavichord': 'keyboard', 'concertina': 'reed', 'didgeridoo': 'brass',
+    'dulcimer': 'string', 'flute': 'flute', 'guitar': 'guitar', 'harmonica': 'reed',
+    'harp': 'string', 'ocarina': 'flute', 'piano': 'keyboard', 'saxaphone': 'reed',
+    'sitar': 'guitar', 'steel drum': 'mallet', 'trombone': 'brass', 'trumpet': 'brass',
+    'tuba': 'brass', 'violin': 'string', 'xylophone': 'mallet',
+}
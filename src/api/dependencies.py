@@ -1,9 +1,36 @@
-import tensorflow as tf
+import threading
+import time
 import pickle
+import numpy as np
 from src.api.config import (
     IMAGE_MODEL_PATH, IMAGE_INDICES_PATH,
-    AUDIO_MODEL_PATH, AUDIO_LABEL_ENCODER_PATH, AUDIO_SCALER_PATH
+    AUDIO_MODEL_PATH, AUDIO_LABEL_ENCODER_PATH, AUDIO_SCALER_PATH,
+    INFERENCE_BACKEND, TFLITE_NUM_THREADS, IMAGE_TFLITE_PATH, AUDIO_TFLITE_PATH, TF_EXECUTOR_WORKERS,
+    IMAGE_WARMUP_BATCH_SIZES, AUDIO_WARMUP_BATCH_SIZES,
+    IMAGE_BATCH_MAX_SIZE, IMAGE_BATCH_MAX_WAIT_MS, IMAGE_BATCH_MAX_QUEUE,
+    SERVING_MODE, MODEL_HOST_ADDRESS, MODEL_HOST_AUTHKEY,
+    CALIBRATE_CONFIDENCE, IMAGE_TEMPERATURE_PATH, AUDIO_TEMPERATURE_PATH
 )
+from src.api.inference import (
+    load_backend, scaler_affine, label_array, top_labels, apply_temperature, load_temperature
+)
+from src.api.model_host import RemoteModelManager
+from src.api.services.batching import MicroBatcher
+from src.api.services.cache import file_version
+from src.api.services.executor import tf_executor
+from src.api.services.metrics import BATCH_SIZE, stage
+from utils.embedding_extraction import load_yamnet_model, embed_waveform, embed_frames
+
+MODEL_DISPLAY_NAMES = {"image": "Image", "audio": "Audio", "yamnet": "YAMNet"}
+
+def _calibration(temperature_path):
+    """
+    Returns the fitted temperature of a model (None if calibration is off or
+    not fitted) and the files to include in its cache version.
+    """
+    if not CALIBRATE_CONFIDENCE:
+        return None, ()
+    return load_temperature(temperature_path), (temperature_path,)
 
 class ModelManager:
     _instance = None
@@ -11,43 +38,183 @@ class ModelManager:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ModelManager, cls).__new__(cls)
-            cls._instance.load_models()
+            cls._instance._init_state()
         return cls._instance
-    
-    def load_models(self):
-        print("Loading models...")
-        
-        # 1. Load Image Model & Indices
-        try:
-            self.image_model = tf.keras.models.load_model(IMAGE_MODEL_PATH, compile=False)
-            with open(IMAGE_INDICES_PATH, 'rb') as f:
-                self.image_indices = pickle.load(f)
-            
-            # Invert indices to map Model Output Index -> Class Name
-            # Loaded: {'guitar': 0, 'piano': 1}
-            # Needed: {0: 'guitar', 1: 'piano'}
-            self.image_labels = {v: k for k, v in self.image_indices.items()}
-            print("✅ Image model loaded.")
-        except Exception as e:
-            print(f"❌ Failed to load image model: {e}")
-            self.image_model = None
 
-        # 2. Load Audio Model, Label Encoder, Scaler
+    def _init_state(self):
+        # Models are loaded in the background by start_loading();
+        # until then every model is None and the service answers 503.
+        self.image_model = None
+        self.image_batcher = None
+        self.audio_model = None
+        self.audio_label_encoder = None
+        self.audio_scaler = None
+        self.yamnet_model = None
+        # Class index -> label arrays, so batches are decoded with one lookup
+        self.image_label_array = None
+        self.audio_label_array = None
+        # Softmax temperatures (None: uncalibrated), see CALIBRATE_CONFIDENCE
+        self.image_temperature = None
+        self.audio_temperature = None
+        # Pre-traced tf.function signatures of the Keras models, keyed by model name
+        self.serving_signatures = {}
+
+        # Per-model load state: pending -> loading -> ready | failed
+        self.model_status = {
+            name: {"state": "pending", "load_seconds": None, "error": None}
+            for name in ("image", "audio", "yamnet")
+        }
+        self._loader = None
+
+    def start_loading(self):
+        """
+        Loads every model in a background thread so startup is not blocked.
+        Safe to call more than once.
+        """
+        if self._loader is None:
+            self._loader = threading.Thread(target=self.load_models, name="model-loader", daemon=True)
+            self._loader.start()
+
+    def is_ready(self, *names) -> bool:
+        names = names or tuple(self.model_status)
+        return all(self.model_status[name]["state"] == "ready" for name in names)
+
+    def _track(self, name, load_fn):
+        status = self.model_status[name]
+        status["state"] = "loading"
+        start = time.perf_counter()
         try:
-            self.audio_model = tf.keras.models.load_model(AUDIO_MODEL_PATH, compile=False)
-            
-            with open(AUDIO_LABEL_ENCODER_PATH, 'rb') as f:
-                self.audio_label_encoder = pickle.load(f)
-                
-            with open(AUDIO_SCALER_PATH, 'rb') as f:
-                self.audio_scaler = pickle.load(f)
-                
-            print("✅ Audio model loaded.")
+            load_fn()
+            status["state"] = "ready"
+            print(f"✅ {MODEL_DISPLAY_NAMES[name]} model loaded.")
         except Exception as e:
-            print(f"❌ Failed to load audio model: {e}")
-            self.audio_model = None
+            status["state"] = "failed"
+            status["error"] = str(e)
+            print(f"❌ Failed to load {name} model: {e}")
+        finally:
+            status["load_seconds"] = time.perf_counter() - start
+
+    def load_models(self, names=("image", "yamnet", "audio")):
+        """
+        Loads the given models in the calling thread (all of them by default).
+        """
+        print("Loading models...")
+        loaders = {"image": self._load_image_model, "yamnet": self._load_yamnet_model, "audio": self._load_audio_model}
+        for name in names:
+            self._track(name, loaders[name])
+
+    def _load_image_model(self):
+        # 1. Load Image Model (Keras or TFLite, see INFERENCE_BACKEND) & Indices
+        # One TFLite interpreter per inference thread, built by warmup
+        image_model = load_backend(INFERENCE_BACKEND, IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH, TFLITE_NUM_THREADS,
+                                   pool_size=TF_EXECUTOR_WORKERS)
+        image_model.warmup(IMAGE_WARMUP_BATCH_SIZES)
+        with open(IMAGE_INDICES_PATH, 'rb') as f:
+            self.image_indices = pickle.load(f)
+
+        # Invert indices to map Model Output Index -> Class Name
+        # Loaded: {'guitar': 0, 'piano': 1}
+        # Needed: {0: 'guitar', 1: 'piano'}
+        self.image_labels = {v: k for k, v in self.image_indices.items()}
+        self.image_label_array = label_array(self.image_labels)
+        self.image_temperature, calibration_files = _calibration(IMAGE_TEMPERATURE_PATH)
+        image_path = IMAGE_TFLITE_PATH if INFERENCE_BACKEND == "tflite" else IMAGE_MODEL_PATH
+        self.image_version = file_version(image_path, IMAGE_INDICES_PATH, *calibration_files)
+
+        # Coalesce concurrent single-image requests into batched forward passes
+        self.image_batcher = MicroBatcher(
+            self.predict_image_batch,
+            max_batch_size=IMAGE_BATCH_MAX_SIZE,
+            max_wait_ms=IMAGE_BATCH_MAX_WAIT_MS,
+            max_queue_size=IMAGE_BATCH_MAX_QUEUE,
+            executor=tf_executor.executor
+        )
+        # Published last: requests are accepted once the model is set
+        self._publish_signature("image", image_model)
+        self.image_model = image_model
+
+    def _load_yamnet_model(self):
+        # 2. Load YAMNet (from the local export in models/yamnet when available)
+        self.yamnet_model = load_yamnet_model()
+
+    def _load_audio_model(self):
+        # 3. Load Label Encoder, Scaler and Audio Model
+        with open(AUDIO_LABEL_ENCODER_PATH, 'rb') as f:
+            self.audio_label_encoder = pickle.load(f)
+        self.audio_label_array = np.asarray(self.audio_label_encoder.classes_, dtype=object)
+
+        with open(AUDIO_SCALER_PATH, 'rb') as f:
+            self.audio_scaler = pickle.load(f)
+
+        # The scaler is folded into the model graph as x * weight + bias
+        audio_model = load_backend(INFERENCE_BACKEND, AUDIO_MODEL_PATH, AUDIO_TFLITE_PATH, TFLITE_NUM_THREADS,
+                                   input_affine=scaler_affine(self.audio_scaler), pool_size=TF_EXECUTOR_WORKERS)
+        audio_model.warmup(AUDIO_WARMUP_BATCH_SIZES)
+
+        self.audio_temperature, calibration_files = _calibration(AUDIO_TEMPERATURE_PATH)
+        audio_path = AUDIO_TFLITE_PATH if INFERENCE_BACKEND == "tflite" else AUDIO_MODEL_PATH
+        self.audio_version = file_version(audio_path, AUDIO_LABEL_ENCODER_PATH, AUDIO_SCALER_PATH,
+                                          *calibration_files)
+        self._publish_signature("audio", audio_model)
+        self.audio_model = audio_model
+
+    def _publish_signature(self, name, backend):
+        # TFLite models have no tf.function signature
+        signature = getattr(backend, "signature", None)
+        if signature is not None:
+            self.serving_signatures[name] = signature
+
+    def predict_audio_batch(self, embeddings):
+        """
+        Runs the audio head (with the scaler folded in) on YAMNet embeddings of shape (N, 1024).
+        Probabilities are temperature-calibrated when a temperature is loaded.
+        """
+        BATCH_SIZE.observe(len(embeddings), model="audio")
+        with stage("audio", "head"):
+            return apply_temperature(self.audio_model.predict(embeddings), self.audio_temperature)
+
+    def classify_audio_embeddings(self, embeddings):
+        """
+        Fused post-embedding stage: scaler, audio head and label decoding for a
+        whole (N, 1024) batch in one call.
+
+        Returns:
+            tuple: (labels (N,), confidences (N,), probabilities (N, num_classes)).
+        """
+        probabilities = self.predict_audio_batch(embeddings)
+        labels, confidences = top_labels(probabilities, self.audio_label_array)
+        return labels, confidences, probabilities
+
+    def predict_image_batch(self, batch):
+        """
+        Runs the image model on a stacked batch of shape (N, 224, 224, 3).
+        Probabilities are temperature-calibrated when a temperature is loaded.
+        """
+        BATCH_SIZE.observe(len(batch), model="image")
+        return apply_temperature(self.image_model.predict(batch), self.image_temperature)
+
+    def embed_waveform(self, wav_data):
+        """
+        Runs YAMNet over a 16kHz waveform and returns its (1024,) embedding.
+        """
+        return embed_waveform(wav_data)
+
+    def embed_frames(self, wav_data):
+        """
+        Runs YAMNet over a 16kHz waveform and returns its (N, 1024) frame embeddings.
+        """
+        return embed_frames(wav_data)
+
+    def close(self):
+        # Models are owned by this process and released with it
+        pass
 
-model_manager = ModelManager()
+# In "shared" mode (see src/api/serve.py) the weights live in the model-host
+# process and this worker only forwards tensors to it
+if SERVING_MODE == "shared":
+    model_manager = RemoteModelManager(MODEL_HOST_ADDRESS, bytes.fromhex(MODEL_HOST_AUTHKEY))
+else:
+    model_manager = ModelManager()
 
 def get_model_manager():
     return model_manager
@@ -0,0 +1,228 @@
+import json
+import queue
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+
+try:
+    # LiteRT is the maintained successor of tf.lite.Interpreter
+    from ai_edge_litert.interpreter import Interpreter as TFLiteInterpreter
+except ImportError:
+    TFLiteInterpreter = tf.lite.Interpreter
+
+
+class KerasBackend:
+    """
+    Runs a full-precision Keras model through a tf.function serving signature.
+
+    `model.predict` builds a tf.data pipeline and callbacks on every call, which
+    dominates the latency of small batches. The signature is traced once for a
+    fixed input spec with an unknown batch dimension, so any batch size reuses
+    the same graph.
+
+    An `input_affine` (weight, bias) pair, e.g. a folded StandardScaler (see
+    scaler_affine), is applied inside the same graph: x * weight + bias.
+    """
+    name = "keras"
+
+    def __init__(self, model, input_affine=None):
+        self.model = model
+        input_spec = tf.TensorSpec(shape=(None, *model.input_shape[1:]), dtype=tf.float32, name="inputs")
+        if input_affine is None:
+            serve = lambda inputs: model(inputs, training=False)
+        else:
+            weight, bias = (tf.constant(value, dtype=tf.float32) for value in input_affine)
+            serve = lambda inputs: model(inputs * weight + bias, training=False)
+        self.signature = tf.function(serve, input_signature=[input_spec]).get_concrete_function()
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        return self.signature(tf.convert_to_tensor(batch, dtype=tf.float32)).numpy()
+
+    def warmup(self, batch_sizes):
+        """
+        Runs the signature once per batch size, so kernel selection and
+        allocations happen at load time instead of on the first requests.
+        """
+        for batch_size in batch_sizes:
+            self.predict(np.zeros((batch_size, *self.signature.inputs[0].shape[1:]), dtype=np.float32))
+
+
+class TFLiteBackend:
+    """
+    Runs a TFLite model exported by utils/export_tflite.py (optionally float16/int8
+    quantized) on the XNNPACK CPU delegate.
+
+    TFLite interpreters are not thread-safe, so each call checks one out of a
+    pool and returns it afterwards. warmup builds `pool_size` of them (one per
+    executor thread) up front; more are only created under extra concurrency.
+    An interpreter's input is resized only when the batch size changes. An
+    `input_affine` is applied with NumPy before the interpreter runs.
+    """
+    name = "tflite"
+
+    def __init__(self, model_path, num_threads=None, input_affine=None, pool_size=1):
+        self.model_content = open(model_path, 'rb').read()
+        self.num_threads = num_threads
+        self.input_affine = input_affine
+        self.pool_size = max(1, int(pool_size))
+        # (interpreter, allocated batch size) pairs
+        self._pool = queue.SimpleQueue()
+        # Fail at load time, not on the first request
+        self._pool.put((self._new_interpreter(), None))
+
+    def _new_interpreter(self):
+        interpreter = TFLiteInterpreter(model_content=self.model_content, num_threads=self.num_threads)
+        interpreter.allocate_tensors()
+        return interpreter
+
+    def _checkout(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._new_interpreter(), None
+
+    def warmup(self, batch_sizes):
+        """
+        Builds the whole pool and runs every interpreter once per batch size,
+        so no executor thread pays for construction on its first request.
+        """
+        slots = [self._checkout() for _ in range(self.pool_size)]
+        try:
+            for i, (interpreter, allocated) in enumerate(slots):
+                input_shape = interpreter.get_input_details()[0]['shape_signature'][1:]
+                for batch_size in batch_sizes:
+                    zeros = np.zeros((batch_size, *input_shape), dtype=np.float32)
+                    _, allocated = self._run(interpreter, allocated, zeros)
+                    slots[i] = (interpreter, allocated)
+        finally:
+            for slot in slots:
+                self._pool.put(slot)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        interpreter, allocated = self._checkout()
+        try:
+            output, allocated = self._run(interpreter, allocated, batch)
+            return output
+        finally:
+            self._pool.put((interpreter, allocated))
+
+    def _run(self, interpreter, allocated, batch):
+        input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+
+        if allocated != len(batch):
+            # Unknown until allocate_tensors succeeds
+            allocated = None
+            interpreter.resize_tensor_input(input_details['index'], [len(batch), *batch.shape[1:]])
+            interpreter.allocate_tensors()
+            allocated = len(batch)
+            input_details = interpreter.get_input_details()[0]
+            output_details = interpreter.get_output_details()[0]
+
+        if self.input_affine is not None:
+            weight, bias = self.input_affine
+            batch = np.asarray(batch, dtype=np.float32) * weight + bias
+
+        # Fully int8-quantized models take and return integers
+        batch = _quantize(batch, input_details)
+        interpreter.set_tensor(input_details['index'], batch)
+        interpreter.invoke()
+        return _dequantize(interpreter.get_tensor(output_details['index']), output_details), allocated
+
+
+def _quantize(x: np.ndarray, details: dict) -> np.ndarray:
+    dtype = details['dtype']
+    if dtype == np.float32:
+        return np.asarray(x, dtype=np.float32)
+    scale, zero_point = details['quantization']
+    info = np.iinfo(dtype)
+    return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(dtype)
+
+
+def _dequantize(y: np.ndarray, details: dict) -> np.ndarray:
+    if details['dtype'] == np.float32:
+        return y
+    scale, zero_point = details['quantization']
+    return (y.astype(np.float32) - zero_point) * scale
+
+
+def scaler_affine(scaler):
+    """
+    Folds a fitted sklearn StandardScaler into float32 (weight, bias) vectors,
+    so that x * weight + bias == scaler.transform(x).
+    """
+    num_features = scaler.n_features_in_
+    # mean_ is also fitted when with_mean=False (for the variance), but not subtracted
+    weight = 1.0 / scaler.scale_ if scaler.with_std else np.ones(num_features)
+    bias = -scaler.mean_ * weight if scaler.with_mean else np.zeros(num_features)
+    return weight.astype(np.float32), bias.astype(np.float32)
+
+
+def label_array(labels: dict) -> np.ndarray:
+    """
+    Turns an {index: label} mapping into an array indexed by class index,
+    so a whole batch of predictions is decoded with one lookup.
+    """
+    array = np.full(max(labels, default=-1) + 1, "Unknown", dtype=object)
+    for index, label in labels.items():
+        array[index] = label
+    return array
+
+
+def top_labels(probabilities: np.ndarray, labels: np.ndarray):
+    """
+    Returns the predicted label and confidence of every row of an (N, num_classes) batch.
+    """
+    indices = np.argmax(probabilities, axis=1)
+    return labels[indices], probabilities[np.arange(len(indices)), indices]
+
+
+def top_k_indices(probabilities: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the indices of the k highest probabilities of every row of an
+    (N, num_classes) batch, best first.
+    """
+    k = min(k, probabilities.shape[-1])
+    # argpartition finds the k best in linear time; only those k are sorted
+    candidates = np.argpartition(-probabilities, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(probabilities, candidates, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+def apply_temperature(probabilities: np.ndarray, temperature) -> np.ndarray:
+    """
+    Temperature-scales softmax outputs: softmax(log(p) / T), which equals
+    softmax(logits / T) for the logits the model produced. T > 1 softens
+    overconfident predictions; the predicted class never changes.
+    """
+    if temperature is None or temperature == 1.0:
+        return probabilities
+    logits = np.log(np.maximum(probabilities, np.finfo(np.float32).tiny)) / np.float32(temperature)
+    logits -= logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return (exp / exp.sum(axis=-1, keepdims=True)).astype(np.float32)
+
+
+def load_temperature(path):
+    """
+    Reads a temperature written by utils/fit_temperature.py, or None if the
+    model has not been calibrated.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return float(json.load(f)["temperature"])
+
+
+def load_backend(kind: str, keras_path, tflite_path, num_threads=None, input_affine=None, pool_size=1):
+    """
+    Builds the inference backend selected by INFERENCE_BACKEND in src/api/config.py.
+    `pool_size` is the number of TFLite interpreters built by warmup (one per
+    thread that runs predict concurrently).
+    """
+    if kind == "tflite":
+        return TFLiteBackend(tflite_path, num_threads=num_threads, input_affine=input_affine, pool_size=pool_size)
+    if kind == "keras":
+        return KerasBackend(tf.keras.models.load_model(keras_path, compile=False), input_affine=input_affine)
+    raise ValueError(f"Unknown inference backend: {kind}")
@@ -1,11 +1,28 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.routers import image, audio, batch
+from src.api.config import LIVE_AUDIO_EMIT_HZ
+from src.api.dependencies import model_manager
+from src.api.routers import image, audio, batch, multimodal, stats, health, metrics
+from src.api.services.executor import shutdown_executors
+from src.api.services.live_audio import LiveAudioSession, PCM_FORMATS
+from src.api.services.metrics import MetricsMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load models in the background: the server accepts connections immediately
+    # and /health/ready reports when every model is warm
+    model_manager.start_loading()
+    yield
+    # Stop the inference threads and audio decoding processes
+    shutdown_executors()
+    model_manager.close()
 
 app = FastAPI(
     title="Musical Instrument Classifier API",
     description="API for classifying musical instruments from images and audio.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -26,11 +43,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts, in-flight requests and latency per route, served at /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include Routers
 app.include_router(image.router)
 app.include_router(audio.router)
 app.include_router(batch.router)
+app.include_router(multimodal.router)
+app.include_router(stats.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Musical Instrument Classifier API"}
+
+@app.websocket("/ws/audio")
+async def live_audio(websocket: WebSocket, rate: float = LIVE_AUDIO_EMIT_HZ, format: str = "int16"):
+    """
+    Live instrument recognition from a microphone.
+
+    Send binary messages of 16kHz mono PCM (`format`: int16 or float32,
+    little-endian) of any length. The server answers with JSON messages
+    {"time", "predicted_label", "confidence"} at most `rate` times per second.
+    """
+    await websocket.accept()
+    if not model_manager.is_ready("audio", "yamnet"):
+        await websocket.close(code=1013, reason="Audio model not loaded")
+        return
+    if format not in PCM_FORMATS or rate <= 0:
+        await websocket.close(code=1003, reason=f"Unsupported format or rate, expected one of {list(PCM_FORMATS)}")
+        return
+
+    session = LiveAudioSession(model_manager, emit_hz=rate, pcm_format=format)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            # Text messages are ignored, audio comes as binary frames
+            if message.get("bytes") is None:
+                continue
+            try:
+                prediction = await session.push(message["bytes"])
+            except HTTPException as e:
+                # Inference queue full: the hop stays pending and is retried with the next frame
+                await websocket.send_json({"error": e.detail})
+                continue
+            except ValueError as e:
+                await websocket.send_json({"error": str(e)})
+                continue
+            if prediction is not None:
+                await websocket.send_json(prediction)
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,251 @@
+import threading
+import time
+import numpy as np
+from multiprocessing.connection import Client, Listener
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+from src.api.config import (
+    IMAGE_BATCH_MAX_SIZE, IMAGE_BATCH_MAX_WAIT_MS, IMAGE_BATCH_MAX_QUEUE,
+    MODEL_HOST_POLL_SECONDS
+)
+from src.api.inference import label_array, top_labels
+from src.api.services.batching import MicroBatcher
+from src.api.services.executor import tf_executor
+from src.api.services.metrics import BATCH_SIZE
+
+# Initial per-connection shared memory size: one full image batch
+INITIAL_SHM_BYTES = IMAGE_BATCH_MAX_SIZE * 224 * 224 * 3 * 4
+
+
+# -----------------------------------------------------------------------------
+# Host side: the single process that owns the TensorFlow graphs
+# -----------------------------------------------------------------------------
+
+def _host_info(manager) -> dict:
+    info = {"model_status": manager.model_status}
+    if manager.is_ready("image"):
+        info["image_labels"] = manager.image_labels
+        info["image_version"] = manager.image_version
+    if manager.is_ready("audio"):
+        info["audio_label_encoder"] = manager.audio_label_encoder
+        info["audio_version"] = manager.audio_version
+    return info
+
+
+def _serve_connection(manager, conn):
+    """
+    Answers one HTTP worker thread. Input tensors arrive in a shared memory
+    segment owned by the worker; only small results go back over the pipe.
+    """
+    handlers = {
+        "predict_image": manager.predict_image_batch,
+        "predict_audio": manager.predict_audio_batch,
+        "embed_waveform": manager.embed_waveform,
+        "embed_frames": manager.embed_frames,
+    }
+    segment: Optional[SharedMemory] = None
+    try:
+        while True:
+            op, name, shape, dtype = conn.recv()
+            try:
+                if op == "info":
+                    conn.send(("ok", _host_info(manager)))
+                    continue
+
+                # The worker replaces its segment when it needs a larger one
+                if segment is None or segment.name != name:
+                    if segment is not None:
+                        segment.close()
+                    segment = SharedMemory(name=name, track=False)
+
+                # Zero-copy view of the worker's tensor; dropped before the segment can be closed
+                array = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+                try:
+                    result = handlers[op](array)
+                finally:
+                    del array
+                conn.send(("ok", None if result is None else np.asarray(result)))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    except (EOFError, ConnectionResetError):
+        pass
+    finally:
+        if segment is not None:
+            segment.close()
+        conn.close()
+
+
+def run_model_host(address: str, authkey: bytes):
+    """
+    Entry point of the model-host process: loads every model once and serves
+    inference requests from all HTTP workers.
+    """
+    from src.api.dependencies import ModelManager
+
+    manager = ModelManager()
+    manager.start_loading()
+
+    listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    print(f"Model host listening on {address}")
+    while True:
+        conn = listener.accept()
+        threading.Thread(target=_serve_connection, args=(manager, conn), daemon=True).start()
+
+
+# -----------------------------------------------------------------------------
+# Worker side: a ModelManager stand-in that forwards tensors to the host
+# -----------------------------------------------------------------------------
+
+class _Channel:
+    """
+    One connection to the host plus a reusable shared memory segment.
+    Each executor thread gets its own, so requests never interleave on a pipe.
+    """
+
+    def __init__(self, address: str, authkey: bytes):
+        self.conn = Client(address, family="AF_UNIX", authkey=authkey)
+        self.segment: Optional[SharedMemory] = None
+
+    def close(self):
+        self.conn.close()
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+
+    def call(self, op: str, array: Optional[np.ndarray] = None):
+        if array is None:
+            self.conn.send((op, None, None, None))
+        else:
+            array = np.ascontiguousarray(array)
+            self._ensure_capacity(array.nbytes)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=self.segment.buf)[...] = array
+            self.conn.send((op, self.segment.name, array.shape, array.dtype.str))
+
+        status, payload = self.conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"Model host error: {payload}")
+        return payload
+
+    def _ensure_capacity(self, nbytes: int):
+        if self.segment is not None and self.segment.size >= nbytes:
+            return
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+        self.segment = SharedMemory(create=True, size=max(nbytes, INITIAL_SHM_BYTES))
+
+
+class RemoteModelManager:
+    """
+    Used by uvicorn workers in "shared" serving mode. Exposes the same interface
+    as ModelManager, but no weights are loaded in the worker: every forward pass
+    is executed by the model-host process.
+    """
+
+    def __init__(self, address: str, authkey: bytes):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+        self._channels = []
+
+        self.image_batcher = None
+        self.image_labels = {}
+        self.audio_label_encoder = None
+        self.image_label_array = None
+        self.audio_label_array = None
+        self.model_status = {
+            name: {"state": "pending", "load_seconds": None, "error": None}
+            for name in ("image", "audio", "yamnet")
+        }
+        self._poller = None
+
+    def _channel(self) -> _Channel:
+        channel = getattr(self._local, "channel", None)
+        if channel is None:
+            channel = self._local.channel = _Channel(self.address, self.authkey)
+            self._channels.append(channel)
+        return channel
+
+    def close(self):
+        """
+        Disconnects from the host and releases this worker's shared memory.
+        """
+        for channel in self._channels:
+            channel.close()
+        self._channels = []
+
+    def start_loading(self):
+        """
+        Polls the host until every model has finished loading (or failed).
+        """
+        if self._poller is None:
+            self._poller = threading.Thread(target=self._poll_host, name="model-host-poller", daemon=True)
+            self._poller.start()
+
+    def _poll_host(self):
+        while True:
+            try:
+                info = self._call("info")
+            except (OSError, EOFError):
+                # Host not up yet
+                time.sleep(MODEL_HOST_POLL_SECONDS)
+                continue
+
+            if "image_labels" in info and self.image_batcher is None:
+                self.image_labels = info["image_labels"]
+                self.image_label_array = label_array(self.image_labels)
+                self.image_version = info["image_version"]
+                # Batch locally first, so the host sees few, large requests
+                self.image_batcher = MicroBatcher(
+                    self.predict_image_batch,
+                    max_batch_size=IMAGE_BATCH_MAX_SIZE,
+                    max_wait_ms=IMAGE_BATCH_MAX_WAIT_MS,
+                    max_queue_size=IMAGE_BATCH_MAX_QUEUE,
+                    executor=tf_executor.executor
+                )
+            if "audio_label_encoder" in info:
+                self.audio_label_encoder = info["audio_label_encoder"]
+                self.audio_label_array = np.asarray(self.audio_label_encoder.classes_, dtype=object)
+                self.audio_version = info["audio_version"]
+            self.model_status = info["model_status"]
+
+            if all(status["state"] in ("ready", "failed") for status in self.model_status.values()):
+                return
+            time.sleep(MODEL_HOST_POLL_SECONDS)
+
+    def is_ready(self, *names) -> bool:
+        names = names or tuple(self.model_status)
+        return all(self.model_status[name]["state"] == "ready" for name in names)
+
+    def _call(self, op: str, array: Optional[np.ndarray] = None):
+        try:
+            return self._channel().call(op, array)
+        except (OSError, EOFError):
+            # Broken pipe to the host: reconnect on the next call
+            channel = getattr(self._local, "channel", None)
+            self._local.channel = None
+            if channel is not None:
+                self._channels.remove(channel)
+                channel.close()
+            raise
+
+    def predict_image_batch(self, batch):
+        # The head stage is timed in the host process, batch sizes here
+        BATCH_SIZE.observe(len(batch), model="image")
+        return self._call("predict_image", np.asarray(batch, dtype=np.float32))
+
+    def predict_audio_batch(self, embeddings):
+        BATCH_SIZE.observe(len(embeddings), model="audio")
+        return self._call("predict_audio", np.asarray(embeddings, dtype=np.float32))
+
+    def classify_audio_embeddings(self, embeddings):
+        probabilities = self.predict_audio_batch(embeddings)
+        labels, confidences = top_labels(probabilities, self.audio_label_array)
+        return labels, confidences, probabilities
+
+    def embed_waveform(self, wav_data):
+        return self._call("embed_waveform", np.asarray(wav_data, dtype=np.float32))
+
+    def embed_frames(self, wav_data):
+        return self._call("embed_frames", np.asarray(wav_data, dtype=np.float32))
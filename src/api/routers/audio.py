@@ -1,7 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, Depends
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Depends, Request, HTTPException, Query
+from src.api.config import TOP_K_MAX
 from src.api.dependencies import get_model_manager, ModelManager
-from src.api.services.audio_service import predict_audio
-from src.api.schemas.prediction import PredictionResult
+from src.api.services.audio_service import predict_audio, predict_audio_segments
+from src.api.services.metrics import record_error
+from src.api.services.results import select_top_k
+from src.api.schemas.prediction import PredictionResult, SegmentedPredictionResult
 
 router = APIRouter(
     prefix="/predict/audio",
@@ -11,9 +15,35 @@ router = APIRouter(
 @router.post("/", response_model=PredictionResult)
 async def predict_audio_endpoint(
     file: UploadFile = File(...),
+    top_k: Optional[int] = Query(None, ge=1, le=TOP_K_MAX, description="Also return the k best labels"),
     manager: ModelManager = Depends(get_model_manager)
 ):
     """
     Predict the class of a musical instrument from an audio file (WAV).
     """
-    return await predict_audio(file, manager)
+    try:
+        return select_top_k(await predict_audio(file, manager), top_k)
+    except Exception as e:
+        record_error("audio", e)
+        raise
+
+@router.post("/segments", response_model=SegmentedPredictionResult)
+async def predict_audio_segments_endpoint(
+    request: Request,
+    filename: str = "upload.wav",
+    manager: ModelManager = Depends(get_model_manager)
+):
+    """
+    Predict instruments over time in a long recording.
+
+    The audio file is sent as the raw request body (chunked transfer encoding
+    is supported) and classified in fixed windows. Returns one prediction per
+    segment with its timestamps, plus a label pooled over the whole recording.
+    """
+    try:
+        if request.headers.get("content-type", "").startswith("multipart/"):
+            raise HTTPException(status_code=400, detail="Send the audio file as the raw request body")
+        return await predict_audio_segments(request.stream(), filename, manager)
+    except Exception as e:
+        record_error("audio", e)
+        raise
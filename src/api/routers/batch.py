@@ -1,8 +1,13 @@
-from typing import List
-from fastapi import APIRouter, UploadFile, File, Depends
+from typing import List, Optional
+from fastapi import APIRouter, UploadFile, File, Depends, Request, Query
+from src.api.config import TOP_K_MAX
 from src.api.dependencies import get_model_manager, ModelManager
-from src.api.services.image_service import predict_image
-from src.api.services.audio_service import predict_audio
+from src.api.services.image_service import predict_image, predict_image_files
+from src.api.services.audio_service import predict_audio, predict_audio_files
+from src.api.services.streaming import (
+    NDJSONStreamingResponse, multipart_boundary, iter_multipart_files, stream_predictions
+)
+from src.api.services.results import select_top_k
 from src.api.schemas.prediction import BatchPredictionResponse, PredictionResult
 
 router = APIRouter(
@@ -10,63 +15,70 @@ router = APIRouter(
     tags=["Batch Prediction"]
 )
 
+def build_batch_response(results: List[PredictionResult], top_k: Optional[int] = None) -> BatchPredictionResponse:
+    results = [select_top_k(result, top_k) for result in results]
+    error_count = sum(1 for result in results if result.error is not None)
+    return BatchPredictionResponse(
+        results=results,
+        total_processed=len(results),
+        success_count=len(results) - error_count,
+        error_count=error_count
+    )
+
 @router.post("/image", response_model=BatchPredictionResponse)
 async def batch_predict_image(
     files: List[UploadFile] = File(...),
+    top_k: Optional[int] = Query(None, ge=1, le=TOP_K_MAX, description="Also return the k best labels"),
     manager: ModelManager = Depends(get_model_manager)
 ):
-    results = []
-    success_count = 0
-    error_count = 0
-    
-    for file in files:
-        try:
-            result = await predict_image(file, manager)
-            results.append(result)
-            success_count += 1
-        except Exception:
-            # Log error if needed
-            results.append(PredictionResult(
-                filename=file.filename,
-                media_type="image",
-                predicted_label="Error",
-                confidence=0.0
-            ))
-            error_count += 1
-            
-    return BatchPredictionResponse(
-        results=results,
-        total_processed=len(files),
-        success_count=success_count,
-        error_count=error_count
-    )
+    results = await predict_image_files(files, manager)
+    return build_batch_response(results, top_k)
 
 @router.post("/audio", response_model=BatchPredictionResponse)
 async def batch_predict_audio(
     files: List[UploadFile] = File(...),
+    top_k: Optional[int] = Query(None, ge=1, le=TOP_K_MAX, description="Also return the k best labels"),
     manager: ModelManager = Depends(get_model_manager)
 ):
-    results = []
-    success_count = 0
-    error_count = 0
-    
-    for file in files:
-        try:
-            result = await predict_audio(file, manager)
-            results.append(result)
-            success_count += 1
-        except Exception:
-            results.append(PredictionResult(
-                filename=file.filename,
-                media_type="audio",
-                predicted_label="Error",
-                confidence=0.0
-            ))
-            error_count += 1
-            
-    return BatchPredictionResponse(
-        results=results,
-        total_processed=len(files),
-        success_count=success_count,
-        error_count=error_count
+    results = await predict_audio_files(files, manager)
+    return build_batch_response(results, top_k)
+
+@router.post("/image/stream", response_class=NDJSONStreamingResponse)
+async def batch_predict_image_stream(
+    request: Request,
+    top_k: Optional[int] = Query(None, ge=1, le=TOP_K_MAX, description="Also return the k best labels"),
+    manager: ModelManager = Depends(get_model_manager)
+):
+    """
+    Streaming variant of /predict/batch/image (multipart field 'files').
+    Emits one PredictionResult per line as soon as it is ready, then a
+    final {"summary": ...} line. The upload is parsed incrementally.
+    """
+    boundary = multipart_boundary(request)
+    lines = stream_predictions(
+        iter_multipart_files(request, boundary),
+        lambda file: predict_image(file, manager),
+        media_type="image",
+        top_k=top_k
+    )
+    return NDJSONStreamingResponse(lines)
+
+@router.post("/audio/stream", response_class=NDJSONStreamingResponse)
+async def batch_predict_audio_stream(
+    request: Request,
+    top_k: Optional[int] = Query(None, ge=1, le=TOP_K_MAX, description="Also return the k best labels"),
+    manager: ModelManager = Depends(get_model_manager)
+):
+    """
+    Streaming variant of /predict/batch/audio (multipart field 'files').
+    Emits one PredictionResult per line as soon as it is ready, then a
+    final {"summary": ...} line. The upload is parsed incrementally.
+    """
+    boundary = multipart_boundary(request)
+    lines = stream_predictions(
+        iter_multipart_files(request, boundary),
+        lambda file: predict_audio(file, manager),
+        media_type="audio",
+        top_k=top_k
     )
+    return NDJSONStreamingResponse(lines)
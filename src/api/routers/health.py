@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from src.api.dependencies import get_model_manager, ModelManager
+from src.api.schemas.health import ReadinessResponse
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"]
+)
+
+@router.get("/live")
+async def liveness():
+    """
+    The process is up and the event loop is responsive.
+    """
+    return {"status": "alive"}
+
+@router.get("/ready", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}})
+async def readiness(manager: ModelManager = Depends(get_model_manager)):
+    """
+    Per-model load state and load time. Returns 503 until every model is loaded,
+    so orchestrators only route traffic to fully warm workers.
+    """
+    response = ReadinessResponse(ready=manager.is_ready(), models=manager.model_status)
+    return JSONResponse(status_code=200 if response.ready else 503, content=response.model_dump())
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, UploadFile, File, Depends
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Depends, Query
+from src.api.config import TOP_K_MAX
 from src.api.dependencies import get_model_manager, ModelManager
 from src.api.services.image_service import predict_image
+from src.api.services.metrics import record_error
+from src.api.services.results import select_top_k
 from src.api.schemas.prediction import PredictionResult
 
 router = APIRouter(
@@ -11,9 +15,14 @@ router = APIRouter(
 @router.post("/", response_model=PredictionResult)
 async def predict_image_endpoint(
     file: UploadFile = File(...),
+    top_k: Optional[int] = Query(None, ge=1, le=TOP_K_MAX, description="Also return the k best labels"),
     manager: ModelManager = Depends(get_model_manager)
 ):
     """
     Predict the class of a musical instrument from an image file.
     """
-    return await predict_image(file, manager)
+    try:
+        return select_top_k(await predict_image(file, manager), top_k)
+    except Exception as e:
+        record_error("image", e)
+        raise
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from src.api.dependencies import get_model_manager, ModelManager
+from src.api.services.executor import tf_executor, audio_decode_executor
+from src.api.services.metrics import (
+    MODEL_LOAD_SECONDS, MODEL_READY, EXECUTOR_PENDING, EXECUTOR_REJECTED,
+    BATCHER_QUEUE_DEPTH, render_metrics
+)
+
+router = APIRouter(
+    tags=["Monitoring"]
+)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(manager: ModelManager = Depends(get_model_manager)):
+    """
+    Request counts, error causes, per-stage latency histograms, batch sizes,
+    in-flight requests and model load times in the Prometheus text format.
+    Metrics are per worker process.
+    """
+    # 1. Refresh the gauges that mirror existing state
+    for name, status in manager.model_status.items():
+        MODEL_READY.set(status["state"] == "ready", model=name)
+        if status["load_seconds"] is not None:
+            MODEL_LOAD_SECONDS.set(status["load_seconds"], model=name)
+    for executor in (tf_executor, audio_decode_executor):
+        EXECUTOR_PENDING.set(executor.pending, executor=executor.name)
+        EXECUTOR_REJECTED.set(executor.rejected_count, executor=executor.name)
+    if manager.image_batcher:
+        BATCHER_QUEUE_DEPTH.set(manager.image_batcher.queue_depth)
+
+    # 2. Render every metric
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
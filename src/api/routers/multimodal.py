@@ -0,0 +1,32 @@
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Depends, Query
+from src.api.config import TOP_K_MAX, MULTIMODAL_IMAGE_WEIGHT, MULTIMODAL_AUDIO_WEIGHT
+from src.api.dependencies import get_model_manager, ModelManager
+from src.api.services.multimodal_service import predict_multimodal
+from src.api.services.metrics import record_error
+from src.api.schemas.prediction import MultimodalPredictionResult
+
+router = APIRouter(
+    prefix="/predict/multimodal",
+    tags=["Multimodal Prediction"]
+)
+
+@router.post("", response_model=MultimodalPredictionResult)
+async def predict_multimodal_endpoint(
+    image: UploadFile = File(...),
+    audio: UploadFile = File(...),
+    image_weight: float = Query(MULTIMODAL_IMAGE_WEIGHT, ge=0, description="Weight of the image model"),
+    audio_weight: float = Query(MULTIMODAL_AUDIO_WEIGHT, ge=0, description="Weight of the audio model"),
+    top_k: Optional[int] = Query(None, ge=1, le=TOP_K_MAX, description="Also return the k best labels"),
+    manager: ModelManager = Depends(get_model_manager)
+):
+    """
+    Predict the instrument from a photo and a recording of it (multipart fields
+    'image' and 'audio'). Returns a label fused over both models, in the audio
+    model's instrument families, plus each model's own prediction.
+    """
+    try:
+        return await predict_multimodal(image, audio, manager, image_weight, audio_weight, top_k)
+    except Exception as e:
+        record_error("multimodal", e)
+        raise
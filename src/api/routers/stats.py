@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends
+from src.api.dependencies import get_model_manager, ModelManager
+from src.api.services.cache import prediction_cache
+from src.api.services.executor import tf_executor, audio_decode_executor
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["Statistics"]
+)
+
+@router.get("/batching")
+async def batching_stats(manager: ModelManager = Depends(get_model_manager)):
+    """
+    Queue depth and achieved batch sizes of the image micro-batcher.
+    """
+    if not manager.image_batcher:
+        return {"image": None}
+    return {"image": manager.image_batcher.stats()}
+
+@router.get("/executors")
+async def executor_stats():
+    """
+    Pending work and rejections of the inference and audio decoding pools.
+    """
+    return {
+        "inference": tf_executor.stats(),
+        "audio_decoding": audio_decode_executor.stats(),
+    }
+
+@router.get("/cache")
+async def cache_stats():
+    """
+    Size and hit/miss counters of the prediction cache.
+    """
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
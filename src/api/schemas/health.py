@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+class ModelStatus(BaseModel):
+    state: str  # "pending", "loading", "ready" or "failed"
+    load_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    models: Dict[str, ModelStatus]
@@ -1,14 +1,51 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+class LabelProbability(BaseModel):
+    label: str
+    probability: float
 
 class PredictionResult(BaseModel):
     filename: str
     media_type: str  # "audio" or "image"
     predicted_label: str
     confidence: float
+    error: Optional[str] = None  # Reason of the failure (batch entries only)
+    top_k: Optional[List[LabelProbability]] = None  # Best labels first, only when ?top_k is set
     
 class BatchPredictionResponse(BaseModel):
     results: List[PredictionResult]
     total_processed: int
     success_count: int
     error_count: int
+
+class BatchSummary(BaseModel):
+    total_processed: int
+    success_count: int
+    error_count: int
+    error: Optional[str] = None  # Set if the upload stream itself failed
+
+class AudioSegment(BaseModel):
+    start: float  # Seconds from the beginning of the recording
+    end: float
+    predicted_label: str
+    confidence: float
+
+class SegmentedPredictionResult(BaseModel):
+    filename: str
+    media_type: str = "audio"
+    duration: float
+    predicted_label: str  # Pooled over all segments
+    confidence: float
+    segments: List[AudioSegment]
+
+class MultimodalPredictionResult(BaseModel):
+    media_type: str = "multimodal"
+    predicted_label: str  # Fused label, in the audio model's families
+    confidence: float
+    image_label: Optional[str] = None  # Most likely image class of that family, if any maps to it
+    weights: Dict[str, float]  # Normalized weight of each modality
+    unmapped: float = 0.0  # Fused probability on image classes without an audio family
+    image: PredictionResult
+    audio: PredictionResult
+    top_k: Optional[List[LabelProbability]] = None  # Best fused labels first, only when ?top_k is set
@@ -0,0 +1,49 @@
+import argparse
+import multiprocessing
+import os
+import secrets
+import uvicorn
+from src.api.config import API_HOST, API_PORT, API_WORKERS, MODEL_HOST_ADDRESS
+from src.api.model_host import run_model_host
+
+def serve(workers: int, host: str, port: int, address: str):
+    """
+    Multi-worker serving with a single copy of the model weights.
+
+    Starts one model-host process that loads ResNet50, YAMNet and the audio
+    head, then `workers` uvicorn processes that decode uploads and send the
+    preprocessed tensors to the host over shared memory.
+    """
+    authkey = secrets.token_bytes(32)
+
+    # Remove a stale socket left by a previous run
+    if os.path.exists(address):
+        os.remove(address)
+
+    # 'spawn' so the host starts from a clean interpreter
+    context = multiprocessing.get_context("spawn")
+    model_host = context.Process(target=run_model_host, args=(address, authkey), name="model-host", daemon=True)
+    model_host.start()
+
+    # Workers are spawned by uvicorn and inherit these variables
+    os.environ["SERVING_MODE"] = "shared"
+    os.environ["MODEL_HOST_ADDRESS"] = address
+    os.environ["MODEL_HOST_AUTHKEY"] = authkey.hex()
+
+    try:
+        uvicorn.run("src.api.main:app", host=host, port=port, workers=workers)
+    finally:
+        model_host.terminate()
+        model_host.join()
+        if os.path.exists(address):
+            os.remove(address)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the API with N workers sharing one model-host process.")
+    parser.add_argument("--workers", type=int, default=API_WORKERS)
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--socket", default=MODEL_HOST_ADDRESS, help="Unix socket of the model host")
+    args = parser.parse_args()
+
+    serve(args.workers, args.host, args.port, args.socket)
@@ -1,60 +1,245 @@
+import asyncio
 import os
 import tempfile
 import numpy as np
-import shutil
+from pathlib import Path
+from typing import AsyncIterator, List, Tuple
 from fastapi import UploadFile, HTTPException
+from src.api.config import (
+    BATCH_DECODE_CONCURRENCY, BATCH_INFERENCE_CHUNK_SIZE,
+    AUDIO_SEGMENT_SECONDS, AUDIO_SEGMENT_HOP_SECONDS, AUDIO_SEGMENT_MIN_SECONDS,
+    AUDIO_SEGMENT_BATCH_SIZE, AUDIO_SEGMENT_MAX_UPLOAD_BYTES
+)
 from src.api.dependencies import ModelManager
-from src.api.schemas.prediction import PredictionResult
-from utils.embedding_extraction import extract_embedding
+from src.api.schemas.prediction import PredictionResult, AudioSegment, SegmentedPredictionResult
+from src.api.services.cache import lookup_prediction, store_prediction, store_predictions
+from src.api.services.executor import tf_executor, audio_decode_executor
+from src.api.services.metrics import stage
+from src.api.services.results import build_result, error_result
+from utils.audio_decoding import load_audio, audio_duration, load_audio_segment, UnsupportedAudioFormat
+
+async def load_audio_embedding(contents: bytes, filename: str, manager: ModelManager) -> np.ndarray:
+    """
+    Decodes uploaded audio bytes in memory and returns their (1024,) YAMNet embedding.
+    """
+    # Decode + resample to 16kHz in the process pool (librosa holds the GIL)
+    try:
+        with stage("audio", "decode"):
+            wav_data = await audio_decode_executor.run(load_audio, contents)
+    except HTTPException:
+        raise
+    except UnsupportedAudioFormat as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error loading {filename}: {e}")
+        wav_data = None
+
+    # Extract embedding (YAMNet) in the inference pool
+    embedding = None
+    if wav_data is not None:
+        with stage("audio", "embedding"):
+            embedding = await tf_executor.run(manager.embed_waveform, wav_data)
+
+    if embedding is None:
+        raise HTTPException(status_code=400, detail="Could not extract features from audio file")
+
+    return embedding
+
+def decode_audio_label(predicted_index: int, manager: ModelManager) -> str:
+    return str(manager.audio_label_array[predicted_index])
+
+def build_audio_result(filename: str, probabilities: np.ndarray, manager: ModelManager) -> PredictionResult:
+    return build_result(filename, "audio", probabilities, manager.audio_label_array)
 
 async def predict_audio(file: UploadFile, manager: ModelManager) -> PredictionResult:
-    if not manager.audio_model:
+    if not manager.is_ready("audio", "yamnet"):
         raise HTTPException(status_code=503, detail="Audio model not loaded")
 
-    # Create a temporary file to save the uploaded audio
-    # extract_embedding requires a file path
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = tmp.name
-
     try:
-        # Extract embedding (YAMNet)
-        embedding = extract_embedding(tmp_path)
-        
-        if embedding is None:
-            raise HTTPException(status_code=400, detail="Could not extract features from audio file")
+        with stage("audio", "upload"):
+            contents = await file.read()
+
+        # Identical uploads are answered from the cache without touching TensorFlow
+        with stage("audio", "cache_lookup"):
+            cache_key, cached = await lookup_prediction("audio", manager.audio_version, contents, file.filename)
+        if cached is not None:
+            return cached
+
+        embedding = await load_audio_embedding(contents, file.filename, manager)
             
-        # Reshape and Scale
-        # Embedding is (1024,), need (1, 1024) for scaler and model
+        # Reshape, Scale and Predict in one call
+        # Embedding is (1024,), need (1, 1024) for the fused audio head
         embedding_reshaped = embedding.reshape(1, -1)
+        with stage("audio", "classifier"):
+            _, _, probabilities = await tf_executor.run(manager.classify_audio_embeddings, embedding_reshaped)
+        result = build_audio_result(file.filename, probabilities[0], manager)
+        await store_prediction(cache_key, result)
+        return result
         
-        if manager.audio_scaler:
-            embedding_scaled = manager.audio_scaler.transform(embedding_reshaped)
-        else:
-            embedding_scaled = embedding_reshaped
-            
-        # Predict
-        predictions = manager.audio_model.predict(embedding_scaled)
-        predicted_index = np.argmax(predictions, axis=1)[0]
-        confidence = float(np.max(predictions))
-        
-        # Decode label
-        if manager.audio_label_encoder:
-            label = manager.audio_label_encoder.inverse_transform([predicted_index])[0]
-        else:
-            label = str(predicted_index)
-            
-        return PredictionResult(
-            filename=file.filename,
-            media_type="audio",
-            predicted_label=label,
-            confidence=confidence
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing audio: {str(e)}")
+
+async def predict_audio_files(files: List[UploadFile], manager: ModelManager) -> List[PredictionResult]:
+    """
+    Classifies many uploads at once: decoding and YAMNet embedding extraction run
+    concurrently per file, then all embeddings go through the classifier head in
+    a few stacked calls. Files that fail produce an error entry instead of aborting the batch.
+    """
+    if not manager.is_ready("audio", "yamnet"):
+        error = HTTPException(status_code=503, detail="Audio model not loaded")
+        return [error_result(file.filename, "audio", error) for file in files]
+
+    semaphore = asyncio.Semaphore(BATCH_DECODE_CONCURRENCY)
+
+    results: List[PredictionResult] = [None] * len(files)
+    cache_keys = [None] * len(files)
+    embeddings = [None] * len(files)
+
+    async def embed(i: int, file: UploadFile):
+        async with semaphore:
+            try:
+                with stage("audio", "upload"):
+                    contents = await file.read()
+                with stage("audio", "cache_lookup"):
+                    cache_keys[i], results[i] = await lookup_prediction("audio", manager.audio_version, contents, file.filename)
+                if results[i] is None:
+                    embeddings[i] = await load_audio_embedding(contents, file.filename, manager)
+            except Exception as e:
+                results[i] = error_result(file.filename, "audio", e)
+
+    # 1. Decode and embed every file concurrently (cached uploads are answered directly)
+    await asyncio.gather(*(embed(i, file) for i, file in enumerate(files)))
+    valid = [i for i, item in enumerate(embeddings) if item is not None]
+
+    # 2. Run the stacked embeddings through the classifier head in chunks
+    async def infer(indices: List[int]):
+        batch = np.stack([embeddings[i] for i in indices])
+        try:
+            with stage("audio", "classifier"):
+                _, _, probabilities = await tf_executor.run(manager.classify_audio_embeddings, batch)
+        except Exception as e:
+            for i in indices:
+                results[i] = error_result(files[i].filename, "audio", e)
+            return
+        for i, row in zip(indices, probabilities):
+            results[i] = build_audio_result(files[i].filename, row, manager)
+        await store_predictions((cache_keys[i], results[i]) for i in indices)
+
+    chunks = [valid[i:i + BATCH_INFERENCE_CHUNK_SIZE] for i in range(0, len(valid), BATCH_INFERENCE_CHUNK_SIZE)]
+    await asyncio.gather(*(infer(chunk) for chunk in chunks))
+
+    return results
+
+async def spool_upload(chunks: AsyncIterator[bytes], filename: str) -> str:
+    """
+    Writes a (possibly chunked) request body to a temporary file as it arrives
+    and returns its path. The caller deletes the file.
+    """
+    spool = tempfile.NamedTemporaryFile(prefix="audio-upload-", suffix=Path(filename).suffix, delete=False)
+    size = 0
+    try:
+        with spool:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > AUDIO_SEGMENT_MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Audio upload is too large")
+                spool.write(chunk)
+    except BaseException:
+        os.remove(spool.name)
+        raise
+    return spool.name
+
+def segment_windows(duration: float) -> List[Tuple[float, float]]:
+    """
+    Returns the (start, end) of each analysis window, in seconds.
+    """
+    windows = []
+    start = 0.0
+    while start < duration:
+        end = min(start + AUDIO_SEGMENT_SECONDS, duration)
+        # A short tail is only kept when it is the whole recording
+        if end - start >= AUDIO_SEGMENT_MIN_SECONDS or not windows:
+            windows.append((start, end))
+        if end >= duration:
+            break
+        start += AUDIO_SEGMENT_HOP_SECONDS
+    return windows
+
+async def predict_audio_segments(chunks: AsyncIterator[bytes], filename: str,
+                                 manager: ModelManager) -> SegmentedPredictionResult:
+    """
+    Classifies a long recording window by window. Only AUDIO_SEGMENT_BATCH_SIZE
+    windows are decoded at a time; their embeddings go through the classifier
+    head in one stacked call. The overall label pools the segment probabilities,
+    weighted by segment length.
+    """
+    if not manager.is_ready("audio", "yamnet"):
+        raise HTTPException(status_code=503, detail="Audio model not loaded")
+
+    with stage("audio", "upload"):
+        path = await spool_upload(chunks, filename)
+    try:
+        try:
+            duration = await audio_decode_executor.run(audio_duration, path)
+        except HTTPException:
+            raise
+        except UnsupportedAudioFormat as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            print(f"Error loading {filename}: {e}")
+            raise HTTPException(status_code=400, detail="Could not read audio file")
+
+        windows = segment_windows(duration)
+        if not windows:
+            raise HTTPException(status_code=400, detail="Audio file is empty")
+
+        async def embed_window(start: float, end: float) -> np.ndarray:
+            # 1. Decode + resample only this window in the process pool
+            with stage("audio", "decode"):
+                wav_data = await audio_decode_executor.run(load_audio_segment, path, start, end - start)
+            # 2. YAMNet embedding in the inference pool
+            with stage("audio", "embedding"):
+                embedding = await tf_executor.run(manager.embed_waveform, wav_data)
+            if embedding is None:
+                raise HTTPException(status_code=400, detail="Could not extract features from audio file")
+            return embedding
+
+        segments, probabilities = [], []
+        for i in range(0, len(windows), AUDIO_SEGMENT_BATCH_SIZE):
+            group = windows[i:i + AUDIO_SEGMENT_BATCH_SIZE]
+            embeddings = await asyncio.gather(*(embed_window(start, end) for start, end in group))
+
+            # 3. Classify the group of windows in one call
+            with stage("audio", "classifier"):
+                labels, confidences, predictions = await tf_executor.run(
+                    manager.classify_audio_embeddings, np.stack(embeddings)
+                )
+            for (start, end), label, confidence in zip(group, labels, confidences):
+                segments.append(AudioSegment(
+                    start=round(start, 3),
+                    end=round(end, 3),
+                    predicted_label=str(label),
+                    confidence=float(confidence)
+                ))
+            probabilities.extend(predictions)
+
+        # 4. Pool the segment probabilities into one overall label
+        weights = [segment.end - segment.start for segment in segments]
+        pooled = np.average(np.stack(probabilities), axis=0, weights=weights)
+
+        return SegmentedPredictionResult(
+            filename=filename,
+            duration=round(duration, 3),
+            predicted_label=decode_audio_label(int(np.argmax(pooled)), manager),
+            confidence=float(np.max(pooled)),
+            segments=segments
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing audio: {str(e)}")
-        
     finally:
-        # Clean up temp file
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+        os.remove(path)
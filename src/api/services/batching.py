@@ -0,0 +1,134 @@
+import asyncio
+import numpy as np
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Tuple
+from src.api.services.executor import server_busy
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-sample requests into one batched forward pass.
+
+    Callers `submit` one preprocessed sample (without batch dimension) and await
+    their own row of the model output. A background task collects pending samples
+    until either `max_batch_size` is reached or `max_wait_ms` has elapsed since the
+    first sample of the batch arrived, then runs `predict_fn` once on the stacked batch.
+    Submissions beyond `max_queue_size` waiting samples are rejected with a 503.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0,
+                 max_queue_size: int = 0, executor: Optional[Executor] = None):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_queue_size = max(0, int(max_queue_size))
+        self.executor = executor
+
+        # Created lazily so the queue is bound to the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Tuning statistics
+        self.batch_count = 0
+        self.item_count = 0
+        self.max_observed_batch = 0
+        self.batch_size_histogram = {}
+        self.rejected_count = 0
+
+    async def submit(self, sample: np.ndarray) -> np.ndarray:
+        """
+        Queue one sample and wait for its prediction row.
+
+        Args:
+            sample (np.array): A single preprocessed input, e.g. (224, 224, 3).
+
+        Returns:
+            np.array: The model output row for this sample, e.g. (num_classes,).
+        """
+        self._ensure_worker()
+        if self.max_queue_size and self._queue.qsize() >= self.max_queue_size:
+            self.rejected_count += 1
+            raise server_busy("image batching")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((sample, future))
+        return await future
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[np.ndarray, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+
+        # 1. Block until the first sample arrives
+        items = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        # 2. Fill the batch until it is full or the wait window closes
+        while len(items) < self.max_batch_size:
+            if not self._queue.empty():
+                items.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # 3. Drop callers that gave up while waiting
+        return [(sample, future) for sample, future in items if not future.done()]
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+            if not items:
+                continue
+
+            try:
+                # A sample of the wrong shape fails its batch, not the worker
+                batch = np.stack([sample for sample, _ in items])
+                # Run the forward pass off the event loop
+                loop = asyncio.get_running_loop()
+                predictions = await loop.run_in_executor(self.executor, self.predict_fn, batch)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._record(len(items))
+            for row, (_, future) in zip(predictions, items):
+                if not future.done():
+                    future.set_result(row)
+
+    def _record(self, batch_size: int):
+        self.batch_count += 1
+        self.item_count += batch_size
+        self.max_observed_batch = max(self.max_observed_batch, batch_size)
+        self.batch_size_histogram[batch_size] = self.batch_size_histogram.get(batch_size, 0) + 1
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        """
+        Returns queue depth and achieved batch-size statistics.
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": self.queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "rejected_count": self.rejected_count,
+            "batch_count": self.batch_count,
+            "item_count": self.item_count,
+            "mean_batch_size": self.item_count / self.batch_count if self.batch_count else 0.0,
+            "max_observed_batch_size": self.max_observed_batch,
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+        }
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from src.api.config import (
+    PREDICTION_CACHE_BACKEND, PREDICTION_CACHE_MAX_ENTRIES,
+    PREDICTION_CACHE_TTL_SECONDS, PREDICTION_CACHE_PATH,
+    INFERENCE_BACKEND, IMAGE_DRAFT_DECODE, CALIBRATE_CONFIDENCE, TOP_K_MAX
+)
+from src.api.schemas.prediction import PredictionResult
+
+
+def file_version(*paths) -> str:
+    """
+    Identifies the on-disk version of a model from its files' size and mtime,
+    so cached predictions are invalidated when a model is retrained.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            stat = Path(path).stat()
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            digest.update(f"{path}:missing".encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_settings() -> dict:
+    """
+    Settings that change a cached PredictionResult without changing the model
+    files hashed by file_version. Entries written under other settings (or an
+    older result schema) are never served, even from a shared SQLite cache.
+    """
+    return {
+        "backend": INFERENCE_BACKEND,
+        "draft_decode": IMAGE_DRAFT_DECODE,
+        "calibrate": CALIBRATE_CONFIDENCE,
+        "top_k_max": TOP_K_MAX,
+        "schema": sorted(PredictionResult.model_fields),
+    }
+
+
+def settings_version(settings: dict) -> str:
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU cache with a TTL. Thread-safe; not shared between workers.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, created = entry
+            if self.ttl_seconds and time.time() - created > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """
+    SQLite-backed LRU cache with a TTL, shared by every uvicorn worker on the host.
+    """
+
+    def __init__(self, path: Path, max_entries: int, ttl_seconds: float):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS predictions_accessed ON predictions (accessed)")
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call keeps it safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created FROM predictions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl_seconds and now - created > self.ttl_seconds:
+                conn.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE predictions SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO predictions (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            # Evict least recently used entries beyond the size limit
+            conn.execute(
+                "DELETE FROM predictions WHERE key IN ("
+                "SELECT key FROM predictions ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+class PredictionCache:
+    """
+    Content-addressed cache of PredictionResults, keyed by a hash of the raw
+    upload bytes, the media type, the model version and the serving settings.
+    """
+
+    def __init__(self, backend, settings: Optional[dict] = None):
+        self.backend = backend
+        self.settings_version = settings_version(cache_settings() if settings is None else settings)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, media_type: str, model_version: str, contents: bytes) -> str:
+        digest = hashlib.sha256(contents).hexdigest()
+        return f"{media_type}:{model_version}:{self.settings_version}:{digest}"
+
+    def get(self, key: str, filename: str) -> Optional[PredictionResult]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # The same bytes may be uploaded under another name
+        return PredictionResult.model_validate_json(value).model_copy(update={"filename": filename})
+
+    def set(self, key: str, result: PredictionResult):
+        # Only successful predictions are cached
+        if result.error is None:
+            self.backend.set(key, result.model_dump_json())
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def build_prediction_cache() -> Optional[PredictionCache]:
+    if PREDICTION_CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend(PREDICTION_CACHE_MAX_ENTRIES, PREDICTION_CACHE_TTL_SECONDS)
+    elif PREDICTION_CACHE_BACKEND == "disk":
+        backend = DiskCacheBackend(PREDICTION_CACHE_PATH, PREDICTION_CACHE_MAX_ENTRIES, PREDICTION_CACHE_TTL_SECONDS)
+    else:
+        return None
+    return PredictionCache(backend)
+
+
+prediction_cache = build_prediction_cache()
+
+
+async def lookup_prediction(media_type: str, model_version: str, contents: bytes,
+                            filename: str) -> Tuple[Optional[str], Optional[PredictionResult]]:
+    """
+    Returns (cache key, cached result). The key is None when caching is disabled.
+    Hashing the upload and reading the backend run in a worker thread, off the event loop.
+    """
+    if prediction_cache is None:
+        return None, None
+
+    def lookup():
+        key = prediction_cache.key(media_type, model_version, contents)
+        return key, prediction_cache.get(key, filename)
+
+    return await run_in_threadpool(lookup)
+
+
+async def store_predictions(entries: Iterable[Tuple[Optional[str], PredictionResult]]):
+    """
+    Stores (cache key, result) pairs in one worker thread call.
+    """
+    if prediction_cache is None:
+        return
+    entries = [(key, result) for key, result in entries if key is not None]
+    if not entries:
+        return
+
+    def store():
+        for key, result in entries:
+            prediction_cache.set(key, result)
+
+    await run_in_threadpool(store)
+
+
+async def store_prediction(key: Optional[str], result: PredictionResult):
+    await store_predictions([(key, result)])
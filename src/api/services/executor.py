@@ -0,0 +1,103 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+from fastapi import HTTPException
+from src.api.config import (
+    TF_EXECUTOR_WORKERS, TF_EXECUTOR_MAX_PENDING,
+    AUDIO_DECODE_WORKERS, AUDIO_DECODE_MAX_PENDING,
+    BUSY_RETRY_AFTER_SECONDS
+)
+
+
+def server_busy(name: str) -> HTTPException:
+    """
+    Builds the 503 returned when a bounded queue is full.
+    """
+    return HTTPException(
+        status_code=503,
+        detail=f"Server busy: {name} queue is full, retry later",
+        headers={"Retry-After": str(BUSY_RETRY_AFTER_SECONDS)}
+    )
+
+
+class BoundedExecutor:
+    """
+    Runs blocking callables off the event loop with a cap on pending work.
+
+    When `max_pending` tasks are already queued or running, new work is rejected
+    immediately with a 503 instead of letting latency grow without limit.
+    The pending counter is only touched from the event loop thread.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Executor], max_pending: int):
+        self.name = name
+        self.max_pending = max(1, int(max_pending))
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self.pending = 0
+        self.rejected_count = 0
+
+    @property
+    def executor(self) -> Executor:
+        # Created lazily so importing the API does not spawn workers
+        if self._executor is None:
+            self._executor = self._factory()
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Runs fn(*args, **kwargs) in the pool, raising a 503 if the queue is full.
+        """
+        if self.pending >= self.max_pending:
+            self.rejected_count += 1
+            raise server_busy(self.name)
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        except BrokenProcessPool:
+            # A worker died (e.g. a decoder crash); start a fresh pool for the next call
+            self._executor = None
+            raise
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected_count": self.rejected_count,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# TensorFlow releases the GIL inside ops, so inference and PIL preprocessing use threads
+tf_executor = BoundedExecutor(
+    "inference",
+    lambda: ThreadPoolExecutor(max_workers=TF_EXECUTOR_WORKERS, thread_name_prefix="tf-inference"),
+    TF_EXECUTOR_MAX_PENDING
+)
+
+# librosa decoding/resampling holds the GIL, so it runs in separate processes.
+# 'spawn' avoids forking a process that has already initialised TensorFlow.
+audio_decode_executor = BoundedExecutor(
+    "audio decoding",
+    lambda: ProcessPoolExecutor(
+        max_workers=AUDIO_DECODE_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    ),
+    AUDIO_DECODE_MAX_PENDING
+)
+
+
+def shutdown_executors():
+    tf_executor.shutdown()
+    audio_decode_executor.shutdown()
@@ -1,39 +1,113 @@
+import asyncio
 import numpy as np
 import io
+from typing import List
 from fastapi import UploadFile, HTTPException
+from src.api.config import BATCH_DECODE_CONCURRENCY, BATCH_INFERENCE_CHUNK_SIZE, IMAGE_DRAFT_DECODE
 from src.api.dependencies import ModelManager
 from src.api.schemas.prediction import PredictionResult
+from src.api.services.cache import lookup_prediction, store_prediction, store_predictions
+from src.api.services.executor import tf_executor
+from src.api.services.metrics import stage
+from src.api.services.results import build_result, error_result
 from utils.image_processing import preprocess_image
 
+async def load_image_tensor(contents: bytes) -> np.ndarray:
+    """
+    Decodes and preprocesses raw image bytes into a (224, 224, 3) tensor.
+    """
+    # Use the shared preprocessing function
+    # We pass a BytesIO object which acts like a file, compatible with load_img (via PIL)
+    # Decoding runs in the inference pool so it never blocks the event loop
+    img_array = await tf_executor.run(preprocess_image, io.BytesIO(contents), draft=IMAGE_DRAFT_DECODE)
+
+    if img_array is None:
+        raise HTTPException(status_code=400, detail="Failed to preprocess image")
+
+    return img_array[0]
+
+def build_image_result(filename: str, predictions: np.ndarray, manager: ModelManager) -> PredictionResult:
+    return build_result(filename, "image", predictions, manager.image_label_array)
+
 async def predict_image(file: UploadFile, manager: ModelManager) -> PredictionResult:
-    if not manager.image_model:
+    if not manager.is_ready("image"):
         raise HTTPException(status_code=503, detail="Image model not loaded")
 
     try:
         # Read image
-        contents = await file.read()
-        
-        # Use the shared preprocessing function
-        # We pass a BytesIO object which acts like a file, compatible with load_img (via PIL)
-        img_array = preprocess_image(io.BytesIO(contents))
-        
-        if img_array is None:
-             raise HTTPException(status_code=400, detail="Failed to preprocess image")
+        with stage("image", "upload"):
+            contents = await file.read()
+
+        # Identical uploads are answered from the cache without touching TensorFlow
+        with stage("image", "cache_lookup"):
+            cache_key, cached = await lookup_prediction("image", manager.image_version, contents, file.filename)
+        if cached is not None:
+            return cached
+
+        with stage("image", "decode"):
+            img_tensor = await load_image_tensor(contents)
         
         # Predict
-        predictions = manager.image_model.predict(img_array)
-        predicted_index = np.argmax(predictions, axis=1)[0]
-        confidence = float(np.max(predictions))
-        
-        # Get label
-        label = manager.image_labels.get(predicted_index, "Unknown")
-        
-        return PredictionResult(
-            filename=file.filename,
-            media_type="image",
-            predicted_label=label,
-            confidence=confidence
-        )
+        # The batcher coalesces this sample with concurrent requests into one forward pass
+        with stage("image", "inference"):
+            predictions = await manager.image_batcher.submit(img_tensor)
+        result = build_image_result(file.filename, predictions, manager)
+        await store_prediction(cache_key, result)
+        return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing image: {str(e)}")
+
+async def predict_image_files(files: List[UploadFile], manager: ModelManager) -> List[PredictionResult]:
+    """
+    Classifies many uploads at once: all files are decoded concurrently, then the
+    successfully decoded tensors are stacked into a few large forward passes.
+    Files that fail produce an error entry instead of aborting the batch.
+    """
+    if not manager.is_ready("image"):
+        error = HTTPException(status_code=503, detail="Image model not loaded")
+        return [error_result(file.filename, "image", error) for file in files]
+
+    semaphore = asyncio.Semaphore(BATCH_DECODE_CONCURRENCY)
+
+    results: List[PredictionResult] = [None] * len(files)
+    cache_keys = [None] * len(files)
+    decoded = [None] * len(files)
+
+    async def decode(i: int, file: UploadFile):
+        async with semaphore:
+            try:
+                with stage("image", "upload"):
+                    contents = await file.read()
+                with stage("image", "cache_lookup"):
+                    cache_keys[i], results[i] = await lookup_prediction("image", manager.image_version, contents, file.filename)
+                if results[i] is None:
+                    with stage("image", "decode"):
+                        decoded[i] = await load_image_tensor(contents)
+            except Exception as e:
+                results[i] = error_result(file.filename, "image", e)
+
+    # 1. Decode every file in parallel (cached uploads are answered directly)
+    await asyncio.gather(*(decode(i, file) for i, file in enumerate(files)))
+    valid = [i for i, item in enumerate(decoded) if item is not None]
+
+    # 2. Run the decoded images through the model in chunks
+    async def infer(indices: List[int]):
+        batch = np.stack([decoded[i] for i in indices])
+        try:
+            with stage("image", "inference"):
+                predictions = await tf_executor.run(manager.predict_image_batch, batch)
+        except Exception as e:
+            for i in indices:
+                results[i] = error_result(files[i].filename, "image", e)
+            return
+        for i, row in zip(indices, predictions):
+            results[i] = build_image_result(files[i].filename, row, manager)
+        await store_predictions((cache_keys[i], results[i]) for i in indices)
+
+    chunks = [valid[i:i + BATCH_INFERENCE_CHUNK_SIZE] for i in range(0, len(valid), BATCH_INFERENCE_CHUNK_SIZE)]
+    await asyncio.gather(*(infer(chunk) for chunk in chunks))
+
+    return results
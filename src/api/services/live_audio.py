@@ -0,0 +1,117 @@
+import time
+import numpy as np
+from collections import deque
+from typing import Optional
+from src.api.config import (
+    LIVE_AUDIO_SAMPLE_RATE, LIVE_AUDIO_WINDOW_SAMPLES, LIVE_AUDIO_HOP_SAMPLES,
+    LIVE_AUDIO_CONTEXT_FRAMES, LIVE_AUDIO_SMOOTHING, LIVE_AUDIO_MAX_LAG_SECONDS
+)
+from src.api.dependencies import ModelManager
+from src.api.services.audio_service import decode_audio_label
+from src.api.services.executor import tf_executor
+
+# Supported PCM sample formats: dtype and scale to [-1, 1]
+PCM_FORMATS = {
+    "int16": (np.dtype("<i2"), 1 / 32768),
+    "float32": (np.dtype("<f4"), 1.0),
+}
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size buffer of the most recent samples of one connection.
+    Positions are absolute sample indices since the connection opened.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=np.float32)
+        self.total = 0
+
+    def write(self, samples: np.ndarray):
+        end = self.total + len(samples)
+        samples = samples[-self.capacity:]
+        start = (end - len(samples)) % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self.buffer[start:start + first] = samples[:first]
+        self.buffer[:len(samples) - first] = samples[first:]
+        self.total = end
+
+    def oldest(self) -> int:
+        return max(0, self.total - self.capacity)
+
+    def read(self, end: int, length: int) -> np.ndarray:
+        """
+        Returns a copy of samples [end - length, end).
+        """
+        return self.buffer[np.arange(end - length, end) % self.capacity]
+
+
+class LiveAudioSession:
+    """
+    State of one /ws/audio connection.
+
+    YAMNet emits one embedding per 0.48s hop, computed from the last 0.975s of
+    audio. Each time enough new samples arrive, only the new frames are embedded
+    (one YAMNet call over the window(s) ending at the new hops), then the mean
+    of the last LIVE_AUDIO_CONTEXT_FRAMES embeddings goes through the classifier
+    head and is smoothed with an exponential moving average.
+    """
+
+    def __init__(self, manager: ModelManager, emit_hz: float, pcm_format: str = "int16"):
+        self.manager = manager
+        self.dtype, self.scale = PCM_FORMATS[pcm_format]
+        self.emit_interval = 1.0 / emit_hz
+        max_lag = int(LIVE_AUDIO_MAX_LAG_SECONDS * LIVE_AUDIO_SAMPLE_RATE)
+        self.ring = AudioRingBuffer(LIVE_AUDIO_WINDOW_SAMPLES + max_lag)
+        self.frames = deque(maxlen=LIVE_AUDIO_CONTEXT_FRAMES)
+        self.next_frame_end = LIVE_AUDIO_WINDOW_SAMPLES
+        self.smoothed: Optional[np.ndarray] = None
+        self.last_emit = 0.0
+
+    def _decode(self, data: bytes) -> np.ndarray:
+        if len(data) % self.dtype.itemsize:
+            raise ValueError(f"PCM frame size must be a multiple of {self.dtype.itemsize} bytes")
+        return np.frombuffer(data, dtype=self.dtype).astype(np.float32) * self.scale
+
+    async def push(self, data: bytes) -> Optional[dict]:
+        """
+        Appends one PCM frame and returns a prediction when one is due.
+        """
+        self.ring.write(self._decode(data))
+
+        # 1. Skip hops whose audio already left the ring (inference fell behind)
+        first_readable = self.ring.oldest() + LIVE_AUDIO_WINDOW_SAMPLES
+        if self.next_frame_end < first_readable:
+            behind = first_readable - self.next_frame_end
+            self.next_frame_end += -(-behind // LIVE_AUDIO_HOP_SAMPLES) * LIVE_AUDIO_HOP_SAMPLES
+
+        # 2. Embed the new hops only, in one YAMNet call
+        new_frames = (self.ring.total - self.next_frame_end) // LIVE_AUDIO_HOP_SAMPLES + 1
+        if new_frames <= 0:
+            return None
+        last_end = self.next_frame_end + (new_frames - 1) * LIVE_AUDIO_HOP_SAMPLES
+        span = LIVE_AUDIO_WINDOW_SAMPLES + (new_frames - 1) * LIVE_AUDIO_HOP_SAMPLES
+        embeddings = await tf_executor.run(self.manager.embed_frames, self.ring.read(last_end, span))
+        self.frames.extend(embeddings[-new_frames:])
+        self.next_frame_end = last_end + LIVE_AUDIO_HOP_SAMPLES
+
+        # 3. Classify the recent context and smooth over time
+        context = np.mean(self.frames, axis=0, keepdims=True)
+        predictions = (await tf_executor.run(self.manager.predict_audio_batch, context))[0]
+        if self.smoothed is None:
+            self.smoothed = predictions
+        else:
+            self.smoothed = LIVE_AUDIO_SMOOTHING * predictions + (1 - LIVE_AUDIO_SMOOTHING) * self.smoothed
+
+        # 4. Emit at most emit_hz predictions per second
+        now = time.monotonic()
+        if now - self.last_emit < self.emit_interval:
+            return None
+        self.last_emit = now
+
+        return {
+            "time": round(last_end / LIVE_AUDIO_SAMPLE_RATE, 3),
+            "predicted_label": decode_audio_label(int(np.argmax(self.smoothed)), self.manager),
+            "confidence": float(np.max(self.smoothed)),
+        }
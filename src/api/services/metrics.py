@@ -0,0 +1,231 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+from fastapi import HTTPException
+from src.api.config import METRICS_LATENCY_BUCKETS, METRICS_BATCH_SIZE_BUCKETS
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """
+    A metric family with a fixed set of label names. Values are kept per label
+    combination and updated under a lock, as they are written from the event
+    loop and from the inference threads.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self._samples())
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """
+    Cumulative histogram with fixed bucket upper bounds, plus _sum and _count.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = METRICS_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # [count per bucket (last one is +Inf), sum]
+            state = self._values.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observes the duration of the `with` block, in seconds (also when it raises).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# HTTP traffic (recorded by MetricsMiddleware)
+HTTP_REQUESTS = Counter(
+    "api_http_requests_total", "HTTP requests by route, method and status code.",
+    ("endpoint", "method", "status")
+)
+HTTP_IN_FLIGHT = Gauge("api_http_requests_in_flight", "HTTP requests currently being processed.")
+HTTP_LATENCY = Histogram(
+    "api_http_request_duration_seconds", "Time from request start to the end of the response body.",
+    ("endpoint",)
+)
+
+# Prediction pipeline
+STAGE_LATENCY = Histogram(
+    "api_stage_duration_seconds",
+    "Time spent in each prediction stage (includes waiting for a free executor slot).",
+    ("media_type", "stage")
+)
+PREDICTION_ERRORS = Counter(
+    "api_prediction_errors_total", "Failed predictions (whole requests or batch entries) by cause.",
+    ("media_type", "cause")
+)
+BATCH_SIZE = Histogram(
+    "api_model_batch_size", "Samples per model call.", ("model",), buckets=METRICS_BATCH_SIZE_BUCKETS
+)
+
+# Refreshed from the model manager and the executors at scrape time
+MODEL_LOAD_SECONDS = Gauge("api_model_load_duration_seconds", "Time taken to load each model.", ("model",))
+MODEL_READY = Gauge("api_model_ready", "1 once the model is loaded, 0 otherwise.", ("model",))
+EXECUTOR_PENDING = Gauge("api_executor_pending", "Tasks queued or running in each executor.", ("executor",))
+EXECUTOR_REJECTED = Gauge("api_executor_rejected", "Tasks rejected because the executor queue was full.", ("executor",))
+BATCHER_QUEUE_DEPTH = Gauge("api_image_batcher_queue_depth", "Images waiting for the image micro-batcher.")
+
+REGISTRY = [
+    HTTP_REQUESTS, HTTP_IN_FLIGHT, HTTP_LATENCY,
+    STAGE_LATENCY, PREDICTION_ERRORS, BATCH_SIZE,
+    MODEL_LOAD_SECONDS, MODEL_READY, EXECUTOR_PENDING, EXECUTOR_REJECTED, BATCHER_QUEUE_DEPTH,
+]
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# 503s with Retry-After come from full queues (see executor.server_busy)
+ERROR_CAUSES = {400: "bad_input", 413: "too_large", 500: "internal"}
+
+
+def error_cause(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        if error.status_code == 503:
+            return "server_busy" if error.headers and "Retry-After" in error.headers else "model_not_loaded"
+        return ERROR_CAUSES.get(error.status_code, f"http_{error.status_code}")
+    return "internal"
+
+
+def record_error(media_type: str, error: Exception):
+    PREDICTION_ERRORS.inc(media_type=media_type, cause=error_cause(error))
+
+
+@contextmanager
+def stage(media_type: str, name: str):
+    """
+    Times one stage of a prediction: `with stage("audio", "decode"): ...`
+    """
+    with STAGE_LATENCY.time(media_type=media_type, stage=name):
+        yield
+
+
+def route_template(scope) -> str:
+    """
+    Returns the path template of the route that handled the request (e.g.
+    "/predict/audio/"), so labels stay bounded whatever paths are requested.
+    The router stores the matched route in the scope.
+    """
+    return getattr(scope.get("route"), "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them per route. Written as a
+    plain ASGI callable so streamed request and response bodies pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # The route is only known once the router has matched the request
+            endpoint = route_template(scope)
+            HTTP_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+            HTTP_REQUESTS.inc(endpoint=endpoint, method=scope["method"], status=status)
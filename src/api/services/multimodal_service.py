@@ -0,0 +1,125 @@
+import asyncio
+import numpy as np
+from functools import lru_cache
+from typing import Optional, Tuple
+from fastapi import UploadFile, HTTPException
+from src.api.config import IMAGE_CLASS_AUDIO_FAMILIES, MULTIMODAL_MIN_FAMILY_MASS
+from src.api.dependencies import ModelManager
+from src.api.inference import top_k_indices
+from src.api.schemas.prediction import LabelProbability, MultimodalPredictionResult
+from src.api.services.audio_service import load_audio_embedding, build_audio_result
+from src.api.services.executor import tf_executor
+from src.api.services.image_service import load_image_tensor, build_image_result
+from src.api.services.metrics import stage
+from src.api.services.results import select_top_k
+
+@lru_cache(maxsize=4)
+def _family_matrix(image_labels: tuple, audio_labels: tuple) -> np.ndarray:
+    families = {label: i for i, label in enumerate(audio_labels)}
+    matrix = np.zeros((len(image_labels), len(audio_labels)), dtype=np.float32)
+    for i, label in enumerate(image_labels):
+        family = IMAGE_CLASS_AUDIO_FAMILIES.get(label)
+        if family in families:
+            matrix[i, families[family]] = 1.0
+    return matrix
+
+def image_family_matrix(manager: ModelManager) -> np.ndarray:
+    """
+    Returns the (num_image_classes, num_audio_families) 0/1 matrix mapping each
+    image class index to its audio family (see IMAGE_CLASS_AUDIO_FAMILIES).
+    """
+    return _family_matrix(tuple(manager.image_label_array), tuple(manager.audio_label_array))
+
+def normalize_weights(image_weight: float, audio_weight: float) -> Tuple[float, float]:
+    total = image_weight + audio_weight
+    if total <= 0:
+        raise HTTPException(status_code=400, detail="At least one modality weight must be positive")
+    return image_weight / total, audio_weight / total
+
+def fuse_probabilities(image_probabilities: np.ndarray, audio_probabilities: np.ndarray,
+                       family_matrix: np.ndarray, image_weight: float, audio_weight: float) -> np.ndarray:
+    """
+    Late fusion in the audio label space: the image probabilities are summed
+    per family, then both vectors are averaged with the modality weights.
+    Image classes without a family keep their mass out of the sum, so an
+    image of a drum kit defers to the recording. The result is not
+    renormalized: it sums to 1 minus that unmapped mass.
+    """
+    return image_weight * (image_probabilities @ family_matrix) + audio_weight * audio_probabilities
+
+async def image_probabilities(file: UploadFile, manager: ModelManager) -> np.ndarray:
+    with stage("image", "upload"):
+        contents = await file.read()
+    with stage("image", "decode"):
+        img_tensor = await load_image_tensor(contents)
+    # Shares the micro-batcher with /predict/image/
+    with stage("image", "inference"):
+        return await manager.image_batcher.submit(img_tensor)
+
+async def audio_probabilities(file: UploadFile, manager: ModelManager) -> np.ndarray:
+    with stage("audio", "upload"):
+        contents = await file.read()
+    embedding = await load_audio_embedding(contents, file.filename, manager)
+    with stage("audio", "classifier"):
+        _, _, probabilities = await tf_executor.run(manager.classify_audio_embeddings, embedding.reshape(1, -1))
+    return probabilities[0]
+
+async def predict_multimodal(image_file: UploadFile, audio_file: UploadFile, manager: ModelManager,
+                             image_weight: float, audio_weight: float,
+                             top_k: Optional[int] = None) -> MultimodalPredictionResult:
+    """
+    Classifies a photo and a recording of the same instrument in one request.
+    ResNet50 and YAMNet run concurrently; their probabilities are fused into
+    one label (see fuse_probabilities), or taken from the recording alone when
+    nothing in the image maps to a family. The per-modality results are
+    returned alongside, with their `top_k` best labels.
+    """
+    if not manager.is_ready("image", "audio", "yamnet"):
+        raise HTTPException(status_code=503, detail="Image and audio models not loaded")
+    image_weight, audio_weight = normalize_weights(image_weight, audio_weight)
+
+    try:
+        # 1. Image decode + ResNet50 and audio decode + YAMNet + head, side by side.
+        # A failing branch cancels the other one instead of leaving it running.
+        try:
+            async with asyncio.TaskGroup() as group:
+                image_task = group.create_task(image_probabilities(image_file, manager))
+                audio_task = group.create_task(audio_probabilities(audio_file, manager))
+        except ExceptionGroup as errors:
+            # Surface the first error as is, so a 400 from either branch stays a 400
+            raise errors.exceptions[0]
+        image_probs, audio_probs = image_task.result(), audio_task.result()
+
+        # 2. Fuse in the audio families
+        family_matrix = image_family_matrix(manager)
+        fused = fuse_probabilities(image_probs, audio_probs, family_matrix, image_weight, audio_weight)
+        if fused.sum() <= MULTIMODAL_MIN_FAMILY_MASS:
+            # Only the image counts and nothing it shows has a family
+            image_weight, audio_weight = 0.0, 1.0
+            fused = fuse_probabilities(image_probs, audio_probs, family_matrix, image_weight, audio_weight)
+        indices = top_k_indices(fused, top_k or 1)
+        best = indices[0]
+
+        # 3. The most likely image class of the fused family names the instrument
+        in_family = family_matrix[:, best] > 0
+        image_label = None
+        if in_family.any():
+            image_label = str(manager.image_label_array[np.argmax(np.where(in_family, image_probs, -1.0))])
+
+        audio_labels = manager.audio_label_array
+        return MultimodalPredictionResult(
+            predicted_label=str(audio_labels[best]),
+            confidence=float(fused[best]),
+            image_label=image_label,
+            weights={"image": image_weight, "audio": audio_weight},
+            unmapped=max(0.0, 1.0 - float(fused.sum())),
+            image=select_top_k(build_image_result(image_file.filename, image_probs, manager), top_k),
+            audio=select_top_k(build_audio_result(audio_file.filename, audio_probs, manager), top_k),
+            top_k=[LabelProbability(label=str(audio_labels[i]), probability=float(fused[i])) for i in indices]
+            if top_k else None
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing multimodal request: {str(e)}")
@@ -0,0 +1,45 @@
+import numpy as np
+from typing import Optional
+from fastapi import HTTPException
+from src.api.config import TOP_K_MAX
+from src.api.inference import top_k_indices
+from src.api.schemas.prediction import PredictionResult, LabelProbability
+from src.api.services.metrics import record_error
+
+def build_result(filename: str, media_type: str, probabilities: np.ndarray, labels: np.ndarray) -> PredictionResult:
+    """
+    Builds the result of one file from its (num_classes,) probability vector.
+    The TOP_K_MAX best labels are always kept, so a cached result can answer
+    any ?top_k (see select_top_k).
+    """
+    indices = top_k_indices(probabilities, TOP_K_MAX)
+    return PredictionResult(
+        filename=filename,
+        media_type=media_type,
+        predicted_label=str(labels[indices[0]]),
+        confidence=float(probabilities[indices[0]]),
+        top_k=[LabelProbability(label=str(labels[i]), probability=float(probabilities[i])) for i in indices]
+    )
+
+def select_top_k(result: PredictionResult, top_k: Optional[int]) -> PredictionResult:
+    """
+    Returns the result with its first `top_k` labels, or without them when
+    top_k is not requested. The (possibly cached) result is not modified.
+    """
+    top = result.top_k[:top_k] if top_k and result.top_k is not None else None
+    return result.model_copy(update={"top_k": top})
+
+def error_result(filename: str, media_type: str, error: Exception) -> PredictionResult:
+    """
+    Builds the batch entry for a file that could not be classified,
+    carrying the reason of the failure.
+    """
+    record_error(media_type, error)
+    reason = error.detail if isinstance(error, HTTPException) else str(error)
+    return PredictionResult(
+        filename=filename,
+        media_type=media_type,
+        predicted_label="Error",
+        confidence=0.0,
+        error=reason or type(error).__name__
+    )
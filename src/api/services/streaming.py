@@ -0,0 +1,149 @@
+import asyncio
+import io
+import json
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from fastapi import Request, UploadFile, HTTPException
+from fastapi.responses import StreamingResponse
+from python_multipart.multipart import MultipartParser, MultipartParseError, MultipartState, parse_options_header
+from src.api.config import STREAM_MAX_IN_FLIGHT
+from src.api.schemas.prediction import PredictionResult, BatchSummary
+from src.api.services.results import error_result, select_top_k
+
+
+def multipart_boundary(request: Request) -> bytes:
+    """
+    Returns the multipart boundary of the request, validated before any
+    response bytes are sent.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    return boundary
+
+
+async def iter_multipart_files(request: Request, boundary: bytes) -> AsyncIterator[Tuple[str, bytes]]:
+    """
+    Parses a multipart/form-data body while it is being received and yields
+    (filename, contents) for each file part as soon as that part is complete.
+    Only the part currently being received is held in memory, not the whole form.
+    """
+    completed: List[Tuple[str, bytes]] = []
+    part = {"headers": {}, "field": b"", "value": b"", "data": bytearray()}
+
+    def on_part_begin():
+        part.update(headers={}, field=b"", value=b"", data=bytearray())
+
+    def on_header_field(data: bytes, start: int, end: int):
+        part["field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        part["value"] += data[start:end]
+
+    def on_header_end():
+        part["headers"][part["field"].lower()] = part["value"]
+        part["field"], part["value"] = b"", b""
+
+    def on_part_data(data: bytes, start: int, end: int):
+        part["data"] += data[start:end]
+
+    def on_part_end():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition"))
+        # Plain form fields carry no filename and are ignored
+        if b"filename" in options:
+            completed.append((options[b"filename"].decode("utf-8", "replace"), bytes(part["data"])))
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    async for chunk in request.stream():
+        parser.write(chunk)
+        while completed:
+            yield completed.pop(0)
+
+    parser.finalize()
+    while completed:
+        yield completed.pop(0)
+    # finalize() accepts a body cut short; the part being received would be lost silently
+    if parser.state != MultipartState.END:
+        raise MultipartParseError("Incomplete multipart body: the upload ended before its closing boundary")
+
+
+async def stream_predictions(
+    uploads: AsyncIterator[Tuple[str, bytes]],
+    predict: Callable[[UploadFile], Awaitable[PredictionResult]],
+    media_type: str,
+    top_k: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Runs `predict` on each upload as it arrives and yields one NDJSON line per
+    PredictionResult in completion order, followed by a final summary line.
+    At most STREAM_MAX_IN_FLIGHT files are processed at once; reading the rest
+    of the body waits until a slot frees up. Each result keeps its `top_k`
+    best labels (see select_top_k).
+    """
+    results: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(STREAM_MAX_IN_FLIGHT)
+    failure = []
+
+    async def run(filename: str, contents: bytes):
+        try:
+            result = await predict(UploadFile(file=io.BytesIO(contents), filename=filename))
+        except Exception as e:
+            result = error_result(filename, media_type, e)
+        finally:
+            slots.release()
+        await results.put(result)
+
+    async def produce():
+        tasks = []
+        try:
+            async for filename, contents in uploads:
+                await slots.acquire()
+                tasks.append(asyncio.create_task(run(filename, contents)))
+        except Exception as e:
+            failure.append(e)
+        finally:
+            await asyncio.gather(*tasks)
+            await results.put(None)
+
+    producer = asyncio.create_task(produce())
+    total, errors = 0, 0
+    try:
+        while (result := await results.get()) is not None:
+            total += 1
+            errors += result.error is not None
+            yield select_top_k(result, top_k).model_dump_json() + "\n"
+    finally:
+        if not producer.done():
+            producer.cancel()
+
+    summary = BatchSummary(
+        total_processed=total,
+        success_count=total - errors,
+        error_count=errors,
+        error=str(failure[0]) if failure else None
+    )
+    yield json.dumps({"summary": summary.model_dump()}) + "\n"
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streams newline-delimited JSON while the request body is still being read.
+
+    The default StreamingResponse listens for client disconnects on `receive`
+    for ASGI HTTP spec < 2.4, which would swallow body chunks that the
+    generator still needs, so the response is streamed directly instead.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,100 @@
+import asyncio
+import io
+import pickle
+from types import SimpleNamespace
+import librosa
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi import HTTPException
+from src.api.services import audio_service
+from utils import audio_decoding
+from utils.audio_decoding import UnsupportedAudioFormat, audio_duration, load_audio, load_audio_segment
+
+
+def tone(sr, seconds, channels=1):
+    t = np.arange(int(sr * seconds)) / sr
+    signal = 0.5 * np.sin(2 * np.pi * 440 * t)
+    return np.stack([signal * (c + 1) / channels for c in range(channels)], axis=1).astype(np.float32)
+
+
+def wav_bytes(data, sr):
+    buffer = io.BytesIO()
+    sf.write(buffer, data, sr, format="WAV", subtype="FLOAT")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def no_resampling(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("the 16 kHz mono fast path should not mix or resample")
+    monkeypatch.setattr(audio_decoding.librosa, "resample", fail)
+    monkeypatch.setattr(audio_decoding.librosa, "to_mono", fail)
+
+
+def test_16k_mono_is_decoded_as_is_from_bytes_and_buffers(no_resampling):
+    data = tone(16000, 1.5)
+    contents = wav_bytes(data, 16000)
+
+    for source in (contents, bytearray(contents), io.BytesIO(contents)):
+        wav = load_audio(source)
+        assert wav.dtype == np.float32 and wav.flags.c_contiguous
+        np.testing.assert_array_equal(wav, data[:, 0])
+
+
+def test_stereo_44k_is_mixed_down_and_resampled():
+    data = tone(44100, 1.0, channels=2)
+    wav = load_audio(wav_bytes(data, 44100))
+
+    expected = librosa.resample(data.mean(axis=1), orig_sr=44100, target_sr=16000)
+    assert wav.shape == (16000,)
+    np.testing.assert_allclose(wav, expected, atol=1e-6)
+
+
+def test_unsupported_formats_raise_a_clear_error(tmp_path):
+    with pytest.raises(UnsupportedAudioFormat, match="Unsupported audio format"):
+        load_audio(b"not audio at all" * 64)
+
+    path = tmp_path / "clip.xyz"
+    path.write_bytes(b"not audio at all" * 64)
+    with pytest.raises(UnsupportedAudioFormat):
+        audio_duration(path)
+    with pytest.raises(UnsupportedAudioFormat):
+        load_audio_segment(path, 0.0, 1.0)
+
+    # Raised in the decoding processes, so it must survive pickling unchanged
+    error = UnsupportedAudioFormat("Unsupported audio format: Format not recognised.")
+    assert str(pickle.loads(pickle.dumps(error))) == str(error)
+
+
+def test_load_audio_segment_reads_only_the_window(tmp_path, no_resampling):
+    data = tone(16000, 3.0)
+    path = tmp_path / "clip.wav"
+    sf.write(path, data, 16000, subtype="FLOAT")
+
+    assert audio_duration(path) == pytest.approx(3.0)
+    np.testing.assert_array_equal(load_audio_segment(path, 1.0, 0.5), data[16000:24000, 0])
+    # Shorter at the end of the file
+    np.testing.assert_array_equal(load_audio_segment(path, 2.5, 1.0), data[40000:, 0])
+
+
+def test_load_audio_segment_resamples_other_rates(tmp_path):
+    data = tone(22050, 2.0, channels=2)
+    path = tmp_path / "clip.wav"
+    sf.write(path, data, 22050, subtype="FLOAT")
+
+    segment = load_audio_segment(path, 0.5, 1.0)
+    expected = librosa.resample(data[11025:33075].mean(axis=1), orig_sr=22050, target_sr=16000)
+    assert segment.shape == (16000,)
+    np.testing.assert_allclose(segment, expected, atol=1e-6)
+
+
+def test_the_audio_route_maps_unsupported_formats_to_400(monkeypatch):
+    async def run_inline(fn, *args):
+        return fn(*args)
+
+    monkeypatch.setattr(audio_service, "audio_decode_executor", SimpleNamespace(run=run_inline))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(audio_service.load_audio_embedding(b"not audio at all" * 64, "clip.xyz", manager=None))
+    assert error.value.status_code == 400
+    assert error.value.detail.startswith("Unsupported audio format")
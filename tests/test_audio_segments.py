@@ -0,0 +1,104 @@
+import asyncio
+from types import SimpleNamespace
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi import HTTPException
+from src.api.services import audio_service
+from src.api.services.audio_service import predict_audio_segments, segment_windows
+
+LABELS = np.array(["loud", "quiet"], dtype=object)
+
+
+@pytest.mark.parametrize("duration, expected", [
+    (0.0, []),
+    # Shorter than one window: a single window, however short
+    (0.4, [(0.0, 0.4)]),
+    (3.0, [(0.0, 3.0)]),
+    # An exact multiple of the hop: no empty or zero-length tail
+    (5.0, [(0.0, 5.0)]),
+    (10.0, [(0.0, 5.0), (5.0, 10.0)]),
+    # Trailing partial windows are kept from AUDIO_SEGMENT_MIN_SECONDS
+    (11.0, [(0.0, 5.0), (5.0, 10.0), (10.0, 11.0)]),
+    (10.5, [(0.0, 5.0), (5.0, 10.0)]),
+])
+def test_segment_windows(duration, expected):
+    assert segment_windows(duration) == expected
+
+
+@pytest.mark.parametrize("duration, expected", [
+    (4.0, [(0.0, 4.0)]),
+    (10.0, [(0.0, 5.0), (2.5, 7.5), (5.0, 10.0)]),
+    (11.0, [(0.0, 5.0), (2.5, 7.5), (5.0, 10.0), (7.5, 11.0)]),
+])
+def test_overlapping_segment_windows(monkeypatch, duration, expected):
+    monkeypatch.setattr(audio_service, "AUDIO_SEGMENT_HOP_SECONDS", 2.5)
+    assert segment_windows(duration) == expected
+
+
+@pytest.fixture
+def inline_executors(monkeypatch):
+    async def run_inline(fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    for name in ("audio_decode_executor", "tf_executor"):
+        monkeypatch.setattr(audio_service, name, SimpleNamespace(run=run_inline))
+
+
+def fake_manager(window_lengths):
+    def embed_waveform(wav_data):
+        window_lengths.append(len(wav_data))
+        return np.full(1024, np.abs(wav_data).mean(), dtype=np.float32)
+
+    def classify_audio_embeddings(embeddings):
+        loud = embeddings[:, 0] > 0.1
+        probabilities = np.where(loud[:, None], [0.9, 0.1], [0.2, 0.8]).astype(np.float32)
+        return LABELS[probabilities.argmax(axis=1)], probabilities.max(axis=1), probabilities
+
+    return SimpleNamespace(is_ready=lambda *models: True, audio_label_array=LABELS, embed_waveform=embed_waveform,
+                           classify_audio_embeddings=classify_audio_embeddings)
+
+
+async def file_chunks(path, chunk_size=4096):
+    data = path.read_bytes()
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def test_segments_are_decoded_window_by_window_and_pooled_by_length(tmp_path, inline_executors):
+    # 10 s of tone, then 1 s of silence
+    t = np.arange(11 * 16000) / 16000
+    wav = np.where(t < 10, 0.5 * np.sin(2 * np.pi * 440 * t), 0.0).astype(np.float32)
+    path = tmp_path / "long.wav"
+    sf.write(path, wav, 16000, subtype="FLOAT")
+
+    window_lengths = []
+    result = asyncio.run(predict_audio_segments(file_chunks(path), "long.wav", fake_manager(window_lengths)))
+
+    assert window_lengths == [80000, 80000, 16000]
+    assert [(s.start, s.end, s.predicted_label) for s in result.segments] == [
+        (0.0, 5.0, "loud"), (5.0, 10.0, "loud"), (10.0, 11.0, "quiet")
+    ]
+    assert result.duration == 11.0
+    assert result.predicted_label == "loud"
+    assert result.confidence == pytest.approx((5 * 0.9 + 5 * 0.9 + 1 * 0.2) / 11)
+
+
+def test_a_clip_shorter_than_one_window(tmp_path, inline_executors):
+    path = tmp_path / "short.wav"
+    sf.write(path, np.full(8000, 0.5, dtype=np.float32), 16000, subtype="FLOAT")
+
+    window_lengths = []
+    result = asyncio.run(predict_audio_segments(file_chunks(path), "short.wav", fake_manager(window_lengths)))
+    assert window_lengths == [8000]
+    assert [(s.start, s.end) for s in result.segments] == [(0.0, 0.5)]
+
+
+def test_an_empty_recording_is_a_400(tmp_path, inline_executors):
+    path = tmp_path / "empty.wav"
+    sf.write(path, np.zeros(0, dtype=np.float32), 16000, subtype="FLOAT")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(predict_audio_segments(file_chunks(path), "empty.wav", fake_manager([])))
+    assert error.value.status_code == 400
+    assert error.value.detail == "Audio file is empty"
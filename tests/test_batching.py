@@ -0,0 +1,94 @@
+import asyncio
+import time
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from src.api.services.batching import MicroBatcher
+
+
+def recording_model(calls):
+    def predict(batch):
+        calls.append(len(batch))
+        return batch.sum(axis=1, keepdims=True)
+    return predict
+
+
+def test_flushes_when_the_batch_is_full():
+    calls = []
+    batcher = MicroBatcher(recording_model(calls), max_batch_size=4, max_wait_ms=10_000)
+
+    async def main():
+        samples = [np.full(3, i, dtype=np.float32) for i in range(4)]
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(s) for s in samples)), timeout=5)
+
+    start = time.perf_counter()
+    rows = asyncio.run(main())
+    assert time.perf_counter() - start < 5
+    assert calls == [4]
+    # Every caller gets its own row back
+    assert [float(row[0]) for row in rows] == [0.0, 3.0, 6.0, 9.0]
+
+
+def test_flushes_a_partial_batch_after_the_wait_window():
+    calls = []
+    batcher = MicroBatcher(recording_model(calls), max_batch_size=16, max_wait_ms=20)
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit(np.ones(3)), batcher.submit(np.ones(3))), timeout=5
+        )
+
+    rows = asyncio.run(main())
+    assert calls == [2]
+    assert [float(row[0]) for row in rows] == [3.0, 3.0]
+    assert batcher.stats()["batch_size_histogram"] == {2: 1}
+
+
+def test_predict_errors_reach_every_caller_and_the_worker_survives():
+    def failing(batch):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(failing, max_batch_size=4, max_wait_ms=5)
+
+    async def main():
+        results = await asyncio.gather(batcher.submit(np.ones(3)), batcher.submit(np.ones(3)),
+                                       return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        batcher.predict_fn = lambda batch: batch
+        return await asyncio.wait_for(batcher.submit(np.ones(3)), timeout=5)
+
+    assert asyncio.run(main()).shape == (3,)
+
+
+def test_mismatched_samples_fail_their_batch_without_hanging():
+    calls = []
+    batcher = MicroBatcher(recording_model(calls), max_batch_size=2, max_wait_ms=1_000)
+
+    async def main():
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit(np.ones(3)), batcher.submit(np.ones(4)), return_exceptions=True),
+            timeout=5
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        # The worker is still running for later callers
+        return await asyncio.wait_for(batcher.submit(np.ones(3)), timeout=5)
+
+    assert float(asyncio.run(main())[0]) == 3.0
+    assert calls == [1]
+
+
+def test_rejects_submissions_beyond_the_queue_limit():
+    batcher = MicroBatcher(lambda batch: batch, max_batch_size=1, max_wait_ms=0, max_queue_size=1)
+
+    async def main():
+        batcher._ensure_worker()
+        # Fill the queue before the worker gets a chance to drain it
+        batcher._queue.put_nowait((np.ones(3), asyncio.get_running_loop().create_future()))
+        with pytest.raises(HTTPException) as error:
+            await batcher.submit(np.ones(3))
+        return error.value
+
+    error = asyncio.run(main())
+    assert error.status_code == 503
+    assert "Retry-After" in error.headers
+    assert batcher.rejected_count == 1
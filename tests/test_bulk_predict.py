@@ -0,0 +1,30 @@
+import pandas as pd
+from src.api.bulk_predict import bulk_predict, list_inputs, checkpoint_path
+
+
+def test_list_inputs_from_a_directory_and_a_manifest(tmp_path):
+    (tmp_path / "nested").mkdir()
+    for name in ("b.jpg", "a.PNG", "nested/c.jpeg", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    files = list_inputs(tmp_path, "image")
+    assert list(files["filename"]) == ["a.PNG", "b.jpg", "nested/c.jpeg"]
+
+    manifest = tmp_path / "list.csv"
+    pd.DataFrame({"filename": ["x.wav", "y.wav", "x.wav"], "label": ["bass", "reed", "bass"]}).to_csv(manifest, index=False)
+    files = list_inputs(manifest, "audio", data_dir=tmp_path)
+    assert list(files["filename"]) == ["x.wav", "y.wav"]
+    assert files["path"][0] == tmp_path / "x.wav"
+
+
+def test_empty_inputs_exit_without_output(tmp_path, capsys):
+    empty_dir = tmp_path / "empty"
+    empty_dir.mkdir()
+    manifest = tmp_path / "empty.csv"
+    manifest.write_text("filename,label\n")
+
+    for media_type, source in (("image", empty_dir), ("audio", manifest)):
+        output = tmp_path / "out" / f"{media_type}.csv"
+        assert bulk_predict(media_type, source, output) is None
+        assert not output.exists()
+        assert not checkpoint_path(output).exists()
+        assert "nothing to classify" in capsys.readouterr().out
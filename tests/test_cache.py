@@ -0,0 +1,121 @@
+import asyncio
+import itertools
+import threading
+from types import SimpleNamespace
+import pytest
+from src.api.schemas.prediction import PredictionResult
+from src.api.services import cache
+from src.api.services.cache import MemoryCacheBackend, DiskCacheBackend, PredictionCache, cache_settings
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Strictly increasing timestamps, so LRU order does not depend on timer resolution
+    ticks = itertools.count(1_000_000)
+    now = {"value": None}
+
+    def time():
+        now["value"] = next(ticks)
+        return now["value"]
+
+    monkeypatch.setattr(cache, "time", SimpleNamespace(time=time))
+    return now
+
+
+@pytest.fixture(params=["memory", "disk"])
+def backend_factory(request, tmp_path, clock):
+    def build(max_entries=2, ttl_seconds=0):
+        if request.param == "memory":
+            return MemoryCacheBackend(max_entries, ttl_seconds)
+        return DiskCacheBackend(tmp_path / "predictions.sqlite3", max_entries, ttl_seconds)
+    return build
+
+
+def test_evicts_the_least_recently_used_entry(backend_factory):
+    backend = backend_factory(max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    assert backend.get("a") == "1"  # "b" is now the least recently used
+    backend.set("c", "3")
+
+    assert len(backend) == 2
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
+
+
+def test_expires_entries_after_the_ttl(backend_factory, clock, monkeypatch):
+    backend = backend_factory(max_entries=10, ttl_seconds=5)
+    backend.set("a", "1")
+    assert backend.get("a") == "1"
+    monkeypatch.setattr(cache, "time", SimpleNamespace(time=lambda: clock["value"] + 60))
+    assert backend.get("a") is None
+
+
+def test_disk_backend_is_shared_between_instances(tmp_path, clock):
+    path = tmp_path / "predictions.sqlite3"
+    DiskCacheBackend(path, 10, 0).set("a", "1")
+    assert DiskCacheBackend(path, 10, 0).get("a") == "1"
+
+
+def test_prediction_cache_round_trip(backend_factory):
+    prediction_cache = PredictionCache(backend_factory(max_entries=10))
+    key = prediction_cache.key("image", "v1", b"same bytes")
+    assert key != prediction_cache.key("image", "v2", b"same bytes")
+
+    result = PredictionResult(filename="a.jpg", media_type="image", predicted_label="banjo", confidence=0.9)
+    prediction_cache.set(key, result)
+    cached = prediction_cache.get(key, "renamed.jpg")
+
+    assert cached.predicted_label == "banjo"
+    assert cached.filename == "renamed.jpg"
+    assert prediction_cache.stats()["hits"] == 1
+
+
+def test_errors_are_not_cached(backend_factory):
+    prediction_cache = PredictionCache(backend_factory(max_entries=10))
+    key = prediction_cache.key("audio", "v1", b"bad bytes")
+    prediction_cache.set(key, PredictionResult(filename="x.wav", media_type="audio", predicted_label="Error",
+                                               confidence=0.0, error="Could not decode"))
+    assert prediction_cache.get(key, "x.wav") is None
+    assert prediction_cache.stats()["misses"] == 1
+
+
+@pytest.mark.parametrize("setting, value", [("draft_decode", True), ("backend", "tflite"), ("calibrate", False)])
+def test_entries_from_other_settings_are_not_served(tmp_path, clock, setting, value):
+    # Two configurations sharing one SQLite file, e.g. before and after a restart
+    path = tmp_path / "predictions.sqlite3"
+    before = PredictionCache(DiskCacheBackend(path, 10, 0), settings=cache_settings())
+    after = PredictionCache(DiskCacheBackend(path, 10, 0), settings={**cache_settings(), setting: value})
+    result = PredictionResult(filename="a.jpg", media_type="image", predicted_label="banjo", confidence=0.9)
+
+    before.set(before.key("image", "v1", b"same bytes"), result)
+    assert after.get(after.key("image", "v1", b"same bytes"), "a.jpg") is None
+    assert PredictionCache(DiskCacheBackend(path, 10, 0)).get(before.key("image", "v1", b"same bytes"), "a.jpg")
+
+
+def test_lookups_and_stores_run_off_the_event_loop(monkeypatch, clock):
+    threads = []
+
+    class RecordingBackend(MemoryCacheBackend):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value):
+            threads.append(threading.get_ident())
+            super().set(key, value)
+
+    monkeypatch.setattr(cache, "prediction_cache", PredictionCache(RecordingBackend(10, 0)))
+    result = PredictionResult(filename="a.jpg", media_type="image", predicted_label="banjo", confidence=0.9)
+
+    async def main():
+        key, cached = await cache.lookup_prediction("image", "v1", b"bytes", "a.jpg")
+        assert cached is None
+        await cache.store_prediction(key, result)
+        _, cached = await cache.lookup_prediction("image", "v1", b"bytes", "b.jpg")
+        return threading.get_ident(), cached
+
+    loop_thread, cached = asyncio.run(main())
+    assert cached.filename == "b.jpg"
+    assert len(threads) == 3 and loop_thread not in threads
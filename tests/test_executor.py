@@ -0,0 +1,47 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi import HTTPException
+from src.api.services.executor import BoundedExecutor
+
+
+def test_rejects_work_beyond_max_pending_with_a_503():
+    executor = BoundedExecutor("test", lambda: ThreadPoolExecutor(max_workers=1), max_pending=1)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.create_task(executor.run(release.wait, 5))
+        await asyncio.sleep(0)
+        assert executor.pending == 1
+        with pytest.raises(HTTPException) as error:
+            await executor.run(lambda: None)
+        release.set()
+        await running
+        return error.value
+
+    try:
+        error = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert error.status_code == 503
+    assert "Retry-After" in error.headers
+    assert executor.stats() == {"pending": 0, "max_pending": 1, "rejected_count": 1}
+
+
+def test_frees_the_slot_when_the_task_fails():
+    executor = BoundedExecutor("test", lambda: ThreadPoolExecutor(max_workers=1), max_pending=1)
+
+    def failing():
+        raise ValueError("boom")
+
+    async def main():
+        with pytest.raises(ValueError):
+            await executor.run(failing)
+        return await executor.run(lambda x: x * 2, 21)
+
+    try:
+        assert asyncio.run(main()) == 42
+    finally:
+        executor.shutdown()
+    assert executor.pending == 0
@@ -0,0 +1,117 @@
+import os
+import pandas as pd
+import pytest
+from utils import generate_image_csv as module
+from utils.generate_image_csv import generate_image_csv, link_or_copy
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    raw, processed = tmp_path / "raw", tmp_path / "processed"
+    monkeypatch.setattr(module, "RAW_IMAGE_DATA_DIR", raw)
+    monkeypatch.setattr(module, "PROCESSED_IMAGE_DATA_DIR", processed)
+
+    files = {
+        "train/banjo/001.jpg": b"banjo one",
+        "train/banjo/002.jpg": b"banjo two",
+        "train/harp/001.jpg": b"harp one",
+        "valid/banjo/003.jpg": b"banjo three",
+        # The same picture in two splits, and once more under another label
+        "test/banjo/004.jpg": b"banjo one",
+        "test/harp/002.jpg": b"banjo two",
+    }
+    rows = []
+    for source, contents in files.items():
+        (raw / source).parent.mkdir(parents=True, exist_ok=True)
+        (raw / source).write_bytes(contents)
+        split, label, _ = source.split("/")
+        rows.append({"filepaths": source, "labels": label, "data set": split})
+    pd.DataFrame(rows).to_csv(raw / "instruments.csv", index=False)
+
+    hashed = []
+    file_sha256 = module.file_sha256
+    monkeypatch.setattr(module, "file_sha256", lambda path: hashed.append(path) or file_sha256(path))
+    return raw, processed, hashed
+
+
+def read_outputs(processed):
+    return pd.read_csv(processed / "instruments.csv"), sorted(os.listdir(processed / "clean"))
+
+
+def test_duplicates_are_kept_once_and_hardlinked(dataset):
+    raw, processed, hashed = dataset
+    generate_image_csv(workers=4)
+
+    df, clean = read_outputs(processed)
+    assert list(df["filename"]) == ["train_banjo_001.jpg", "train_banjo_002.jpg", "train_harp_001.jpg",
+                                    "valid_banjo_003.jpg"]
+    assert clean == sorted(df["filename"])
+    assert len(hashed) == 6
+    # Same inode as the source: no bytes were copied
+    assert os.path.samefile(processed / "clean" / "train_banjo_001.jpg", raw / "train/banjo/001.jpg")
+
+
+def test_copy_mode_does_not_share_inodes(dataset):
+    raw, processed, _ = dataset
+    generate_image_csv(workers=4, allow_link=False)
+    target = processed / "clean" / "train_harp_001.jpg"
+    assert target.read_bytes() == b"harp one"
+    assert not os.path.samefile(target, raw / "train/harp/001.jpg")
+
+
+def test_rerun_only_hashes_and_links_new_or_changed_files(dataset, monkeypatch):
+    raw, processed, hashed = dataset
+    generate_image_csv(workers=4)
+    first = read_outputs(processed)
+
+    # Nothing changed: nothing is hashed or linked again
+    hashed.clear()
+    linked = []
+    monkeypatch.setattr(module, "link_or_copy", lambda src, dst, allow_link: linked.append(dst) or link_or_copy(
+        src, dst, allow_link))
+    generate_image_csv(workers=4)
+    assert hashed == [] and linked == []
+    pd.testing.assert_frame_equal(read_outputs(processed)[0], first[0])
+    assert read_outputs(processed)[1] == first[1]
+
+    # A replaced file (new inode) and a new file
+    replaced = raw / "valid/banjo/003.jpg"
+    replaced.unlink()
+    replaced.write_bytes(b"banjo three, retaken")
+    (raw / "train/harp/005.jpg").write_bytes(b"harp five")
+    csv = pd.read_csv(raw / "instruments.csv")
+    csv.loc[len(csv)] = {"filepaths": "train/harp/005.jpg", "labels": "harp", "data set": "train"}
+    csv.to_csv(raw / "instruments.csv", index=False)
+
+    generate_image_csv(workers=4)
+    assert sorted(os.path.basename(path) for path in hashed) == ["003.jpg", "005.jpg"]
+    assert sorted(path.name for path in linked) == ["train_harp_005.jpg", "valid_banjo_003.jpg"]
+    assert (processed / "clean" / "valid_banjo_003.jpg").read_bytes() == b"banjo three, retaken"
+
+
+def test_rerun_with_a_source_listed_twice(dataset):
+    raw, processed, hashed = dataset
+    csv = pd.read_csv(raw / "instruments.csv")
+    pd.concat([csv, csv.iloc[[0]]]).to_csv(raw / "instruments.csv", index=False)
+
+    generate_image_csv(workers=4)
+    assert pd.read_csv(processed / "manifest.csv")["source"].duplicated().any()
+    hashed.clear()
+    # The manifest now has a duplicate index
+    generate_image_csv(workers=4)
+    assert hashed == []
+    assert len(read_outputs(processed)[0]) == 4
+
+
+def test_link_or_copy_falls_back_to_a_copy(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src.jpg", tmp_path / "dst.jpg"
+    src.write_bytes(b"pixels")
+    dst.write_bytes(b"stale")
+
+    def no_link(*args):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(module.os, "link", no_link)
+    monkeypatch.setattr(module, "fcntl", None)
+    assert link_or_copy(src, dst) == "copy"
+    assert dst.read_bytes() == b"pixels"
@@ -0,0 +1,27 @@
+import pytest
+from config.constants import IMAGE_MODELS_DIR
+from src.api.config import IMAGE_MODEL_PATH, IMAGE_INDICES_PATH
+from utils import image_features
+from utils.image_features import CANDIDATE_MODELS_DIR, train_head
+
+
+def test_default_output_is_not_the_served_model():
+    assert CANDIDATE_MODELS_DIR != IMAGE_MODELS_DIR
+    assert CANDIDATE_MODELS_DIR / image_features.MODEL_FILENAME != IMAGE_MODEL_PATH
+    assert CANDIDATE_MODELS_DIR / image_features.INDICES_FILENAME != IMAGE_INDICES_PATH
+
+
+def test_existing_models_are_not_overwritten(tmp_path, monkeypatch):
+    (tmp_path / image_features.MODEL_FILENAME).write_bytes(b"served model")
+
+    def load_image_features(store_dir):
+        raise AssertionError("training should not start")
+
+    monkeypatch.setattr(image_features, "load_image_features", load_image_features)
+    with pytest.raises(FileExistsError, match="--overwrite"):
+        train_head(output_dir=tmp_path)
+    assert (tmp_path / image_features.MODEL_FILENAME).read_bytes() == b"served model"
+
+    # Allowed when asked for: training starts
+    with pytest.raises(AssertionError, match="training should not start"):
+        train_head(output_dir=tmp_path, overwrite=True)
@@ -0,0 +1,71 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+from tensorflow.keras.applications.resnet50 import preprocess_input
+from tensorflow.keras.preprocessing import image
+from utils import image_processing
+from utils.image_processing import get_image_dataset, preprocess_image
+
+SIZES = [(640, 480), (480, 640), (1000, 1000), (301, 157), (224, 224), (100, 80)]
+
+
+def photo(width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x * 255 / width, y * 255 / height, (x + y) % 256], axis=-1)
+    return np.clip(base + rng.normal(0, 20, base.shape), 0, 255).astype(np.uint8)
+
+
+def keras_reference(path):
+    img = image.load_img(path, target_size=(224, 224))
+    return preprocess_input(image.img_to_array(img))
+
+
+@pytest.fixture(scope="module")
+def image_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("images")
+    for i, (width, height) in enumerate(SIZES):
+        pixels = Image.fromarray(photo(width, height, seed=i))
+        pixels.save(directory / f"{i}.png")
+        pixels.save(directory / f"{i}.jpg", quality=90)
+    return directory
+
+
+@pytest.mark.parametrize("extensions", [("png",), ("jpg",), ("png", "jpg")])
+def test_dataset_matches_load_img(image_dir, extensions):
+    # JPEG only, or mixed formats (decoded through decode_image)
+    df = pd.DataFrame({"filename": [f"{i}.{extensions[i % len(extensions)]}" for i in range(len(SIZES))],
+                       "label": [f"class_{i % 2}" for i in range(len(SIZES))]})
+    dataset = get_image_dataset(df, image_dir, batch_size=len(SIZES), class_mode=None, shuffle=False)
+    batch = next(iter(dataset)).numpy()
+
+    for i, filename in enumerate(df["filename"]):
+        reference = keras_reference(image_dir / filename)
+        np.testing.assert_allclose(batch[i], reference, atol=1e-4, err_msg=f"{filename} {SIZES[i]}")
+
+
+@pytest.mark.parametrize("index", range(len(SIZES)))
+def test_preprocess_image_matches_load_img_by_default(image_dir, index):
+    # Draft decoding is opt-in: the default path is bit-identical to load_img
+    path = image_dir / f"{index}.jpg"
+    np.testing.assert_array_equal(preprocess_image(path)[0], keras_reference(path))
+    np.testing.assert_array_equal(preprocess_image(io.BytesIO(path.read_bytes()))[0], keras_reference(path))
+
+
+@pytest.mark.parametrize("cache", [None, ""])
+def test_cached_training_batches_mix_classes(tmp_path, monkeypatch, cache):
+    # Rows sorted by label, like instruments.csv, and no help from the shuffle buffer
+    monkeypatch.setattr(image_processing, "SHUFFLE_BUFFER", 1)
+    labels = [f"class_{i // 20}" for i in range(60)]
+    for i in range(60):
+        Image.fromarray(np.full((8, 8, 3), i, dtype=np.uint8)).save(tmp_path / f"{i}.png")
+    df = pd.DataFrame({"filename": [f"{i}.png" for i in range(60)], "label": labels})
+
+    dataset = get_image_dataset(df, tmp_path, target_size=(8, 8), batch_size=20, class_mode="sparse",
+                                seed=0, preprocessing_function=None, cache=cache)
+    for epoch in range(2):
+        batch_labels = [labels.numpy() for _, labels in dataset]
+        assert all(len(np.unique(batch)) > 1 for batch in batch_labels)
+        assert sorted(np.concatenate(batch_labels)) == sorted(df["label"].map(dataset.class_indices))
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+from utils.image_processing import get_image_dataset, get_shard_dataset
+from utils.image_shards import ImageShardReader, pack_images
+
+LABELS = ["banjo", "flute", "harp"]
+
+
+@pytest.fixture
+def images(tmp_path):
+    image_dir = tmp_path / "clean"
+    image_dir.mkdir()
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(11):
+        filename = f"{i}.{'png' if i % 2 else 'jpg'}"
+        pixels = rng.integers(0, 256, (rng.integers(16, 48), rng.integers(16, 48), 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(image_dir / filename)
+        rows.append((filename, LABELS[i % 3]))
+    rows.append(("missing.jpg", "harp"))
+    csv_path = tmp_path / "instruments.csv"
+    pd.DataFrame(rows, columns=["filename", "label"]).to_csv(csv_path, index=False)
+    return csv_path, image_dir
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_pack_and_read_back(tmp_path, images, shuffle):
+    csv_path, image_dir = images
+    shard_dir = tmp_path / "shards"
+    # ~4 KB shards: several images each, and a last partial shard
+    pack_images(csv_path, image_dir, shard_dir, shard_size_mb=4 / 1024, shuffle=shuffle)
+
+    reader = ImageShardReader(shard_dir)
+    try:
+        index = reader.index
+        shards = sorted(shard_dir.glob("images-*.shard"))
+        assert len(shards) > 2
+        assert len(reader) == 11 and "missing.jpg" not in set(index["filename"])
+        assert sorted(index["filename"]) == sorted(f"{i}.{'png' if i % 2 else 'jpg'}" for i in range(11))
+        source_labels = dict(pd.read_csv(csv_path).values)
+        assert all(source_labels[f] == label for f, label in zip(index["filename"], index["label"]))
+        # Shard sizes add up to their records; only the last shard is smaller than the target
+        for shard_id, shard in enumerate(shards):
+            assert shard.stat().st_size == index.loc[index["shard"] == shard_id, "length"].sum()
+        assert all(shard.stat().st_size >= 4096 for shard in shards[:-1])
+        assert shards[-1].stat().st_size < 4096 + index["length"].max()
+
+        for row, filename in enumerate(index["filename"]):
+            assert reader[row] == (image_dir / filename).read_bytes()
+        rows = [row for row, _ in reader.iter_records(shuffle_shards=True, rng=np.random.default_rng(1))]
+        assert sorted(rows) == list(range(11))
+        sample_rows, contents = reader.sample(5, seed=0)
+        assert [reader[row] for row in sample_rows] == contents
+    finally:
+        reader.close()
+
+
+def test_shard_dataset_matches_the_file_dataset(tmp_path, images):
+    csv_path, image_dir = images
+    shard_dir = tmp_path / "shards"
+    pack_images(csv_path, image_dir, shard_dir, shard_size_mb=4 / 1024, shuffle=False)
+
+    shard_dataset = get_shard_dataset(shard_dir, target_size=(32, 32), batch_size=64, class_mode="sparse",
+                                      shuffle=False)
+    index = ImageShardReader(shard_dir).index
+    file_dataset = get_image_dataset(index, image_dir, target_size=(32, 32), batch_size=64, class_mode="sparse",
+                                     shuffle=False)
+    (shard_images, shard_labels), = list(shard_dataset)
+    (file_images, file_labels), = list(file_dataset)
+
+    assert shard_dataset.samples == 11
+    assert shard_dataset.class_indices == {label: i for i, label in enumerate(LABELS)}
+    np.testing.assert_array_equal(shard_labels.numpy(), shard_dataset.classes)
+    np.testing.assert_array_equal(shard_labels.numpy(), file_labels.numpy())
+    np.testing.assert_array_equal(shard_images.numpy(), file_images.numpy())
@@ -0,0 +1,127 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+import tensorflow as tf
+from sklearn.preprocessing import StandardScaler
+from tensorflow.keras import layers, models
+from src.api import inference
+from src.api.inference import (
+    KerasBackend, TFLiteBackend, scaler_affine, label_array, top_labels, top_k_indices, apply_temperature, load_temperature
+)
+
+
+@pytest.mark.parametrize("with_mean, with_std", [(True, True), (False, True), (True, False)])
+def test_scaler_affine_matches_standard_scaler(with_mean, with_std):
+    rng = np.random.default_rng(0)
+    scaler = StandardScaler(with_mean=with_mean, with_std=with_std).fit(rng.normal(0.3, 0.2, (256, 16)))
+    x = rng.normal(0.3, 0.2, (8, 16)).astype(np.float32)
+
+    weight, bias = scaler_affine(scaler)
+    assert weight.dtype == bias.dtype == np.float32
+    np.testing.assert_allclose(x * weight + bias, scaler.transform(x), rtol=1e-5, atol=1e-5)
+
+
+def test_keras_backend_applies_the_affine_in_the_graph():
+    rng = np.random.default_rng(1)
+    model = models.Sequential([layers.Input(shape=(16,)), layers.Dense(4, activation="softmax")])
+    scaler = StandardScaler().fit(rng.normal(2.0, 3.0, (128, 16)))
+    x = rng.normal(2.0, 3.0, (5, 16)).astype(np.float32)
+
+    fused = KerasBackend(model, input_affine=scaler_affine(scaler)).predict(x)
+    separate = KerasBackend(model).predict(scaler.transform(x).astype(np.float32))
+    np.testing.assert_allclose(fused, separate, atol=1e-6)
+
+
+@pytest.fixture(scope="module")
+def tflite_model(tmp_path_factory):
+    model = models.Sequential([layers.Input(shape=(16,)), layers.Dense(4, activation="softmax")])
+    path = tmp_path_factory.mktemp("tflite") / "model.tflite"
+    path.write_bytes(tf.lite.TFLiteConverter.from_keras_model(model).convert())
+    return model, path
+
+
+def test_tflite_warmup_builds_one_interpreter_per_worker(tflite_model, monkeypatch):
+    model, path = tflite_model
+    built = []
+
+    def counting_interpreter(**kwargs):
+        built.append(threading.get_ident())
+        return tf.lite.Interpreter(**kwargs)
+
+    monkeypatch.setattr(inference, "TFLiteInterpreter", counting_interpreter)
+    backend = TFLiteBackend(path, pool_size=3)
+    backend.warmup((1, 4))
+    assert len(built) == 3
+
+    # Requests from the executor threads reuse the warmed-up interpreters
+    x = np.random.default_rng(0).normal(size=(12, 4, 16)).astype(np.float32)
+    barrier = threading.Barrier(3)
+
+    def predict(batch):
+        barrier.wait(timeout=5)
+        return backend.predict(batch)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        outputs = list(pool.map(predict, x[:3])) + list(pool.map(backend.predict, x[3:]))
+    assert len(built) == 3
+    for batch, output in zip(x, outputs):
+        np.testing.assert_allclose(output, model(batch).numpy(), atol=1e-5)
+    # Batch size changes resize the interpreter
+    assert backend.predict(x[0][:1]).shape == (1, 4)
+
+
+def test_label_array_and_top_labels():
+    labels = label_array({0: "banjo", 2: "harp"})
+    assert list(labels) == ["banjo", "Unknown", "harp"]
+
+    probabilities = np.array([[0.1, 0.2, 0.7], [0.6, 0.3, 0.1]], dtype=np.float32)
+    predicted, confidences = top_labels(probabilities, labels)
+    assert list(predicted) == ["harp", "banjo"]
+    np.testing.assert_allclose(confidences, [0.7, 0.6])
+
+
+def softmax_rows(rng, shape, sharpness=3.0):
+    logits = rng.normal(0, sharpness, shape)
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return (exp / exp.sum(axis=-1, keepdims=True)).astype(np.float32)
+
+
+@pytest.mark.parametrize("k", [1, 3, 10, 50])
+def test_top_k_indices_match_a_full_sort(k):
+    probabilities = softmax_rows(np.random.default_rng(k), (16, 10))
+    expected = np.argsort(-probabilities, axis=1, kind="stable")[:, :min(k, 10)]
+    np.testing.assert_array_equal(top_k_indices(probabilities, k), expected)
+    # A single row works too
+    np.testing.assert_array_equal(top_k_indices(probabilities[0], k), expected[0])
+
+
+@pytest.mark.parametrize("temperature", [0.5, 1.7, 4.0])
+def test_apply_temperature_keeps_the_argmax_and_sums_to_one(temperature):
+    probabilities = softmax_rows(np.random.default_rng(0), (32, 11))
+    calibrated = apply_temperature(probabilities, temperature)
+
+    assert calibrated.dtype == np.float32
+    np.testing.assert_allclose(calibrated.sum(axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_array_equal(calibrated.argmax(axis=1), probabilities.argmax(axis=1))
+    # T > 1 softens the predictions, T < 1 sharpens them
+    if temperature > 1:
+        assert np.all(calibrated.max(axis=1) <= probabilities.max(axis=1) + 1e-6)
+    else:
+        assert np.all(calibrated.max(axis=1) >= probabilities.max(axis=1) - 1e-6)
+
+
+def test_apply_temperature_equals_scaling_the_logits():
+    rng = np.random.default_rng(2)
+    logits = rng.normal(0, 2, (4, 6))
+    softmax = lambda z: np.exp(z) / np.exp(z).sum(axis=1, keepdims=True)
+    np.testing.assert_allclose(apply_temperature(softmax(logits).astype(np.float32), 2.5), softmax(logits / 2.5),
+                               rtol=1e-5)
+    probabilities = softmax(logits)
+    assert apply_temperature(probabilities, None) is probabilities
+
+
+def test_load_temperature(tmp_path):
+    assert load_temperature(tmp_path / "missing.json") is None
+    (tmp_path / "temperature.json").write_text('{"temperature": 1.8, "samples": 10}')
+    assert load_temperature(tmp_path / "temperature.json") == 1.8
@@ -0,0 +1,73 @@
+import asyncio
+import numpy as np
+from src.api.config import LIVE_AUDIO_WINDOW_SAMPLES as WINDOW, LIVE_AUDIO_HOP_SAMPLES as HOP
+from src.api.services.live_audio import AudioRingBuffer, LiveAudioSession
+
+
+def test_ring_buffer_reads_back_the_latest_samples():
+    rng = np.random.default_rng(0)
+    ring = AudioRingBuffer(100)
+    stream = np.zeros(0, dtype=np.float32)
+    # Writes smaller than, equal to and larger than the capacity, wrapping around
+    for size in [7, 30, 100, 3, 250, 64, 99, 1]:
+        chunk = rng.standard_normal(size).astype(np.float32)
+        ring.write(chunk)
+        stream = np.concatenate([stream, chunk])
+
+        assert ring.total == len(stream)
+        assert ring.oldest() == max(0, len(stream) - 100)
+        for length in (1, min(37, len(stream)), min(100, len(stream))):
+            np.testing.assert_array_equal(ring.read(len(stream), length), stream[len(stream) - length:])
+    np.testing.assert_array_equal(ring.read(len(stream) - 20, 50), stream[-70:-20])
+
+
+class FrameManager:
+    """
+    Stands in for the model manager: each YAMNet frame "embedding" is the last
+    sample of its window, so a ramp input reveals which windows were embedded.
+    """
+
+    def __init__(self):
+        self.audio_label_array = np.array(["bass", "brass"], dtype=object)
+
+    def embed_frames(self, wav_data):
+        num_frames = 1 + (len(wav_data) - WINDOW) // HOP
+        ends = [wav_data[i * HOP + WINDOW - 1] + 1 for i in range(num_frames)]
+        return np.array(ends, dtype=np.float32)[:, None].repeat(4, axis=1)
+
+    def predict_audio_batch(self, context):
+        return np.array([[0.25, 0.75]], dtype=np.float32)
+
+
+def push_ramp(session, start, stop, chunk_size):
+    async def main():
+        for begin in range(start, stop, chunk_size):
+            ramp = np.arange(begin, min(begin + chunk_size, stop), dtype=np.float32)
+            await session.push(ramp.tobytes())
+    asyncio.run(main())
+
+
+def test_session_embeds_every_hop_exactly_once():
+    session = LiveAudioSession(FrameManager(), emit_hz=1000.0, pcm_format="float32")
+    total = 3 * 16000
+    # A plain list keeps every embedded frame instead of the last few
+    session.frames = frame_ends = []
+    push_ramp(session, 0, total, chunk_size=1000)
+
+    expected = list(range(WINDOW, total + 1, HOP))
+    assert [int(frame[0]) for frame in frame_ends] == expected
+    assert session.next_frame_end == expected[-1] + HOP
+
+
+def test_session_skips_hops_that_left_the_ring():
+    session = LiveAudioSession(FrameManager(), emit_hz=1000.0, pcm_format="float32")
+    session.frames = frame_ends = []
+    total = 10 * 16000
+    # One message far longer than the ring: only the readable hops are embedded
+    push_ramp(session, 0, total, chunk_size=total)
+
+    ends = [int(frame[0]) for frame in frame_ends]
+    assert ends[0] >= session.ring.oldest() + WINDOW
+    assert (ends[0] - WINDOW) % HOP == 0
+    assert np.all(np.diff(ends) == HOP)
+    assert ends[-1] <= total < ends[-1] + HOP
@@ -0,0 +1,130 @@
+import asyncio
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from src.api.services import multimodal_service
+from src.api.services.multimodal_service import normalize_weights, fuse_probabilities, image_family_matrix
+
+IMAGE_LABELS = np.array(["guitar", "drums", "violin", "banjo"], dtype=object)
+AUDIO_LABELS = np.array(["brass", "guitar", "string"], dtype=object)
+
+
+def fake_manager():
+    return SimpleNamespace(image_label_array=IMAGE_LABELS, audio_label_array=AUDIO_LABELS,
+                           is_ready=lambda *models: True)
+
+
+@pytest.mark.parametrize("weights", [(0.0, 0.0), (0.0, -1.0)])
+def test_normalize_weights_rejects_no_positive_weight(weights):
+    with pytest.raises(HTTPException) as error:
+        normalize_weights(*weights)
+    assert error.value.status_code == 400
+
+
+def test_normalize_weights():
+    assert normalize_weights(1.0, 3.0) == (0.25, 0.75)
+    assert normalize_weights(0.0, 2.0) == (0.0, 1.0)
+    assert normalize_weights(5.0, 0.0) == (1.0, 0.0)
+
+
+def test_family_matrix_maps_image_classes_to_audio_families():
+    matrix = image_family_matrix(fake_manager())
+    np.testing.assert_array_equal(matrix, [
+        [0, 1, 0],  # guitar
+        [0, 0, 0],  # drums: no audio family
+        [0, 0, 1],  # violin
+        [0, 1, 0],  # banjo
+    ])
+
+
+def test_fuse_probabilities():
+    matrix = image_family_matrix(fake_manager())
+    image_p = np.array([0.3, 0.4, 0.1, 0.2], dtype=np.float32)
+    audio_p = np.array([0.2, 0.2, 0.6], dtype=np.float32)
+
+    fused = fuse_probabilities(image_p, audio_p, matrix, 0.5, 0.5)
+    # Guitar and banjo add up, the drums mass stays out of every family
+    np.testing.assert_allclose(fused, 0.5 * np.array([0.0, 0.5, 0.1]) + 0.5 * audio_p, rtol=1e-6)
+    assert fused.sum() == pytest.approx(1 - 0.5 * 0.4)
+    np.testing.assert_allclose(fuse_probabilities(image_p, audio_p, matrix, 0.0, 1.0), audio_p, rtol=1e-6)
+
+
+def predict_with(monkeypatch, image_p, audio_p, image_weight, audio_weight):
+    async def image(file, manager):
+        return np.asarray(image_p, dtype=np.float32)
+
+    async def audio(file, manager):
+        return np.asarray(audio_p, dtype=np.float32)
+
+    monkeypatch.setattr(multimodal_service, "image_probabilities", image)
+    monkeypatch.setattr(multimodal_service, "audio_probabilities", audio)
+    files = SimpleNamespace(filename="a.jpg"), SimpleNamespace(filename="a.wav")
+    return asyncio.run(multimodal_service.predict_multimodal(*files, fake_manager(), image_weight, audio_weight))
+
+
+def test_unmapped_image_mass_is_reported_not_renormalized(monkeypatch):
+    result = predict_with(monkeypatch, [0.1, 0.7, 0.2, 0.0], [0.5, 0.3, 0.2], 1.0, 1.0)
+    assert result.predicted_label == "brass"
+    assert result.confidence == pytest.approx(0.25)
+    assert result.unmapped == pytest.approx(0.35)
+    assert result.weights == {"image": 0.5, "audio": 0.5}
+
+
+def test_an_image_without_any_family_defers_to_the_recording(monkeypatch):
+    # Only the image counts and it shows drums: every family gets 0
+    result = predict_with(monkeypatch, [0.0, 1.0, 0.0, 0.0], [0.1, 0.2, 0.7], 1.0, 0.0)
+    assert result.predicted_label == "string"
+    assert result.confidence == pytest.approx(0.7)
+    assert result.weights == {"image": 0.0, "audio": 1.0}
+    assert result.unmapped == pytest.approx(0.0, abs=1e-6)
+
+
+def test_zero_weights_are_rejected(monkeypatch):
+    with pytest.raises(HTTPException) as error:
+        predict_with(monkeypatch, [0.25] * 4, [0.5, 0.3, 0.2], 0.0, 0.0)
+    assert error.value.status_code == 400
+
+
+def test_a_failing_branch_cancels_the_other(monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def failing_image(file, manager):
+        await asyncio.sleep(0)
+        raise HTTPException(status_code=400, detail="Invalid image file")
+
+    async def slow_audio(file, manager):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(multimodal_service, "image_probabilities", failing_image)
+    monkeypatch.setattr(multimodal_service, "audio_probabilities", slow_audio)
+
+    async def main():
+        with pytest.raises(HTTPException) as error:
+            await asyncio.wait_for(multimodal_service.predict_multimodal(None, None, fake_manager(), 1.0, 1.0), 5)
+        return error.value
+
+    error = asyncio.run(main())
+    # The branch's own error comes through, not a 500 wrapping an exception group
+    assert error.status_code == 400
+    assert cancelled.is_set()
+
+
+def test_an_unexpected_branch_error_is_a_500(monkeypatch):
+    async def failing_audio(file, manager):
+        raise RuntimeError("boom")
+
+    async def image(file, manager):
+        return np.full(len(IMAGE_LABELS), 0.25, dtype=np.float32)
+
+    monkeypatch.setattr(multimodal_service, "image_probabilities", image)
+    monkeypatch.setattr(multimodal_service, "audio_probabilities", failing_audio)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(multimodal_service.predict_multimodal(None, None, fake_manager(), 1.0, 1.0))
+    assert error.value.status_code == 500
+    assert "boom" in error.value.detail
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.normalize import rolling_mean_abs, envelope, envelope_batch, trim_silence
+
+
+def pandas_rolling_mean_abs(y, window):
+    return pd.Series(np.abs(y)).rolling(window=window, min_periods=1, center=True).mean().to_numpy()
+
+
+@pytest.mark.parametrize("length, window", [(1, 1), (5, 1), (5, 2), (5, 7), (100, 10), (101, 11), (1000, 1600)])
+def test_rolling_mean_matches_pandas(length, window):
+    y = np.random.default_rng(length + window).standard_normal(length).astype(np.float32)
+    np.testing.assert_allclose(rolling_mean_abs(y, window), pandas_rolling_mean_abs(y, window), rtol=1e-9, atol=1e-12)
+
+
+def test_envelope_matches_the_pandas_mask():
+    rate = 16000
+    t = np.arange(rate) / rate
+    rng = np.random.default_rng(0)
+    y = (np.sin(2 * np.pi * 440 * t) * np.exp(-t * 4) + rng.normal(0, 0.005, rate)).astype(np.float32)
+
+    expected = pandas_rolling_mean_abs(y, rate // 10) > 0.05
+    mask = envelope(y, rate, 0.05)
+    np.testing.assert_array_equal(mask, expected)
+    assert 0 < mask.sum() < len(y)
+    np.testing.assert_array_equal(trim_silence(y, rate, 0.05), y[expected])
+
+
+def test_envelope_batch_handles_stacked_and_ragged_clips():
+    rng = np.random.default_rng(1)
+    stacked = rng.standard_normal((3, 800)).astype(np.float32) * [[0.01], [0.5], [1.0]]
+    ragged = [rng.standard_normal(n).astype(np.float32) for n in (10, 500, 2000)]
+
+    for clips in (stacked, ragged):
+        masks = envelope_batch(clips, 8000, 0.3)
+        for clip, mask in zip(clips, masks):
+            np.testing.assert_array_equal(mask, pandas_rolling_mean_abs(clip, 800) > 0.3)
@@ -0,0 +1,36 @@
+import numpy as np
+from src.api.config import TOP_K_MAX
+from src.api.services.results import build_result, select_top_k
+from utils.fit_temperature import fit_temperature
+
+LABELS = np.array([f"instrument_{i}" for i in range(8)], dtype=object)
+
+
+def test_build_result_keeps_the_best_labels_for_any_top_k():
+    probabilities = np.array([0.05, 0.4, 0.1, 0.2, 0.02, 0.03, 0.15, 0.05], dtype=np.float32)
+    result = build_result("a.jpg", "image", probabilities, LABELS)
+
+    assert result.predicted_label == "instrument_1"
+    assert result.confidence == np.float32(0.4)
+    assert [entry.label for entry in result.top_k] == ["instrument_1", "instrument_3", "instrument_6",
+                                                       "instrument_2", "instrument_0"][:TOP_K_MAX]
+
+    assert select_top_k(result, None).top_k is None
+    trimmed = select_top_k(result, 2)
+    assert [entry.label for entry in trimmed.top_k] == ["instrument_1", "instrument_3"]
+    # The stored (possibly cached) result is left untouched
+    assert len(result.top_k) == TOP_K_MAX
+
+
+def test_fit_temperature_recovers_overconfidence():
+    rng = np.random.default_rng(0)
+    logits = rng.normal(0, 1, (4000, 8))
+    true_probabilities = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    y = np.array([rng.choice(8, p=row) for row in true_probabilities])
+    # A model three times too confident
+    overconfident = np.exp(3 * logits) / np.exp(3 * logits).sum(axis=1, keepdims=True)
+
+    report = fit_temperature(overconfident, y)
+    assert 2.5 < report["temperature"] < 3.5
+    assert report["nll_after"] < report["nll_before"]
+    assert report["ece_after"] < report["ece_before"]
@@ -0,0 +1,137 @@
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from PIL import Image
+from src.api.dependencies import get_model_manager
+from src.api.routers import batch
+from src.api.services import cache, streaming
+
+BOUNDARY = "----instrument-boundary"
+LABELS = np.array(["dark", "bright"], dtype=object)
+
+
+class FakeBatcher:
+    async def submit(self, img_tensor):
+        # ResNet50 preprocessing centres the pixels: bright images are positive
+        bright = float(img_tensor.mean() > 0)
+        return np.array([1 - bright, bright], dtype=np.float32)
+
+
+def fake_manager():
+    return SimpleNamespace(is_ready=lambda *models: True, image_version="test", image_label_array=LABELS,
+                           image_batcher=FakeBatcher())
+
+
+def png(value):
+    buffer = io.BytesIO()
+    Image.fromarray(np.full((32, 32, 3), value, dtype=np.uint8)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def multipart_body(parts):
+    body = b""
+    for name, filename, contents in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        content_type = "Content-Type: application/octet-stream\r\n" if filename else ""
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n{content_type}\r\n".encode()
+        body += contents + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def post_stream(path, body, chunk_size):
+    app = FastAPI()
+    app.include_router(batch.router)
+    app.dependency_overrides[get_model_manager] = fake_manager
+
+    async def chunks():
+        # Each chunk reaches the app as its own http.request message
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, content=chunks(),
+                                     headers={"content-type": f"multipart/form-data; boundary={BOUNDARY}"})
+
+    response = asyncio.run(main())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setattr(cache, "prediction_cache", None)
+
+
+# 1 and 7 bytes split the boundaries and part headers across chunk edges
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_image_stream_yields_a_line_per_file_then_the_summary(monkeypatch, chunk_size):
+    monkeypatch.setattr(streaming, "STREAM_MAX_IN_FLIGHT", 1)
+    body = multipart_body([
+        ("files", "white.png", png(255)),
+        ("comment", None, b"plain form fields are skipped"),
+        ("files", "broken.jpg", b"not an image"),
+        ("files", "black.png", png(0)),
+    ])
+    *results, last = post_stream("/predict/batch/image/stream?top_k=2", body, chunk_size)
+
+    assert [result["filename"] for result in results] == ["white.png", "broken.jpg", "black.png"]
+    assert [result["predicted_label"] for result in results] == ["bright", "Error", "dark"]
+    # The broken file gets its own error line and the next file is still processed
+    assert results[1]["error"] == "Failed to preprocess image"
+    assert [entry["label"] for entry in results[2]["top_k"]] == ["dark", "bright"]
+    assert last == {"summary": {"total_processed": 3, "success_count": 2, "error_count": 1, "error": None}}
+
+
+def test_concurrent_results_cover_every_file():
+    body = multipart_body([("files", f"{i}.png", png(255 * (i % 2))) for i in range(12)])
+    *results, last = post_stream("/predict/batch/image/stream", body, 512)
+
+    labels = {result["filename"]: result["predicted_label"] for result in results}
+    assert labels == {f"{i}.png": ["dark", "bright"][i % 2] for i in range(12)}
+    assert last["summary"]["success_count"] == 12
+
+
+@pytest.mark.parametrize("cut", [4, 200])
+def test_truncated_body_ends_with_an_error_summary(monkeypatch, cut):
+    monkeypatch.setattr(streaming, "STREAM_MAX_IN_FLIGHT", 1)
+    body = multipart_body([("files", "white.png", png(255)), ("files", "black.png", png(0))])
+    # Cut in the closing boundary, or inside the last file
+    *results, last = post_stream("/predict/batch/image/stream", body[:-cut], 64)
+
+    assert [result["filename"] for result in results] == ["white.png"]
+    assert last["summary"]["total_processed"] == 1
+    assert "Incomplete multipart body" in last["summary"]["error"]
+
+
+def test_audio_stream_route(monkeypatch):
+    async def fake_predict_audio(file, manager):
+        contents = await file.read()
+        return streaming.PredictionResult(filename=file.filename, media_type="audio",
+                                          predicted_label=contents.decode(), confidence=1.0)
+
+    monkeypatch.setattr(batch, "predict_audio", fake_predict_audio)
+    body = multipart_body([("files", "a.wav", b"guitar"), ("files", "b.wav", b"brass")])
+    *results, last = post_stream("/predict/batch/audio/stream", body, 3)
+
+    assert sorted((r["filename"], r["predicted_label"]) for r in results) == [("a.wav", "guitar"), ("b.wav", "brass")]
+    assert last["summary"]["success_count"] == 2
+
+
+def test_a_non_multipart_body_is_rejected_before_streaming():
+    app = FastAPI()
+    app.include_router(batch.router)
+    app.dependency_overrides[get_model_manager] = fake_manager
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/predict/batch/image/stream", json={"files": []})
+
+    assert asyncio.run(main()).status_code == 400
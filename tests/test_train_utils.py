@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from utils.fit_temperature import image_validation_frame
+from utils.train_utils import image_split_indices, image_train_val_split
+
+
+def instruments_csv(tmp_path):
+    # Ordered by split, then label, like utils/generate_image_csv.py writes it
+    rows = [(f"{split}_{label}_{i}.jpg", label)
+            for split, count in [("train", 20), ("valid", 3), ("test", 2)]
+            for label in ["banjo", "flute", "harp", "tuba"]
+            for i in range(count)]
+    path = tmp_path / "instruments.csv"
+    pd.DataFrame(rows, columns=["filename", "label"]).to_csv(path, index=False)
+    return path
+
+
+def test_calibration_uses_the_rows_held_out_in_training(tmp_path):
+    csv_path = instruments_csv(tmp_path)
+    df = pd.read_csv(csv_path)
+
+    # The split of src/image/02_Model_Training.ipynb
+    notebook_train, notebook_val = train_test_split(df, test_size=0.2, stratify=df['label'], random_state=42)
+    # The split of utils/image_features.train_head (feature row i = CSV row i)
+    head_train, head_val = image_split_indices(df['label'].to_numpy())
+
+    val_df = image_validation_frame(csv_path)
+    assert set(val_df['filename']) == set(notebook_val['filename']) == set(df['filename'].iloc[head_val])
+    assert set(val_df['filename']).isdisjoint(notebook_train['filename'])
+    assert set(df['filename'].iloc[head_train]) == set(notebook_train['filename'])
+    # Not the "valid_" files of the original dataset, most of which were trained on
+    assert not val_df['filename'].str.startswith("valid_").all()
+
+
+def test_image_split_is_stratified(tmp_path):
+    df = pd.read_csv(instruments_csv(tmp_path))
+    train_df, val_df = image_train_val_split(df)
+    assert len(val_df) == round(0.2 * len(df))
+    np.testing.assert_array_equal(val_df['label'].value_counts().sort_index(), [len(df) // 20] * 4)
+    assert len(train_df) + len(val_df) == len(df)
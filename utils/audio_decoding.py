@@ -0,0 +1,85 @@
+import io
+import librosa
+import numpy as np
+import soundfile as sf
+
+class UnsupportedAudioFormat(ValueError):
+    """
+    Raised for audio that libsndfile cannot decode (see soundfile.available_formats()).
+    """
+
+def _unsupported(error):
+    # The message is the only argument, so the error pickles back from the decoding processes
+    return UnsupportedAudioFormat(f"Unsupported audio format: {error.error_string}")
+
+def load_audio(source, sr=16000):
+    """
+    Decodes audio to a mono float32 waveform at the given sample rate.
+    Kept free of TensorFlow imports so it can run cheaply in worker processes.
+
+    WAV/FLAC/OGG/MP3 are decoded straight from memory with soundfile; when the
+    input is already mono at the target rate, channel mixing and resampling are
+    skipped. librosa decodes through soundfile too, so there is no fallback for
+    other formats: they raise UnsupportedAudioFormat.
+
+    Args:
+        source (str, Path, bytes or file-like): Audio file path, raw bytes or buffer.
+        sr (int): Target sample rate (YAMNet requires 16kHz).
+
+    Returns:
+        np.array: 1-D waveform.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    try:
+        wav_data, native_sr = sf.read(source, dtype='float32', always_2d=True)
+    except sf.LibsndfileError as e:
+        raise _unsupported(e) from e
+
+    return _to_mono(wav_data, native_sr, sr)
+
+def _to_mono(wav_data, native_sr, sr):
+    # Fast path: already mono at the target rate
+    if wav_data.shape[1] == 1:
+        wav_data = wav_data[:, 0]
+    else:
+        wav_data = librosa.to_mono(wav_data.T)
+
+    if native_sr != sr:
+        wav_data = librosa.resample(wav_data, orig_sr=native_sr, target_sr=sr)
+
+    return np.ascontiguousarray(wav_data)
+
+def audio_duration(path):
+    """
+    Returns the duration of an audio file in seconds without decoding it.
+    """
+    try:
+        return sf.info(str(path)).duration
+    except sf.LibsndfileError as e:
+        raise _unsupported(e) from e
+
+def load_audio_segment(path, offset, duration, sr=16000):
+    """
+    Decodes only [offset, offset + duration) seconds of an audio file, so long
+    recordings can be processed window by window with bounded memory.
+
+    Args:
+        path (str or Path): Audio file on disk.
+        offset (float): Start of the segment in seconds.
+        duration (float): Length of the segment in seconds.
+        sr (int): Target sample rate (YAMNet requires 16kHz).
+
+    Returns:
+        np.array: 1-D waveform (shorter than `duration` at the end of the file).
+    """
+    try:
+        with sf.SoundFile(str(path)) as f:
+            native_sr = f.samplerate
+            f.seek(int(offset * native_sr))
+            wav_data = f.read(int(duration * native_sr), dtype='float32', always_2d=True)
+    except sf.LibsndfileError as e:
+        raise _unsupported(e) from e
+
+    return _to_mono(wav_data, native_sr, sr)
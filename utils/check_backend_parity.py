@@ -0,0 +1,104 @@
+import argparse
+import pickle
+import numpy as np
+import pandas as pd
+from config.constants import (
+    PROCESSED_AUDIO_DATA_DIR, CLEANED_AUDIO_DATA_DIR,
+    PROCESSED_IMAGE_DATA_DIR, CLEANED_IMAGE_DATA_DIR
+)
+from src.api.config import (
+    IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH, IMAGE_INDICES_PATH,
+    AUDIO_MODEL_PATH, AUDIO_TFLITE_PATH, AUDIO_LABEL_ENCODER_PATH, AUDIO_SCALER_PATH,
+    TFLITE_NUM_THREADS
+)
+from src.api.inference import load_backend
+from utils.embedding_extraction import extract_embedding
+from utils.image_processing import preprocess_image
+from utils.train_utils import image_train_val_split
+
+IMAGE_TEST_SAMPLES = 200
+
+def compare_backends(inputs, labels, class_names, keras_path, tflite_path):
+    """
+    Runs the Keras model and its TFLite export on the same inputs.
+
+    Args:
+        inputs (np.array): Stacked model inputs.
+        labels (list): True class name of each input.
+        class_names (list): Class name of each model output index.
+        keras_path (Path): Full-precision model.
+        tflite_path (Path): TFLite export of the same model.
+
+    Returns:
+        dict: Top-1 agreement, accuracy of each backend and max probability difference.
+    """
+    keras_probs = load_backend("keras", keras_path, tflite_path).predict(inputs)
+    tflite_probs = load_backend("tflite", keras_path, tflite_path, TFLITE_NUM_THREADS).predict(inputs)
+
+    keras_top1 = np.argmax(keras_probs, axis=1)
+    tflite_top1 = np.argmax(tflite_probs, axis=1)
+    labels = np.asarray(labels)
+    class_names = np.asarray(class_names)
+
+    return {
+        "samples": len(inputs),
+        "top1_agreement": float(np.mean(keras_top1 == tflite_top1)),
+        "keras_accuracy": float(np.mean(class_names[keras_top1] == labels)),
+        "tflite_accuracy": float(np.mean(class_names[tflite_top1] == labels)),
+        "max_prob_diff": float(np.max(np.abs(keras_probs - tflite_probs))),
+    }
+
+def check_audio():
+    # Manual test split written by utils/extract_manual_test_data.py
+    df = pd.read_csv(PROCESSED_AUDIO_DATA_DIR / "selected.csv")
+
+    with open(AUDIO_LABEL_ENCODER_PATH, 'rb') as f:
+        label_encoder = pickle.load(f)
+    with open(AUDIO_SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+
+    embeddings, labels = [], []
+    for filename, label in zip(df['filename'], df['label']):
+        embedding = extract_embedding(CLEANED_AUDIO_DATA_DIR / filename)
+        if embedding is not None:
+            embeddings.append(embedding)
+            labels.append(label)
+
+    inputs = scaler.transform(np.stack(embeddings)).astype(np.float32)
+    return compare_backends(inputs, labels, list(label_encoder.classes_), AUDIO_MODEL_PATH, AUDIO_TFLITE_PATH)
+
+def check_image(num_samples=IMAGE_TEST_SAMPLES):
+    # There is no manual split for images: use the rows held out in training
+    # (the "test_" files of the original dataset were mostly trained on)
+    _, df = image_train_val_split(pd.read_csv(PROCESSED_IMAGE_DATA_DIR / "instruments.csv"))
+    df = df.sample(n=min(num_samples, len(df)), random_state=42)
+
+    with open(IMAGE_INDICES_PATH, 'rb') as f:
+        class_indices = pickle.load(f)
+    class_names = [name for name, _ in sorted(class_indices.items(), key=lambda item: item[1])]
+
+    images, labels = [], []
+    for filename, label in zip(df['filename'], df['label']):
+        img = preprocess_image(CLEANED_IMAGE_DATA_DIR / filename)
+        if img is not None:
+            images.append(img[0])
+            labels.append(label)
+
+    inputs = np.stack(images).astype(np.float32)
+    return compare_backends(inputs, labels, class_names, IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the TFLite exports against the Keras models.")
+    parser.add_argument("--model", choices=["image", "audio", "all"], default="all")
+    parser.add_argument("--image-samples", type=int, default=IMAGE_TEST_SAMPLES)
+    args = parser.parse_args()
+
+    checks = {"audio": check_audio, "image": lambda: check_image(args.image_samples)}
+    names = list(checks) if args.model == "all" else [args.model]
+    for name in names:
+        report = checks[name]()
+        print(f"\n{name.capitalize()} model ({report['samples']} samples)")
+        print(f"  Top-1 agreement:  {report['top1_agreement']:.2%}")
+        print(f"  Keras accuracy:   {report['keras_accuracy']:.2%}")
+        print(f"  TFLite accuracy:  {report['tflite_accuracy']:.2%}")
+        print(f"  Max prob. diff:   {report['max_prob_diff']:.4f}")
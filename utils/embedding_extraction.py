@@ -1,37 +1,79 @@
-import librosa
+import os
+import threading
 import numpy as np
 import tensorflow_hub as hub
+from config.constants import YAMNET_MODEL_DIR
+from utils.audio_decoding import load_audio
 
-yamnet_model_handle = 'https://tfhub.dev/google/yamnet/1'
-yamnet_model = hub.load(yamnet_model_handle)
+YAMNET_REMOTE_HANDLE = 'https://tfhub.dev/google/yamnet/1'
 
-def extract_embedding(wav_file_path):
-    # 1. Load audio at 16kHZ (Required by YAMNet)
-    # y = audio, sr = sample rate
-    try:
-        wav_data, sr = librosa.load(wav_file_path, sr=16000)
-    except Exception as e:
-        print(f"Error loading {wav_file_path}: {e}")
-        return None
+yamnet_model = None
+_yamnet_lock = threading.Lock()
 
-    # 2. Check for silence/short files
+def yamnet_model_handle():
+    """
+    Prefers the pre-exported local copy (works offline, see utils/export_yamnet.py),
+    falling back to TF Hub.
+    """
+    if (YAMNET_MODEL_DIR / 'saved_model.pb').exists():
+        return str(YAMNET_MODEL_DIR)
+    return YAMNET_REMOTE_HANDLE
+
+def load_yamnet_model():
+    """
+    Loads YAMNet once, on first use, instead of at import time.
+    """
+    global yamnet_model
+    with _yamnet_lock:
+        if yamnet_model is None:
+            yamnet_model = hub.load(yamnet_model_handle())
+    return yamnet_model
+
+def embed_frames(wav_data):
+    """
+    Runs YAMNet over a 16kHz mono waveform and returns its per-frame embeddings,
+    shape (N, 1024): one 0.96s frame every 0.48s. Returns None for empty input.
+    """
+    # 1. Check for silence/short files
     if len(wav_data) == 0:
         return None
 
-    # 3. Normalization (map values between -1 and 1)
+    # 2. Normalization (map values between -1 and 1)
     # YAMNet expects normalized data
     max_val = np.max(np.abs(wav_data))
     if max_val > 0:
         wav_data = wav_data / max_val
 
-    # 4. Run YAMNet
+    # 3. Run YAMNet
     # The model returns (scores, embeddings, spectrogram)
     # We only care about embeddings.
-    scores, embeddings, spectrogram = yamnet_model(wav_data)
+    scores, embeddings, spectrogram = load_yamnet_model()(wav_data)
+    return np.asarray(embeddings)
+
+def embed_waveform(wav_data):
+    """
+    Runs YAMNet over a 16kHz mono waveform and returns one (1024,) embedding.
+    Returns None for empty input.
+    """
+    embeddings = embed_frames(wav_data)
+    if embeddings is None:
+        return None
 
-    # 5. Handle Lengths via Global Average Pooling
+    # 4. Handle Lengths via Global Average Pooling
     # embeddings shape is (N, 1024), where N depends on file duration.
     # We take the mean across the N dimension to get one (1024,) vector.
     global_embedding = np.mean(embeddings, axis=0)
 
-    return global_embedding
\ No newline at end of file
+    return global_embedding
+
+def extract_embedding(wav_file_path):
+    # Load audio at 16kHZ (Required by YAMNet)
+    # Accepts a path, raw bytes or a file-like buffer (decoded in memory)
+    try:
+        wav_data = load_audio(wav_file_path, sr=16000)
+    except Exception as e:
+        name = wav_file_path if isinstance(wav_file_path, (str, os.PathLike)) else type(wav_file_path).__name__
+        print(f"Error loading {name}: {e}")
+        return None
+
+    return embed_waveform(wav_data)
@@ -0,0 +1,95 @@
+import argparse
+import pickle
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from config.constants import (
+    PROCESSED_AUDIO_DATA_DIR, CLEANED_AUDIO_DATA_DIR,
+    PROCESSED_IMAGE_DATA_DIR, CLEANED_IMAGE_DATA_DIR
+)
+from src.api.config import (
+    IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH,
+    AUDIO_MODEL_PATH, AUDIO_TFLITE_PATH, AUDIO_SCALER_PATH
+)
+from utils.embedding_extraction import extract_embedding
+from utils.image_processing import preprocess_image
+
+MODELS = {
+    "image": (IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH),
+    "audio": (AUDIO_MODEL_PATH, AUDIO_TFLITE_PATH),
+}
+QUANTIZATIONS = ("none", "float16", "int8")
+CALIBRATION_SAMPLES = 100
+
+def image_calibration_data(num_samples=CALIBRATION_SAMPLES):
+    """
+    Yields preprocessed training images, used to calibrate int8 activation ranges.
+    """
+    df = pd.read_csv(PROCESSED_IMAGE_DATA_DIR / "instruments.csv")
+    df = df.sample(n=min(num_samples, len(df)), random_state=42)
+    for filename in df['filename']:
+        img = preprocess_image(CLEANED_IMAGE_DATA_DIR / filename)
+        if img is not None:
+            yield img.astype(np.float32)
+
+def audio_calibration_data(num_samples=CALIBRATION_SAMPLES):
+    """
+    Yields scaled YAMNet embeddings of training clips (the manual test split is left out).
+    """
+    csv_path = PROCESSED_AUDIO_DATA_DIR / "remaining.csv"
+    if not csv_path.exists():
+        csv_path = PROCESSED_AUDIO_DATA_DIR / "instruments.csv"
+    df = pd.read_csv(csv_path)
+    df = df.sample(n=min(num_samples, len(df)), random_state=42)
+
+    with open(AUDIO_SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+
+    for filename in df['filename']:
+        embedding = extract_embedding(CLEANED_AUDIO_DATA_DIR / filename)
+        if embedding is not None:
+            yield scaler.transform(embedding.reshape(1, -1)).astype(np.float32)
+
+def export_tflite(model_name, quantization="none", num_samples=CALIBRATION_SAMPLES):
+    """
+    Converts a trained Keras model to TFLite for the "tflite" inference backend.
+
+    Args:
+        model_name (str): "image" or "audio".
+        quantization (str): "none", "float16" (half-size weights) or
+            "int8" (int8 weights and activations, calibrated on training data).
+        num_samples (int): Calibration samples used for int8.
+
+    Returns:
+        Path: Where the .tflite file was written.
+    """
+    keras_path, tflite_path = MODELS[model_name]
+    model = tf.keras.models.load_model(keras_path, compile=False)
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantization == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == "int8":
+        calibration = image_calibration_data if model_name == "image" else audio_calibration_data
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([sample] for sample in calibration(num_samples))
+        # Inputs/outputs stay float32, so the API passes the same tensors as for Keras
+
+    tflite_model = converter.convert()
+    tflite_path.write_bytes(tflite_model)
+
+    size_mb = len(tflite_model) / 1e6
+    print(f"✅ {model_name} model exported to {tflite_path} ({quantization}, {size_mb:.1f} MB)")
+    return tflite_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the trained models to TFLite.")
+    parser.add_argument("--model", choices=[*MODELS, "all"], default="all")
+    parser.add_argument("--quantization", choices=QUANTIZATIONS, default="none")
+    parser.add_argument("--samples", type=int, default=CALIBRATION_SAMPLES, help="int8 calibration samples")
+    args = parser.parse_args()
+
+    names = list(MODELS) if args.model == "all" else [args.model]
+    for name in names:
+        export_tflite(name, args.quantization, args.samples)
@@ -0,0 +1,24 @@
+import shutil
+import tensorflow_hub as hub
+from config.constants import YAMNET_MODEL_DIR
+from utils.embedding_extraction import YAMNET_REMOTE_HANDLE
+
+def export_yamnet():
+    """
+    Downloads YAMNet from TF Hub once and stores the SavedModel in models/yamnet,
+    so the API and the notebooks can load it offline.
+    """
+    if (YAMNET_MODEL_DIR / 'saved_model.pb').exists():
+        print(f"YAMNet already exported to {YAMNET_MODEL_DIR}")
+        return
+
+    print(f"Downloading {YAMNET_REMOTE_HANDLE}...")
+    # hub.resolve returns the extracted SavedModel directory in the TF Hub cache
+    resolved_dir = hub.resolve(YAMNET_REMOTE_HANDLE)
+
+    YAMNET_MODEL_DIR.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copytree(resolved_dir, YAMNET_MODEL_DIR)
+    print(f"✅ YAMNet exported to {YAMNET_MODEL_DIR}")
+
+if __name__ == "__main__":
+    export_yamnet()
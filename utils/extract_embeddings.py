@@ -0,0 +1,161 @@
+import argparse
+import multiprocessing
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from tqdm import tqdm
+from config.constants import PROCESSED_AUDIO_DATA_DIR, CLEANED_AUDIO_DATA_DIR
+
+EMBEDDINGS_DIR = PROCESSED_AUDIO_DATA_DIR / "embeddings"
+EMBEDDING_DIM = 1024
+SHARD_SIZE = 64
+
+# Row status in status.npy
+PENDING, DONE, FAILED = 0, 1, 2
+
+def _store_paths(store_dir):
+    store_dir = Path(store_dir)
+    return store_dir / "embeddings.npy", store_dir / "status.npy", store_dir / "index.csv"
+
+def open_store(csv_path, store_dir=EMBEDDINGS_DIR):
+    """
+    Creates (or reopens) an embedding store for the rows of a CSV with
+    'filename' and 'label' columns.
+
+    The store is a directory with:
+        embeddings.npy  (N, 1024) float32, memory-mapped, row i = CSV row i
+        status.npy      (N,) uint8: 0 pending, 1 done, 2 failed
+        index.csv       filename and label of every row
+
+    Returns:
+        pd.DataFrame: The index.
+    """
+    embeddings_path, status_path, index_path = _store_paths(store_dir)
+    df = pd.read_csv(csv_path)[['filename', 'label']].reset_index(drop=True)
+
+    if index_path.exists():
+        index = pd.read_csv(index_path)
+        if not index['filename'].equals(df['filename']):
+            raise ValueError(f"{store_dir} was built from another CSV, use a new --output directory")
+        return index
+
+    Path(store_dir).mkdir(parents=True, exist_ok=True)
+    np.lib.format.open_memmap(embeddings_path, mode='w+', dtype=np.float32, shape=(len(df), EMBEDDING_DIM)).flush()
+    np.save(status_path, np.zeros(len(df), dtype=np.uint8))
+    # Written last: a store without an index is rebuilt from scratch
+    df.to_csv(index_path, index=False)
+    return df
+
+def _init_worker(threads):
+    import tensorflow as tf
+    # Several YAMNet workers share the CPU: limit each one's thread pools
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+def _process_shard(store_dir, rows, paths):
+    """
+    Extracts the embeddings of one shard and writes them straight into the
+    memory-mapped store. Returns (rows, statuses); the parent records the statuses.
+    """
+    from utils.embedding_extraction import extract_embedding
+
+    embeddings_path, _, _ = _store_paths(store_dir)
+    embeddings = np.load(embeddings_path, mmap_mode='r+')
+    statuses = []
+    for row, path in zip(rows, paths):
+        embedding = extract_embedding(path)
+        if embedding is None:
+            statuses.append(FAILED)
+        else:
+            embeddings[row] = embedding
+            statuses.append(DONE)
+    embeddings.flush()
+    return rows, statuses
+
+def extract_embeddings(csv_path, audio_dir=CLEANED_AUDIO_DATA_DIR, store_dir=EMBEDDINGS_DIR,
+                       workers=None, shard_size=SHARD_SIZE, retry_failed=False):
+    """
+    Extracts YAMNet embeddings for every file of the CSV with a process pool.
+    Rows already done in the store are skipped, so an interrupted run resumes
+    where it stopped.
+
+    Args:
+        csv_path (Path): CSV with 'filename' and 'label' columns.
+        audio_dir (Path): Directory of the WAV files.
+        store_dir (Path): Embedding store (see open_store).
+        workers (int): Worker processes (defaults to the number of CPUs).
+        shard_size (int): Files per task; progress is saved after each shard.
+        retry_failed (bool): Also retry rows that failed in a previous run.
+    """
+    index = open_store(csv_path, store_dir)
+    _, status_path, _ = _store_paths(store_dir)
+    status = np.load(status_path, mmap_mode='r+')
+
+    todo_states = (PENDING, FAILED) if retry_failed else (PENDING,)
+    todo = np.flatnonzero(np.isin(status, todo_states))
+    skipped = len(index) - len(todo)
+    print(f"{len(index)} files, {skipped} already processed, {len(todo)} to extract")
+    if len(todo) == 0:
+        return
+
+    workers = workers or os.cpu_count()
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    shards = [todo[i:i + shard_size] for i in range(0, len(todo), shard_size)]
+
+    start = time.perf_counter()
+    done, failed = 0, 0
+    # 'spawn' so each worker initialises its own TensorFlow runtime
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(threads,)) as pool:
+        futures = [
+            pool.submit(_process_shard, str(store_dir), shard.tolist(),
+                        [str(Path(audio_dir) / index['filename'][row]) for row in shard])
+            for shard in shards
+        ]
+        with tqdm(total=len(todo), unit="file") as progress:
+            for future in as_completed(futures):
+                rows, statuses = future.result()
+                status[rows] = statuses
+                status.flush()
+                done += statuses.count(DONE)
+                failed += statuses.count(FAILED)
+                progress.update(len(rows))
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Extracted {done} embeddings ({failed} failed) in {elapsed:.1f}s "
+          f"- {(done + failed) / elapsed:.1f} files/s with {workers} workers")
+
+def load_embeddings(store_dir=EMBEDDINGS_DIR, mmap_mode='r'):
+    """
+    Loads the features for training without re-running YAMNet.
+
+    Returns:
+        tuple: (X, y). X is a read-only memory map of the (N, 1024) embeddings
+        (zero-copy) when every row succeeded; failed or pending rows are dropped
+        otherwise, which copies the remaining rows.
+    """
+    embeddings_path, status_path, index_path = _store_paths(store_dir)
+    X = np.load(embeddings_path, mmap_mode=mmap_mode)
+    status = np.load(status_path)
+    y = pd.read_csv(index_path)['label'].to_numpy()
+
+    done = status == DONE
+    if not done.all():
+        print(f"⚠️ {int((~done).sum())} rows without an embedding are skipped")
+        X, y = X[done], y[done]
+    return X, y
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract YAMNet embeddings in parallel into a memory-mapped store.")
+    parser.add_argument("--csv", type=Path, default=PROCESSED_AUDIO_DATA_DIR / "remaining.csv")
+    parser.add_argument("--audio-dir", type=Path, default=CLEANED_AUDIO_DATA_DIR)
+    parser.add_argument("--output", type=Path, default=EMBEDDINGS_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument("--retry-failed", action="store_true")
+    args = parser.parse_args()
+
+    extract_embeddings(args.csv, args.audio_dir, args.output, args.workers, args.shard_size, args.retry_failed)
@@ -0,0 +1,130 @@
+import argparse
+import json
+import pickle
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize_scalar
+from sklearn.model_selection import train_test_split
+from config.constants import PROCESSED_IMAGE_DATA_DIR, CLEANED_IMAGE_DATA_DIR
+from src.api.config import (
+    IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH, IMAGE_INDICES_PATH, IMAGE_TEMPERATURE_PATH,
+    AUDIO_MODEL_PATH, AUDIO_TFLITE_PATH, AUDIO_LABEL_ENCODER_PATH, AUDIO_SCALER_PATH, AUDIO_TEMPERATURE_PATH,
+    INFERENCE_BACKEND, TFLITE_NUM_THREADS
+)
+from src.api.inference import load_backend, scaler_affine, apply_temperature
+from utils.extract_embeddings import load_embeddings
+from utils.image_processing import preprocess_image
+from utils.train_utils import image_train_val_split
+
+BATCH_SIZE = 64
+ECE_BINS = 15
+TEMPERATURE_BOUNDS = (0.05, 20.0)
+
+def negative_log_likelihood(probabilities, y):
+    return float(-np.mean(np.log(np.maximum(probabilities[np.arange(len(y)), y], 1e-12))))
+
+def expected_calibration_error(probabilities, y, num_bins=ECE_BINS):
+    """
+    Gap between confidence and accuracy, averaged over equal-width confidence bins.
+    """
+    confidences = probabilities.max(axis=1)
+    correct = probabilities.argmax(axis=1) == y
+    bins = np.minimum((confidences * num_bins).astype(int), num_bins - 1)
+    ece = 0.0
+    for b in np.unique(bins):
+        in_bin = bins == b
+        ece += in_bin.mean() * abs(correct[in_bin].mean() - confidences[in_bin].mean())
+    return float(ece)
+
+def fit_temperature(probabilities, y):
+    """
+    Finds the temperature T minimizing the negative log-likelihood of
+    apply_temperature(probabilities, T) on labelled validation data.
+
+    Args:
+        probabilities (np.array): (N, num_classes) softmax outputs of the model.
+        y (np.array): True class index of each row.
+
+    Returns:
+        dict: The temperature, with NLL and ECE before and after scaling.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float32)
+    # Searched in log space: T is positive and its effect is multiplicative
+    search = minimize_scalar(
+        lambda log_t: negative_log_likelihood(apply_temperature(probabilities, np.exp(log_t)), y),
+        bounds=np.log(TEMPERATURE_BOUNDS), method="bounded"
+    )
+    temperature = float(np.exp(search.x))
+    calibrated = apply_temperature(probabilities, temperature)
+    return {
+        "temperature": temperature,
+        "samples": len(y),
+        "backend": INFERENCE_BACKEND,
+        "nll_before": negative_log_likelihood(probabilities, y),
+        "nll_after": negative_log_likelihood(calibrated, y),
+        "ece_before": expected_calibration_error(probabilities, y),
+        "ece_after": expected_calibration_error(calibrated, y),
+    }
+
+def predict_in_batches(backend, inputs):
+    return np.concatenate([backend.predict(inputs[i:i + BATCH_SIZE]) for i in range(0, len(inputs), BATCH_SIZE)])
+
+def image_validation_frame(csv_path=PROCESSED_IMAGE_DATA_DIR / "instruments.csv"):
+    # The rows held out when the model was trained. The "valid_" prefix of
+    # utils/generate_image_csv.py is not used: training splits the whole CSV.
+    _, val_df = image_train_val_split(pd.read_csv(csv_path))
+    return val_df
+
+def image_validation_probabilities():
+    df = image_validation_frame()
+
+    with open(IMAGE_INDICES_PATH, 'rb') as f:
+        class_indices = pickle.load(f)
+
+    images, y = [], []
+    for filename, label in zip(df['filename'], df['label']):
+        img = preprocess_image(CLEANED_IMAGE_DATA_DIR / filename)
+        if img is not None and label in class_indices:
+            images.append(img[0])
+            y.append(class_indices[label])
+
+    backend = load_backend(INFERENCE_BACKEND, IMAGE_MODEL_PATH, IMAGE_TFLITE_PATH, TFLITE_NUM_THREADS)
+    return predict_in_batches(backend, np.stack(images).astype(np.float32)), np.array(y)
+
+def audio_validation_probabilities():
+    with open(AUDIO_LABEL_ENCODER_PATH, 'rb') as f:
+        label_encoder = pickle.load(f)
+    with open(AUDIO_SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+
+    # Same 80/10/10 split as src/audio/02_Model_Training.ipynb
+    X, y = load_embeddings()
+    y_encoded = label_encoder.transform(y)
+    _, X_temp, _, y_temp = train_test_split(X, y_encoded, test_size=0.2, random_state=42)
+    X_val, _, y_val, _ = train_test_split(X_temp, y_temp, test_size=0.5, random_state=42)
+
+    backend = load_backend(INFERENCE_BACKEND, AUDIO_MODEL_PATH, AUDIO_TFLITE_PATH, TFLITE_NUM_THREADS,
+                           input_affine=scaler_affine(scaler))
+    return predict_in_batches(backend, np.asarray(X_val, dtype=np.float32)), y_val
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit softmax temperatures on the validation splits.")
+    parser.add_argument("--model", choices=["image", "audio", "all"], default="all")
+    args = parser.parse_args()
+
+    models = {
+        "image": (image_validation_probabilities, IMAGE_TEMPERATURE_PATH),
+        "audio": (audio_validation_probabilities, AUDIO_TEMPERATURE_PATH),
+    }
+    names = list(models) if args.model == "all" else [args.model]
+    for name in names:
+        load_validation, output_path = models[name]
+        report = fit_temperature(*load_validation())
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n{name.capitalize()} model ({report['samples']} validation samples, {report['backend']} backend)")
+        print(f"  Temperature:  {report['temperature']:.3f}")
+        print(f"  NLL:          {report['nll_before']:.4f} -> {report['nll_after']:.4f}")
+        print(f"  ECE:          {report['ece_before']:.4f} -> {report['ece_after']:.4f}")
+        print(f"✅ Saved to {output_path} (restart the API to apply it)")
@@ -1,13 +1,74 @@
+import argparse
+import hashlib
 import os
 import shutil
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
-from pathlib import Path
 from config.constants import RAW_IMAGE_DATA_DIR, PROCESSED_IMAGE_DATA_DIR
 
-def generate_image_csv():
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+IO_WORKERS = 16
+FICLONE = 0x40049409  # Linux ioctl: copy-on-write clone (reflink) on btrfs/XFS
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    except OSError:
+        return None
+
+def link_or_copy(src_path, dst_path, allow_link=True):
+    """
+    Places src at dst without duplicating bytes when the filesystem allows it:
+    hardlink, then reflink, then a regular copy. An existing dst is replaced.
+
+    Returns:
+        str: "hardlink", "reflink" or "copy".
+    """
+    if os.path.lexists(dst_path):
+        os.remove(dst_path)
+
+    if allow_link:
+        try:
+            os.link(src_path, dst_path)
+            return "hardlink"
+        except OSError:
+            pass
+
+        if fcntl is not None:
+            try:
+                with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(src_path, dst_path)
+                return "reflink"
+            except OSError:
+                if os.path.exists(dst_path):
+                    os.remove(dst_path)
+
+    shutil.copy2(src_path, dst_path)
+    return "copy"
+
+def generate_image_csv(workers=IO_WORKERS, allow_link=True):
     """
     Merges train/test/valid folders into a single directory and generates a master CSV.
+
+    Files are hardlinked (or reflinked) instead of copied when possible, with
+    parallel I/O. Byte-identical images are kept once, even across splits, so
+    the same picture cannot land on both sides of a train/validation split.
+    Content hashes are cached in a manifest, so reruns only hash and link new
+    or changed files.
     """
     # Source CSV
     RAW_CSV_PATH = RAW_IMAGE_DATA_DIR / "instruments.csv"
@@ -15,6 +76,7 @@ def generate_image_csv():
     # Destination Directory
     CLEAN_IMAGE_DIR = PROCESSED_IMAGE_DATA_DIR / "clean"
     PROCESSED_CSV_PATH = PROCESSED_IMAGE_DATA_DIR / "instruments.csv"
+    MANIFEST_PATH = PROCESSED_IMAGE_DATA_DIR / "manifest.csv"
 
     print(f"Raw Data Directory: {RAW_IMAGE_DATA_DIR}")
     print(f"Clean Data Directory: {CLEAN_IMAGE_DIR}")
@@ -34,50 +96,70 @@ def generate_image_csv():
     df_raw = pd.read_csv(RAW_CSV_PATH)
     print(f"Total files in raw CSV: {len(df_raw)}")
 
-    # Lists to store new metadata
-    new_filenames = []
-    new_labels = []
-
-    print("Merging files...")
-    for index, row in tqdm(df_raw.iterrows(), total=df_raw.shape[0]):
-        # Original path components
-        relative_path = row['filepaths'] # e.g., train/acordian/001.jpg
-        label = row['labels']
-        dataset_split = row['data set'] # train, test, or valid
-        
-        # Construct full source path
-        src_path = RAW_IMAGE_DATA_DIR / relative_path
-        
-        # Construct new unique filename
-        # e.g., train_acordian_001.jpg
-        original_filename = os.path.basename(relative_path)
-        new_filename = f"{dataset_split}_{label}_{original_filename}"
-        
-        # Construct full destination path
-        dst_path = CLEAN_IMAGE_DIR / new_filename
-        
-        # Copy file
-        if os.path.exists(src_path):
-            if not os.path.exists(dst_path):
-                shutil.copy2(src_path, dst_path)
-            
-            # Add to lists
-            new_filenames.append(new_filename)
-            new_labels.append(label)
-        else:
-            # print(f"Warning: Source file not found: {src_path}")
-            pass
-
-    # Create new DataFrame
-    df_clean = pd.DataFrame({
-        'filename': new_filenames,
-        'label': new_labels
+    # 1. Build source paths and unique names for every row at once
+    # e.g., train/acordian/001.jpg -> train_acordian_001.jpg
+    df = pd.DataFrame({
+        'source': df_raw['filepaths'],
+        'label': df_raw['labels'],
     })
+    basenames = df['source'].str.replace('\\', '/', regex=False).str.split('/').str[-1]
+    df['filename'] = df_raw['data set'] + '_' + df['label'] + '_' + basenames
+    src_paths = [str(RAW_IMAGE_DATA_DIR / source) for source in df['source']]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # 2. Stat every source file (missing files are dropped)
+        stats = list(pool.map(_stat, src_paths))
+        found = [stat is not None for stat in stats]
+        df = df[found].copy()
+        src_paths = [path for path, ok in zip(src_paths, found) if ok]
+        df['size'] = [stat[0] for stat in stats if stat is not None]
+        df['mtime_ns'] = [stat[1] for stat in stats if stat is not None]
+        print(f"Source files found: {len(df)}")
+
+        # 3. Hash only files that are new or changed since the last run
+        df['sha256'] = None
+        if MANIFEST_PATH.exists():
+            # A source listed twice in the raw CSV is also listed twice in the manifest
+            manifest = pd.read_csv(MANIFEST_PATH).drop_duplicates('source', keep='last').set_index('source')
+            known = df['source'].map(manifest['sha256'])
+            unchanged = (df['size'] == df['source'].map(manifest['size'])) & \
+                        (df['mtime_ns'] == df['source'].map(manifest['mtime_ns']))
+            df.loc[unchanged, 'sha256'] = known[unchanged]
 
-    # Save to CSV
+        to_hash = df['sha256'].isna().to_numpy()
+        print(f"Hashing {int(to_hash.sum())} new or changed files...")
+        paths_to_hash = [path for path, todo in zip(src_paths, to_hash) if todo]
+        df.loc[to_hash, 'sha256'] = list(tqdm(pool.map(file_sha256, paths_to_hash), total=len(paths_to_hash)))
+
+        # 4. Keep the first occurrence of every distinct image
+        duplicates = df.duplicated('sha256', keep='first')
+        conflicts = int((df.groupby('sha256')['label'].nunique() > 1).sum())
+        df_unique = df[~duplicates]
+        unique_src_paths = [path for path, dup in zip(src_paths, duplicates) if not dup]
+        print(f"Duplicate images removed: {int(duplicates.sum())} ({conflicts} with conflicting labels)")
+
+        # 5. Link the files that are not in the clean directory yet, or whose source changed
+        existing = set(os.listdir(CLEAN_IMAGE_DIR))
+        todo = ~df_unique['filename'].isin(existing).to_numpy() | to_hash[~duplicates.to_numpy()]
+        jobs = [(src, CLEAN_IMAGE_DIR / name)
+                for src, name, pending in zip(unique_src_paths, df_unique['filename'], todo) if pending]
+        print(f"Merging {len(jobs)} new files...")
+        methods = list(tqdm(pool.map(lambda job: link_or_copy(*job, allow_link=allow_link), jobs), total=len(jobs)))
+
+    # 6. Save the manifest and the master CSV
+    df[['source', 'size', 'mtime_ns', 'sha256']].to_csv(MANIFEST_PATH, index=False)
+    df_clean = df_unique[['filename', 'label']]
     df_clean.to_csv(PROCESSED_CSV_PATH, index=False)
+
+    if methods:
+        print(pd.Series(methods).value_counts().to_string())
     print(f"\nSuccessfully processed {len(df_clean)} images.")
     print(f"Saved master CSV to: {PROCESSED_CSV_PATH}")
 
 if __name__ == "__main__":
-    generate_image_csv()
+    parser = argparse.ArgumentParser(description="Merge the raw image splits into one deduplicated directory.")
+    parser.add_argument("--workers", type=int, default=IO_WORKERS)
+    parser.add_argument("--copy", action="store_true", help="Always copy files instead of hardlinking them")
+    args = parser.parse_args()
+
+    generate_image_csv(args.workers, allow_link=not args.copy)
@@ -0,0 +1,169 @@
+import argparse
+import pickle
+import time
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tensorflow.keras.callbacks import EarlyStopping
+from tqdm import tqdm
+from config.constants import PROCESSED_IMAGE_DATA_DIR, CLEANED_IMAGE_DATA_DIR, IMAGE_MODELS_DIR
+from utils.image_processing import load_image_into
+from utils.model_builder import (
+    RESNET50_FEATURE_DIM, build_resnet50_feature_extractor,
+    build_classifier_head, merge_head_into_resnet50
+)
+from utils.train_utils import calculate_class_weights, image_split_indices
+
+FEATURES_DIR = PROCESSED_IMAGE_DATA_DIR / "resnet50_features"
+# Trained models land next to the served ones, never over them unless asked
+CANDIDATE_MODELS_DIR = IMAGE_MODELS_DIR / "candidate"
+MODEL_FILENAME = 'resnet50_instrument_classifier.keras'
+INDICES_FILENAME = 'image_class_indices.pkl'
+BATCH_SIZE = 64
+DECODE_THREADS = 8
+
+# Row status in status.npy
+PENDING, DONE, FAILED = 0, 1, 2
+
+def _store_paths(store_dir):
+    store_dir = Path(store_dir)
+    return store_dir / "features.npy", store_dir / "status.npy", store_dir / "index.csv"
+
+def extract_image_features(csv_path=PROCESSED_IMAGE_DATA_DIR / "instruments.csv", image_dir=CLEANED_IMAGE_DATA_DIR,
+                           store_dir=FEATURES_DIR, batch_size=BATCH_SIZE):
+    """
+    Runs the frozen ResNet50 base once over the cleaned image set and stores the
+    pooled 2048-d features in a memory-mapped array (row i = CSV row i).
+    Batches already stored are skipped when the run is restarted.
+
+    Args:
+        csv_path (Path): CSV with 'filename' and 'label' columns (utils/generate_image_csv.py).
+        image_dir (Path): Directory of the images.
+        store_dir (Path): Output directory (features.npy, status.npy, index.csv).
+        batch_size (int): Images per forward pass.
+    """
+    features_path, status_path, index_path = _store_paths(store_dir)
+    df = pd.read_csv(csv_path)[['filename', 'label']].reset_index(drop=True)
+
+    if not index_path.exists():
+        Path(store_dir).mkdir(parents=True, exist_ok=True)
+        np.lib.format.open_memmap(features_path, mode='w+', dtype=np.float32, shape=(len(df), RESNET50_FEATURE_DIM)).flush()
+        np.save(status_path, np.zeros(len(df), dtype=np.uint8))
+        df.to_csv(index_path, index=False)
+    elif not pd.read_csv(index_path)['filename'].equals(df['filename']):
+        raise ValueError(f"{store_dir} was built from another CSV, use a new output directory")
+
+    features = np.load(features_path, mmap_mode='r+')
+    status = np.load(status_path, mmap_mode='r+')
+    todo = np.flatnonzero(status == PENDING)
+    print(f"{len(df)} images, {len(df) - len(todo)} already cached, {len(todo)} to extract")
+    if len(todo) == 0:
+        return
+
+    extractor = build_resnet50_feature_extractor()
+    extract = tf.function(lambda images: extractor(images, training=False))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=DECODE_THREADS) as pool:
+        for i in tqdm(range(0, len(todo), batch_size), unit="batch"):
+            rows = todo[i:i + batch_size]
+            # Images are decoded straight into their row of the batch
+            batch = np.empty((len(rows), 224, 224, 3), dtype=np.float32)
+            loaded = np.array(list(pool.map(
+                load_image_into, [Path(image_dir) / df['filename'][row] for row in rows], batch
+            )))
+
+            if loaded.any():
+                features[rows[loaded]] = extract(tf.constant(batch[loaded])).numpy()
+                features.flush()
+            status[rows] = np.where(loaded, DONE, FAILED)
+            status.flush()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Cached features of {int((status == DONE).sum())} images in {elapsed:.1f}s "
+          f"({len(todo) / elapsed:.1f} images/s) to {store_dir}")
+
+def load_image_features(store_dir=FEATURES_DIR, mmap_mode='r'):
+    """
+    Returns (X, labels). X is a read-only memory map of the (N, 2048) features
+    when every image was cached; failed rows are dropped otherwise.
+    """
+    features_path, status_path, index_path = _store_paths(store_dir)
+    X = np.load(features_path, mmap_mode=mmap_mode)
+    status = np.load(status_path)
+    labels = pd.read_csv(index_path)['label'].to_numpy()
+
+    done = status == DONE
+    if not done.all():
+        print(f"⚠️ {int((~done).sum())} images without features are skipped")
+        X, labels = X[done], labels[done]
+    return X, labels
+
+def train_head(store_dir=FEATURES_DIR, epochs=100, batch_size=256, output_dir=CANDIDATE_MODELS_DIR,
+               overwrite=False):
+    """
+    Trains the Dense head on the cached features, merges it into the full
+    ResNet50 model and saves it with its class indices in the API's format.
+
+    The model is written to models/image/candidate by default; copy it into
+    models/image (or pass that as `output_dir` with `overwrite`) to serve it.
+    Existing model files are only replaced when `overwrite` is set.
+    """
+    output_dir = Path(output_dir)
+    existing = [output_dir / name for name in (MODEL_FILENAME, INDICES_FILENAME) if (output_dir / name).exists()]
+    if existing and not overwrite:
+        raise FileExistsError(f"{existing[0]} already exists, pass --overwrite or use another --output directory")
+
+    X, labels = load_image_features(store_dir)
+
+    # Same class order and split as flow_from_dataframe in src/image/02_Model_Training.ipynb
+    class_indices = {label: i for i, label in enumerate(sorted(set(labels)))}
+    y = np.array([class_indices[label] for label in labels])
+    train_idx, val_idx = image_split_indices(labels)
+
+    num_classes = len(class_indices)
+    y_cat = tf.keras.utils.to_categorical(y, num_classes)
+
+    head = build_classifier_head(num_classes)
+    head.fit(
+        X[train_idx], y_cat[train_idx],
+        epochs=epochs,
+        batch_size=batch_size,
+        validation_data=(X[val_idx], y_cat[val_idx]),
+        class_weight=calculate_class_weights(y[train_idx]),
+        callbacks=[EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True)],
+        verbose=2
+    )
+
+    model = merge_head_into_resnet50(head)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model_path = output_dir / MODEL_FILENAME
+    model.save(model_path)
+    with open(output_dir / INDICES_FILENAME, 'wb') as f:
+        pickle.dump(class_indices, f)
+    print(f"✅ Model saved to: {model_path}")
+    return model
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the image head on cached ResNet50 features.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract_parser = subparsers.add_parser("extract", help="Cache the pooled ResNet50 features")
+    extract_parser.add_argument("--csv", type=Path, default=PROCESSED_IMAGE_DATA_DIR / "instruments.csv")
+    extract_parser.add_argument("--image-dir", type=Path, default=CLEANED_IMAGE_DATA_DIR)
+    extract_parser.add_argument("--output", type=Path, default=FEATURES_DIR)
+    extract_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    train_parser = subparsers.add_parser("train", help="Train the head and save the merged .keras model")
+    train_parser.add_argument("--features", type=Path, default=FEATURES_DIR)
+    train_parser.add_argument("--epochs", type=int, default=100)
+    train_parser.add_argument("--output", type=Path, default=CANDIDATE_MODELS_DIR)
+    train_parser.add_argument("--overwrite", action="store_true", help="Replace an existing model in --output")
+
+    args = parser.parse_args()
+    if args.command == "extract":
+        extract_image_features(args.csv, args.image_dir, args.output, args.batch_size)
+    else:
+        train_head(args.features, args.epochs, output_dir=args.output, overwrite=args.overwrite)
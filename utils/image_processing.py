@@ -1,37 +1,88 @@
 import tensorflow as tf
 import numpy as np
-from tensorflow.keras.preprocessing import image
+from pathlib import Path
+from PIL import Image
+from tensorflow.keras import layers
 from tensorflow.keras.applications.resnet50 import preprocess_input
 
-def preprocess_image(image_path, target_size=(224, 224)):
+SHUFFLE_BUFFER = 1024
+
+# ResNet50 'caffe' preprocessing: BGR channel order minus the ImageNet mean
+CAFFE_MEAN_BGR = np.array([103.939, 116.779, 123.68], dtype=np.float32)
+
+def decode_image(image_path, target_size=(224, 224), draft=False):
+    """
+    Decodes an image to an RGB PIL image of the target size, like `load_img`.
+
+    With `draft`, JPEGs are decoded by libjpeg at a reduced scale (1/2, 1/4 or
+    1/8, the smallest one still at least as large as the target), so most of
+    the pixels of a large photo are never decoded. This is not pixel-identical
+    to a full decode (the mean absolute difference grows with the photo size),
+    so it is off by default; images smaller than twice the target, and other
+    formats, are decoded exactly as before.
+
+    Args:
+        image_path (str, Path or file-like): Image to decode.
+        target_size (tuple): Target size (height, width).
+        draft (bool): Allow reduced-size JPEG decoding (approximate).
+
+    Returns:
+        PIL.Image.Image: RGB image of the target size.
+    """
+    width_height = (target_size[1], target_size[0])
+    img = Image.open(image_path)
+    if draft and img.format == "JPEG":
+        img.draft("RGB", width_height)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    if img.size != width_height:
+        # Nearest neighbour, the load_img default
+        img = img.resize(width_height, Image.NEAREST)
+    return img
+
+def load_image_into(image_path, out, draft=False):
+    """
+    Decodes an image and writes its ResNet50-preprocessed pixels into `out`,
+    e.g. one row of a preallocated batch. The BGR flip, the float32 cast and
+    the mean subtraction run as a single NumPy pass with no temporary arrays.
+
+    Args:
+        image_path (str, Path or file-like): Image to decode.
+        out (np.array): float32 buffer of shape (height, width, 3).
+        draft (bool): Allow reduced-size JPEG decoding (see decode_image).
+
+    Returns:
+        bool: False if the image could not be decoded.
+    """
+    try:
+        img = decode_image(image_path, out.shape[:2], draft)
+        np.subtract(np.asarray(img)[..., ::-1], CAFFE_MEAN_BGR, out=out, dtype=np.float32)
+        return True
+    except Exception as e:
+        print(f"Error processing image {image_path}: {e}")
+        return False
+
+def preprocess_image(image_path, target_size=(224, 224), draft=False):
     """
     Loads an image, resizes it, and applies ResNet50 preprocessing.
     This function is suitable for single image prediction (deployment).
-    
+
+    Same output as `preprocess_input(img_to_array(load_img(...)))`. With `draft`,
+    large JPEGs are decoded at a reduced scale first, which is faster but only
+    approximately equal (see decode_image).
+
     Args:
         image_path (str or Path): Path to the image file.
         target_size (tuple): Target size (height, width).
-        
+        draft (bool): Allow reduced-size JPEG decoding.
+
     Returns:
         np.array: Preprocessed image tensor with batch dimension (1, 224, 224, 3).
     """
-    try:
-        # Load image
-        img = image.load_img(image_path, target_size=target_size)
-        
-        # Convert to array
-        img_array = image.img_to_array(img)
-        
-        # Expand dimensions to match batch shape (1, 224, 224, 3)
-        img_array = np.expand_dims(img_array, axis=0)
-        
-        # Apply ResNet50 preprocessing (zero-centering, etc.)
-        img_preprocessed = preprocess_input(img_array)
-        
-        return img_preprocessed
-    except Exception as e:
-        print(f"Error processing image {image_path}: {e}")
+    img_preprocessed = np.empty((1, *target_size, 3), dtype=np.float32)
+    if not load_image_into(image_path, img_preprocessed[0], draft):
         return None
+    return img_preprocessed
 
 def get_image_generator(preprocessing_function=preprocess_input, validation_split=None):
     """
@@ -41,3 +92,173 @@ def get_image_generator(preprocessing_function=preprocess_input, validation_spli
         preprocessing_function=preprocessing_function,
         validation_split=validation_split
     )
+
+def _pil_nearest_indices(in_size, out_size):
+    """
+    Source indices PIL's NEAREST resize samples along one axis. PIL starts at
+    half a step and adds the step once per output pixel, in float64; the
+    rounding of that running sum decides ties, so it is reproduced exactly
+    with a cumulative sum rather than computed as (i + 0.5) * step.
+    """
+    step = tf.cast(in_size, tf.float64) / out_size
+    steps = tf.concat([[step * 0.5], tf.fill([out_size - 1], step)], axis=0)
+    return tf.cast(tf.floor(tf.math.cumsum(steps)), tf.int32)
+
+def _resize_nearest(img, size):
+    """
+    Nearest-neighbour resize as a row/column gather, picking the same source
+    pixels as PIL (and so load_img). Much cheaper than tf.image.resize for uint8 images.
+    """
+    shape = tf.shape(img)
+    rows = _pil_nearest_indices(shape[0], size[0])
+    cols = _pil_nearest_indices(shape[1], size[1])
+    return tf.gather(tf.gather(img, rows, axis=0), cols, axis=1)
+
+def _augmentation():
+    return tf.keras.Sequential([
+        layers.RandomFlip("horizontal"),
+        layers.RandomRotation(0.05),
+        layers.RandomZoom(0.1),
+    ])
+
+def get_image_dataset(dataframe, directory, x_col="filename", y_col="label", target_size=(224, 224),
+                      batch_size=32, class_mode="categorical", shuffle=True, seed=None,
+                      preprocessing_function=preprocess_input, augment=False, cache=None):
+    """
+    tf.data replacement for `get_image_generator().flow_from_dataframe(...)`.
+    Decoding and resizing run in parallel in the TensorFlow runtime instead of
+    in a single Python thread, and batches are prefetched while the model trains.
+
+    The returned dataset also has the generator attributes the notebooks use:
+    `class_indices`, `classes` and `samples`.
+
+    Args:
+        dataframe (pd.DataFrame): Rows with the image filename and label.
+        directory (str or Path): Directory of the images.
+        x_col (str): Column with the filenames.
+        y_col (str): Column with the labels.
+        target_size (tuple): Target size (height, width).
+        batch_size (int): Images per batch.
+        class_mode (str): "categorical" (one-hot), "sparse" (class index) or None (images only).
+        shuffle (bool): Reshuffle the images every epoch.
+        seed (int): Shuffling seed.
+        preprocessing_function (callable): Applied to each batch (ResNet50 preprocessing by default).
+        augment (bool): Random flips, rotations and zooms (use for training only).
+        cache (str or Path): File to cache the decoded, resized images in after the
+            first epoch ("" caches in memory, None disables caching).
+
+    Returns:
+        tf.data.Dataset: Batches of (images, labels), or images when class_mode is None.
+    """
+    if class_mode not in ("categorical", "sparse", None):
+        raise ValueError(f"Unsupported class_mode: {class_mode}")
+
+    class_indices = {label: i for i, label in enumerate(sorted(dataframe[y_col].unique()))}
+    classes = dataframe[y_col].map(class_indices).to_numpy()
+    paths = [str(Path(directory) / filename) for filename in dataframe[x_col]]
+
+    dataset = tf.data.Dataset.from_tensor_slices((paths, classes))
+    if shuffle:
+        # Shuffling filenames is free: the whole epoch is reshuffled. A cache
+        # replays its first epoch, so the order is only drawn once before it
+        # (the CSV is sorted by label) and mixed again in a buffer after it
+        dataset = dataset.shuffle(len(paths), seed=seed, reshuffle_each_iteration=cache is None)
+    dataset = dataset.map(lambda path, label: (tf.io.read_file(path), label),
+                          num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+
+    dataset = _decode_and_batch(
+        dataset, len(class_indices), target_size, batch_size, class_mode, shuffle, seed,
+        preprocessing_function, augment, cache, all_jpeg=_all_jpeg(paths)
+    )
+    dataset.class_indices = class_indices
+    dataset.classes = classes
+    dataset.samples = len(paths)
+    return dataset
+
+def get_shard_dataset(shard_dir, target_size=(224, 224), batch_size=32, class_mode="categorical", shuffle=True,
+                      seed=None, preprocessing_function=preprocess_input, augment=False, cache=None):
+    """
+    Same as get_image_dataset, but reads the images packed by utils/image_shards.py.
+    Shards are read sequentially (in a new shard order every epoch when shuffling)
+    and records are mixed in a shuffle buffer, so the disk sees large sequential reads.
+
+    Returns:
+        tf.data.Dataset: Batches of (images, labels), with `class_indices`, `classes` and `samples`.
+    """
+    from utils.image_shards import ImageShardReader
+
+    if class_mode not in ("categorical", "sparse", None):
+        raise ValueError(f"Unsupported class_mode: {class_mode}")
+
+    reader = ImageShardReader(shard_dir)
+    class_indices = {label: i for i, label in enumerate(sorted(reader.index['label'].unique()))}
+    classes = reader.index['label'].map(class_indices).to_numpy()
+    rng = np.random.default_rng(seed)
+
+    def records():
+        for row, contents in reader.iter_records(shuffle_shards=shuffle and cache is None, rng=rng):
+            yield contents, classes[row]
+
+    dataset = tf.data.Dataset.from_generator(records, output_signature=(
+        tf.TensorSpec(shape=(), dtype=tf.string),
+        tf.TensorSpec(shape=(), dtype=tf.int64),
+    ))
+    if shuffle and cache is None:
+        dataset = dataset.shuffle(SHUFFLE_BUFFER, seed=seed, reshuffle_each_iteration=True)
+
+    dataset = _decode_and_batch(
+        dataset, len(class_indices), target_size, batch_size, class_mode, shuffle, seed,
+        preprocessing_function, augment, cache, all_jpeg=_all_jpeg(reader.index['filename'])
+    )
+    dataset.class_indices = class_indices
+    dataset.classes = classes
+    dataset.samples = len(reader)
+    return dataset
+
+def _all_jpeg(filenames):
+    # decode_jpeg skips decode_image's per-file format dispatch
+    return all(Path(filename).suffix.lower() in (".jpg", ".jpeg") for filename in filenames)
+
+def _decode_jpeg(contents):
+    return tf.io.decode_jpeg(contents, channels=3, dct_method="INTEGER_ACCURATE")
+
+def _decode_and_batch(dataset, num_classes, target_size, batch_size, class_mode, shuffle, seed,
+                      preprocessing_function, augment, cache, all_jpeg):
+    """
+    Turns a dataset of (encoded image bytes, class index) into prefetched model batches.
+    """
+    def decode(contents, label):
+        # Same behaviour as load_img: RGB, nearest-neighbour resize. JPEGs use
+        # the accurate integer IDCT, like PIL; TF's default one is off by a few levels
+        if all_jpeg:
+            img = _decode_jpeg(contents)
+        else:
+            img = tf.cond(
+                tf.io.is_jpeg(contents),
+                lambda: _decode_jpeg(contents),
+                lambda: tf.io.decode_image(contents, channels=3, expand_animations=False)
+            )
+        return _resize_nearest(img, target_size), label
+
+    dataset = dataset.map(decode, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+    if cache is not None:
+        dataset = dataset.cache(str(cache))
+        if shuffle:
+            dataset = dataset.shuffle(SHUFFLE_BUFFER, seed=seed, reshuffle_each_iteration=True)
+
+    dataset = dataset.batch(batch_size)
+    augmentation = _augmentation() if augment else None
+
+    def prepare(images, labels):
+        images = tf.cast(images, tf.float32)
+        if augmentation is not None:
+            images = augmentation(images, training=True)
+        if preprocessing_function is not None:
+            images = preprocessing_function(images)
+        if class_mode is None:
+            return images
+        if class_mode == "categorical":
+            labels = tf.one_hot(labels, num_classes)
+        return images, labels
+
+    return dataset.map(prepare, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,153 @@
+import argparse
+import mmap
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tqdm import tqdm
+from config.constants import PROCESSED_IMAGE_DATA_DIR, CLEANED_IMAGE_DATA_DIR
+
+SHARDS_DIR = PROCESSED_IMAGE_DATA_DIR / "shards"
+SHARD_SIZE_MB = 256
+READ_THREADS = 16
+
+def _read_bytes(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError as e:
+        print(f"Error reading image {path}: {e}")
+        return None
+
+def pack_images(csv_path=PROCESSED_IMAGE_DATA_DIR / "instruments.csv", image_dir=CLEANED_IMAGE_DATA_DIR,
+                output_dir=SHARDS_DIR, shard_size_mb=SHARD_SIZE_MB, shuffle=True, seed=42):
+    """
+    Packs the cleaned images into a few large shard files.
+
+    Each shard is the plain concatenation of the encoded image files; index.csv
+    gives the filename, label, shard, byte offset and length of every image, so
+    any record can be read with one slice of a memory-mapped shard.
+
+    Args:
+        csv_path (Path): CSV with 'filename' and 'label' columns.
+        image_dir (Path): Directory of the images.
+        output_dir (Path): Where the shards and index.csv are written.
+        shard_size_mb (int): Target shard size.
+        shuffle (bool): Pack in random order, so sequential reads are already mixed across classes.
+        seed (int): Packing order seed.
+    """
+    df = pd.read_csv(csv_path)[['filename', 'label']]
+    if shuffle:
+        df = df.sample(frac=1, random_state=seed)
+    df = df.reset_index(drop=True)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for old_shard in output_dir.glob("images-*.shard"):
+        old_shard.unlink()
+
+    shard_bytes = shard_size_mb * 1024 * 1024
+    kept, shards, offsets, lengths = [], [], [], []
+    shard_id, offset, out = 0, 0, None
+
+    start = time.perf_counter()
+    paths = [Path(image_dir) / filename for filename in df['filename']]
+    try:
+        with ThreadPoolExecutor(max_workers=READ_THREADS) as pool:
+            # Files are read in parallel but written in order
+            for row, contents in enumerate(tqdm(pool.map(_read_bytes, paths), total=len(paths), unit="image")):
+                if contents is None:
+                    continue
+                if out is None or offset >= shard_bytes:
+                    if out is not None:
+                        out.close()
+                        shard_id += 1
+                    out = open(output_dir / f"images-{shard_id:05d}.shard", 'wb')
+                    offset = 0
+                out.write(contents)
+                kept.append(row)
+                shards.append(shard_id)
+                offsets.append(offset)
+                lengths.append(len(contents))
+                offset += len(contents)
+    finally:
+        if out is not None:
+            out.close()
+
+    df = df.iloc[kept].reset_index(drop=True)
+    df['shard'] = shards
+    df['offset'] = offsets
+    df['length'] = lengths
+    df.to_csv(output_dir / "index.csv", index=False)
+
+    total_mb = sum(lengths) / 1e6
+    elapsed = time.perf_counter() - start
+    print(f"✅ Packed {len(df)} images ({total_mb:.0f} MB) into {shard_id + 1} shards in {elapsed:.1f}s")
+    print(f"Index saved to: {output_dir / 'index.csv'}")
+
+class ImageShardReader:
+    """
+    Reads images packed by pack_images through memory-mapped shards.
+    Records come back as (row, encoded bytes); `index` holds filename/label per row.
+    """
+
+    def __init__(self, shard_dir=SHARDS_DIR):
+        self.shard_dir = Path(shard_dir)
+        self.index = pd.read_csv(self.shard_dir / "index.csv")
+        self._shard = self.index['shard'].to_numpy()
+        self._offset = self.index['offset'].to_numpy()
+        self._length = self.index['length'].to_numpy()
+        self._maps = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def _map(self, shard_id):
+        shard = self._maps.get(shard_id)
+        if shard is None:
+            with open(self.shard_dir / f"images-{shard_id:05d}.shard", 'rb') as f:
+                shard = self._maps[shard_id] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # Records of a shard are mostly read front to back
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                shard.madvise(mmap.MADV_SEQUENTIAL)
+        return shard
+
+    def __getitem__(self, row):
+        start = self._offset[row]
+        return self._map(self._shard[row])[start:start + self._length[row]]
+
+    def iter_records(self, shuffle_shards=False, rng=None):
+        """
+        Yields (row, bytes) shard by shard, in file order within each shard.
+        """
+        shard_ids = np.unique(self._shard)
+        if shuffle_shards:
+            shard_ids = (rng or np.random.default_rng()).permutation(shard_ids)
+        for shard_id in shard_ids:
+            for row in np.flatnonzero(self._shard == shard_id):
+                yield row, self[row]
+
+    def sample(self, n, seed=None):
+        """
+        Returns n random records as (rows, list of bytes), read in file order.
+        """
+        rows = np.random.default_rng(seed).choice(len(self), size=min(n, len(self)), replace=False)
+        rows = rows[np.lexsort((self._offset[rows], self._shard[rows]))]
+        return rows, [self[row] for row in rows]
+
+    def close(self):
+        for shard in self._maps.values():
+            shard.close()
+        self._maps = {}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the cleaned images into large shard files.")
+    parser.add_argument("--csv", type=Path, default=PROCESSED_IMAGE_DATA_DIR / "instruments.csv")
+    parser.add_argument("--image-dir", type=Path, default=CLEANED_IMAGE_DATA_DIR)
+    parser.add_argument("--output", type=Path, default=SHARDS_DIR)
+    parser.add_argument("--shard-size-mb", type=int, default=SHARD_SIZE_MB)
+    parser.add_argument("--no-shuffle", action="store_true", help="Keep the CSV order")
+    args = parser.parse_args()
+
+    pack_images(args.csv, args.image_dir, args.output, args.shard_size_mb, shuffle=not args.no_shuffle)
@@ -2,6 +2,15 @@ import tensorflow as tf
 from tensorflow.keras.applications import ResNet50
 from tensorflow.keras import layers, models, optimizers
 
+RESNET50_FEATURE_DIM = 2048
+
+def _head_layers(num_classes):
+    return [
+        layers.Dense(512, activation='relu'),
+        layers.Dropout(0.2), # Regularization to prevent overfitting
+        layers.Dense(num_classes, activation='softmax')
+    ]
+
 def build_resnet50_model(num_classes, input_shape=(224, 224, 3)):
     """
     Builds a transfer learning model using ResNet50 as the base.
@@ -29,9 +38,7 @@ def build_resnet50_model(num_classes, input_shape=(224, 224, 3)):
     model = models.Sequential([
         base_model,
         layers.GlobalAveragePooling2D(),
-        layers.Dense(512, activation='relu'),
-        layers.Dropout(0.2), # Regularization to prevent overfitting
-        layers.Dense(num_classes, activation='softmax')
+        *_head_layers(num_classes)
     ])
     
     # 4. Compile the model
@@ -42,3 +49,57 @@ def build_resnet50_model(num_classes, input_shape=(224, 224, 3)):
     )
     
     return model
+
+def build_resnet50_feature_extractor(input_shape=(224, 224, 3)):
+    """
+    Builds the frozen part of build_resnet50_model: the ResNet50 base followed by
+    global average pooling, returning one 2048-d feature vector per image.
+    """
+    return ResNet50(
+        weights='imagenet',
+        include_top=False,
+        input_shape=input_shape,
+        pooling='avg'
+    )
+
+def build_classifier_head(num_classes, input_dim=RESNET50_FEATURE_DIM):
+    """
+    Builds the trainable head of build_resnet50_model on its own, so it can be
+    trained on cached ResNet50 features.
+
+    Args:
+        num_classes (int): Number of output classes.
+        input_dim (int): Size of the pooled features.
+
+    Returns:
+        tf.keras.Model: Compiled Keras model.
+    """
+    model = models.Sequential([layers.Input(shape=(input_dim,)), *_head_layers(num_classes)])
+    model.compile(
+        optimizer=optimizers.Adam(learning_rate=0.001),
+        loss='categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    return model
+
+def merge_head_into_resnet50(head, input_shape=(224, 224, 3)):
+    """
+    Copies the weights of a head trained on cached features into a full
+    build_resnet50_model, giving the same .keras model the API serves.
+
+    Args:
+        head (tf.keras.Model): Model built by build_classifier_head.
+        input_shape (tuple): Input image shape.
+
+    Returns:
+        tf.keras.Model: Compiled end-to-end model.
+    """
+    num_classes = head.output_shape[-1]
+    model = build_resnet50_model(num_classes, input_shape)
+
+    head_dense = [layer for layer in head.layers if isinstance(layer, layers.Dense)]
+    model_dense = [layer for layer in model.layers if isinstance(layer, layers.Dense)]
+    for source, target in zip(head_dense, model_dense):
+        target.set_weights(source.get_weights())
+
+    return model
@@ -1,13 +1,74 @@
-import pandas as pd
 import numpy as np
 
+def rolling_mean_abs(y, window):
+    """
+    Centered rolling mean of |y| along the last axis, computed with cumulative sums.
+
+    Matches pandas `rolling(window, min_periods=1, center=True).mean()`: the window
+    of sample i covers [i - window//2, i + window - window//2) and is truncated
+    at the edges of the clip.
+
+    Args:
+        y (np.array): Clip (1-D) or equal-length clips stacked on the first axis (2-D).
+        window (int): Window size in samples.
+
+    Returns:
+        np.array: float64 rolling means, same shape as y.
+    """
+    y = np.asarray(y)
+    n = y.shape[-1]
+    left = window // 2
+    right = window - left
+
+    # Cumulative sum padded with its first (0) and last values, so every window
+    # is a plain slice difference, including the truncated ones at the edges
+    padded = np.zeros(y.shape[:-1] + (n + window + 1,), dtype=np.float64)
+    np.cumsum(np.abs(y), axis=-1, dtype=np.float64, out=padded[..., left + 1:left + 1 + n])
+    padded[..., left + 1 + n:] = padded[..., left + n:left + n + 1]
+    sums = padded[..., window:window + n] - padded[..., :n]
+
+    # Windows only differ from `window` samples in the first and last `window` positions
+    counts = np.full(n, window, dtype=np.float64)
+    edge = min(n, window)
+    for index in (np.arange(edge), np.arange(n - edge, n)):
+        counts[index] = np.minimum(index + right, n) - np.maximum(index - left, 0)
+
+    return sums / counts
+
 def envelope(y, rate, threshold):
-    mask = []
-    y = pd.Series(y).apply(np.abs)
-    y_mean = y.rolling(window=int(rate/10), min_periods=1, center=True).mean()
-    for mean in y_mean:
-        if mean > threshold:
-            mask.append(True)
-        else:
-            mask.append(False)
-    return mask
\ No newline at end of file
+    """
+    Returns a boolean mask that is True where the 0.1s rolling mean amplitude
+    of the signal is above the threshold (used to remove dead space).
+    """
+    return rolling_mean_abs(y, max(1, int(rate / 10))) > threshold
+
+def envelope_batch(signals, rate, threshold):
+    """
+    Computes the dead-space masks of many clips.
+
+    Args:
+        signals (list of np.array or 2-D np.array): Mono clips. A 2-D array of
+            equal-length clips is processed in a single vectorized pass.
+        rate (int): Sample rate (the rolling window is 0.1s).
+        threshold (float): Minimum mean amplitude of the samples kept.
+
+    Returns:
+        list of np.array: One boolean mask per clip, True where the sample is kept.
+    """
+    if isinstance(signals, np.ndarray) and signals.ndim == 2:
+        return list(envelope(signals, rate, threshold))
+    return [envelope(signal, rate, threshold) for signal in signals]
+
+def trim_silence(y, rate, threshold):
+    """
+    Returns the signal with its dead space removed.
+    """
+    y = np.asarray(y)
+    return y[envelope(y, rate, threshold)]
+
+def trim_silence_batch(signals, rate, threshold):
+    """
+    Removes the dead space of many clips, see envelope_batch.
+    """
+    masks = envelope_batch(signals, rate, threshold)
+    return [np.asarray(signal)[mask] for signal, mask in zip(signals, masks)]
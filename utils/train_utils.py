@@ -1,6 +1,10 @@
 import numpy as np
+from sklearn.model_selection import train_test_split
 from sklearn.utils import class_weight
 
+IMAGE_VALIDATION_SIZE = 0.2
+IMAGE_SPLIT_SEED = 42
+
 def calculate_class_weights(y_train_indices):
     """
     Calculates class weights to handle dataset imbalance.
@@ -26,3 +30,27 @@ def calculate_class_weights(y_train_indices):
     class_weight_dict = dict(zip(classes, weights))
     
     return class_weight_dict
+
+def image_split_indices(labels):
+    """
+    Row indices of the image model's stratified 80/20 train/validation split,
+    the one made in src/image/02_Model_Training.ipynb and by
+    utils/image_features.train_head. Evaluation and calibration must only use
+    the validation rows: the others were seen in training.
+
+    Args:
+        labels (array-like): Class of each row of instruments.csv.
+
+    Returns:
+        tuple: (train_indices, validation_indices)
+    """
+    labels = np.asarray(labels)
+    return train_test_split(np.arange(len(labels)), test_size=IMAGE_VALIDATION_SIZE, stratify=labels,
+                            random_state=IMAGE_SPLIT_SEED)
+
+def image_train_val_split(df, label_col='label'):
+    """
+    Same split as image_split_indices, on a dataframe: returns (train_df, val_df).
+    """
+    train_idx, val_idx = image_split_indices(df[label_col])
+    return df.iloc[train_idx], df.iloc[val_idx]